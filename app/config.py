@@ -34,7 +34,8 @@ class Config:
         }
         config['export'] = {
             'default_directory': '',
-            'csv_encoding': 'utf-8-sig'
+            'csv_encoding': 'utf-8-sig',
+            'docx_writer': 'python-docx'
         }
         config['ui'] = {
             'window_width': '1400',
@@ -45,6 +46,10 @@ class Config:
             'scale_width': '150',
             'tech_list_height': '120'
         }
+        config['stats'] = {
+            'engine': 'python',
+            'cache_size': '64'
+        }
         
         # 設定ファイルのパスを検索（優先順位順）
         config_paths = [
@@ -112,6 +117,18 @@ class Config:
         """CSVエンコーディングを取得"""
         return self.get('export', 'csv_encoding', 'utf-8-sig')
     
+    def get_docx_writer(self) -> str:
+        """スキルシートDOCXの出力方式を取得（python-docx / stream）"""
+        return self.get('export', 'docx_writer', 'python-docx').strip().lower()
+    
+    def get_stats_engine(self) -> str:
+        """集計エンジンを取得（python / numpy / sql）"""
+        return self.get('stats', 'engine', 'python').strip().lower()
+    
+    def get_stats_cache_size(self) -> int:
+        """集計結果キャッシュの最大件数を取得（0で無効）"""
+        return self.getint('stats', 'cache_size', 64)
+    
     def get_window_size(self) -> tuple:
         """ウィンドウサイズを取得"""
         width = self.getint('ui', 'window_width', 1400)
@@ -1,4 +1,9 @@
 #!/usr/bin/env python3
+import time
+
+# 起動時刻（初回描画までの時間の計測に使用）
+STARTED_AT = time.perf_counter()
+
 import sys
 import os
 import locale
@@ -40,7 +45,7 @@ def main():
         except Exception as e:
             print(f"初期データ投入エラー: {e}")
     
-    window = MainWindow()
+    window = MainWindow(started_at=STARTED_AT)
     window.show()
     
     sys.exit(app.exec())
@@ -12,6 +12,7 @@ from models.tech_usage import TechUsage
 from models.self_pr import SelfPR
 from models.qualification import UserQualification
 from models.other_experience import OtherExperience
+from models.tech_experience_summary import TechExperienceSummary
 
 __all__ = [
     'Base', 'init_db', 'get_session',
@@ -20,5 +21,6 @@ __all__ = [
     'ProficiencyLevel',
     'ProjectOS', 'ProjectLanguage', 'ProjectFramework',
     'ProjectTool', 'ProjectCloud', 'ProjectDB',
-    'ProjectRole', 'ProjectTask', 'UserQualification', 'OtherExperience'
+    'ProjectRole', 'ProjectTask', 'UserQualification', 'OtherExperience',
+    'TechExperienceSummary'
 ]
\ No newline at end of file
@@ -8,6 +8,17 @@ Base = declarative_base()
 ENGINE = None
 SessionLocal = None
 
+def month_ordinal_sql(column_name: str) -> str:
+    """
+    YYYY-MM-DD 形式の列から月序数（year*12+month-1）を求めるSQL式
+    未設定・空文字の場合は NULL（生成列・マイグレーションで使用）
+    """
+    return (
+        f"CASE WHEN {column_name} IS NULL OR {column_name} = '' THEN NULL "
+        f"ELSE CAST(substr({column_name}, 1, 4) AS INTEGER) * 12 "
+        f"+ CAST(substr({column_name}, 6, 2) AS INTEGER) - 1 END"
+    )
+
 def init_db(db_path=None):
     global ENGINE, SessionLocal
     
@@ -41,7 +52,11 @@ def init_db(db_path=None):
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
     
-    Base.metadata.create_all(bind=ENGINE)
+    # 未適用のマイグレーションを適用（最新の場合はバージョン確認のみ）
+    from models.migrations import run_migrations
+    from models.project_search import detect_project_search_index
+    run_migrations(ENGINE)
+    detect_project_search_index(ENGINE)
     
     return ENGINE, SessionLocal
 
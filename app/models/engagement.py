@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy import Column, Integer, Text, ForeignKey, Computed
 from sqlalchemy.orm import relationship
-from models.base import Base
+from models.base import Base, month_ordinal_sql
 
 class Engagement(Base):
     __tablename__ = "engagements"
@@ -9,6 +9,9 @@ class Engagement(Base):
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     site_start = Column(Text, nullable=False)
     site_end = Column(Text)
+    # 月序数（year*12+month-1）。site_start / site_end から自動計算される生成列
+    site_start_month = Column(Integer, Computed(month_ordinal_sql('site_start')))
+    site_end_month = Column(Integer, Computed(month_ordinal_sql('site_end')))
     role_override_id = Column(Integer, ForeignKey("roles.id"))
     task_override_id = Column(Integer, ForeignKey("tasks.id"))
     scale_override_text = Column(Text)
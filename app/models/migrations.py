@@ -0,0 +1,121 @@
+from typing import Callable, List, Tuple
+from sqlalchemy import text
+from models.base import Base, month_ordinal_sql
+
+# スキーマのバージョン管理
+# 適用済みのバージョンは PRAGMA user_version に保存する。
+# 起動時は未適用のマイグレーションだけを番号順に1トランザクションで適用し、
+# 最新のデータベースではバージョンを読むだけで終わる（create_all も実行しない）。
+#
+# 新規データベースでは 1 の create_all が現在のモデル定義どおりにテーブルを作るため、
+# 2 以降のマイグレーションは適用済みの状態に対しても冪等に書くこと
+# （CREATE ... IF NOT EXISTS、列の追加前の存在確認など）
+
+def _create_tables(conn):
+    """モデル定義から不足しているテーブルを作成（従来の起動時処理）"""
+    Base.metadata.create_all(bind=conn)
+
+def _create_project_search_index(conn):
+    """プロジェクトの全文検索索引（FTS5）とトリガーを作成"""
+    from models.project_search import create_project_search_index
+    create_project_search_index(conn)
+
+PERFORMANCE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_tech_usages_kind_tech_id ON tech_usages (kind, tech_id)",
+    "CREATE INDEX IF NOT EXISTS ix_tech_usages_project_id ON tech_usages (project_id)",
+    "CREATE INDEX IF NOT EXISTS ix_projects_project_start ON projects (project_start)",
+    "CREATE INDEX IF NOT EXISTS ix_engagements_project_id ON engagements (project_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_oses_os_id ON project_oses (os_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_languages_language_id ON project_languages (language_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_frameworks_framework_id ON project_frameworks (framework_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_tools_tool_id ON project_tools (tool_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_clouds_cloud_id ON project_clouds (cloud_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_dbs_db_id ON project_dbs (db_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_roles_role_id ON project_roles (role_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_tasks_task_id ON project_tasks (task_id)",
+]
+
+def _create_performance_indexes(conn):
+    """集計・絞り込みで使う列の索引を作成"""
+    for ddl in PERFORMANCE_INDEXES:
+        conn.execute(text(ddl))
+    conn.execute(text("ANALYZE"))
+
+# (テーブル, 月序数列, 元の日付列)
+MONTH_ORDINAL_COLUMNS = [
+    ('projects', 'start_month', 'project_start'),
+    ('projects', 'end_month', 'project_end'),
+    ('tech_usages', 'start_month', 'start'),
+    ('tech_usages', 'end_month', '"end"'),
+    ('engagements', 'site_start_month', 'site_start'),
+    ('engagements', 'site_end_month', 'site_end'),
+]
+
+def _add_month_ordinal_columns(conn):
+    """
+    日付列に対応する月序数の生成列（VIRTUAL）と索引を追加
+    生成列は読み取り時に元の列から計算されるため、既存行も追加した時点で値を持つ
+    """
+    for table, column, source in MONTH_ORDINAL_COLUMNS:
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_xinfo({table})")}
+        if column not in existing:
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table} ADD COLUMN {column} INTEGER "
+                f"GENERATED ALWAYS AS ({month_ordinal_sql(source)}) VIRTUAL"
+            )
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"
+        )
+    conn.execute(text("ANALYZE"))
+
+def _build_experience_summary(conn):
+    """
+    技術経験集計テーブル（tech_experience_summary）を既存の使用期間から構築
+    以降は Repository が更新時に影響する技術だけを再計算し、読み取り側は書き込まない
+    """
+    from sqlalchemy.orm import Session
+    from services.experience_summary import ExperienceSummaryService
+    session = Session(bind=conn)
+    try:
+        ExperienceSummaryService(session).rebuild()
+    finally:
+        session.close()
+
+# (バージョン, 説明, 適用処理)
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "テーブル作成", _create_tables),
+    (2, "プロジェクト全文検索索引", _create_project_search_index),
+    (3, "集計・絞り込み用の索引", _create_performance_indexes),
+    (4, "日付列の月序数列", _add_month_ordinal_columns),
+    (5, "技術経験集計テーブルの構築", _build_experience_summary),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn) -> int:
+    """データベースに記録されたスキーマバージョン（PRAGMA user_version）"""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+def run_migrations(engine) -> int:
+    """
+    未適用のマイグレーションを1トランザクションで適用
+    途中で失敗した場合はすべて取り消され、バージョンも更新されない
+    戻り値: 適用後のスキーマバージョン
+    """
+    with engine.connect() as conn:
+        if get_schema_version(conn) >= SCHEMA_VERSION:
+            return get_schema_version(conn)
+
+    with engine.begin() as conn:
+        # pysqlite は DDL の前にトランザクションを開始しないため明示的に開始する
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        current = get_schema_version(conn)
+        for version, description, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"マイグレーション {version}: {description}")
+            migrate(conn)
+        if current < SCHEMA_VERSION:
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    return SCHEMA_VERSION
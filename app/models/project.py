@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy import Column, Integer, Text, ForeignKey, Computed
 from sqlalchemy.orm import relationship
-from models.base import Base
+from models.base import Base, month_ordinal_sql
 
 class Project(Base):
     __tablename__ = "projects"
@@ -11,6 +11,9 @@ class Project(Base):
     detail = Column(Text)
     project_start = Column(Text)
     project_end = Column(Text)
+    # 月序数（year*12+month-1）。project_start / project_end から自動計算される生成列
+    start_month = Column(Integer, Computed(month_ordinal_sql('project_start')))
+    end_month = Column(Integer, Computed(month_ordinal_sql('project_end')))
     role_id = Column(Integer, ForeignKey("roles.id"))
     task_id = Column(Integer, ForeignKey("tasks.id"))
     scale_text = Column(Text)
@@ -0,0 +1,89 @@
+from typing import Dict
+from sqlalchemy import text, Integer, Float
+
+# プロジェクトの全文検索索引（FTS5・trigramトークナイザ）
+# projects を外部コンテンツとし、トリガーで name / work_summary / detail を同期する。
+# trigram は3文字単位で索引するため、日本語の部分一致検索にも使える（3文字未満は LIKE で検索）
+PROJECTS_FTS_TABLE = "projects_fts"
+PROJECT_SEARCH_MIN_LENGTH = 3
+
+PROJECTS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        name, work_summary, detail,
+        content='projects', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, name, work_summary, detail)
+        VALUES (new.id, new.name, new.work_summary, new.detail);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, name, work_summary, detail)
+        VALUES ('delete', old.id, old.name, old.work_summary, old.detail);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF name, work_summary, detail ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, name, work_summary, detail)
+        VALUES ('delete', old.id, old.name, old.work_summary, old.detail);
+        INSERT INTO projects_fts(rowid, name, work_summary, detail)
+        VALUES (new.id, new.name, new.work_summary, new.detail);
+    END
+    """
+]
+
+# データベースURLごとの索引の有無（FTS5・trigram非対応のSQLiteでは False）
+_search_available: Dict[str, bool] = {}
+
+def create_project_search_index(conn) -> bool:
+    """
+    全文検索索引とトリガーを作成（マイグレーションから呼び出す）
+    新規作成した場合は既存の projects から索引を構築する。
+    FTS5・trigram非対応のSQLiteでは何も作成せず False を返す
+    """
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': PROJECTS_FTS_TABLE}
+    ).first() is not None
+
+    try:
+        conn.execute(text(PROJECTS_FTS_DDL[0]))
+    except Exception as e:
+        print(f"全文検索索引を作成できませんでした（LIKE検索を使用します）: {e}")
+        return False
+
+    for ddl in PROJECTS_FTS_DDL[1:]:
+        conn.execute(text(ddl))
+
+    if not exists:
+        conn.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+    return True
+
+def detect_project_search_index(engine) -> bool:
+    """全文検索索引の有無を確認して記録"""
+    with engine.connect() as conn:
+        available = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': PROJECTS_FTS_TABLE}
+        ).first() is not None
+    _search_available[str(engine.url)] = available
+    return available
+
+def is_project_search_available(bind) -> bool:
+    """全文検索索引を使えるか（init_db() 時点で作成済みか）"""
+    return _search_available.get(str(bind.url), False)
+
+def project_search_matches(search_text: str):
+    """
+    検索文字列に一致するプロジェクトの (project_id, rank) サブクエリ
+    文字列全体を1つのフレーズとして扱い、いずれかの列に部分一致したものを返す。
+    rank は bm25 のスコア（小さいほど関連度が高い）
+    """
+    phrase = '"' + search_text.replace('"', '""') + '"'
+    return text(
+        "SELECT rowid AS project_id, rank FROM projects_fts WHERE projects_fts MATCH :phrase"
+    ).bindparams(phrase=phrase).columns(project_id=Integer, rank=Float).subquery('project_matches')
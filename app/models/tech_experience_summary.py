@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Text
+from models.base import Base
+
+class TechExperienceSummary(Base):
+    """技術ごとの経験月数集計（期間フィルタなし）。tech_usagesの更新時に増分更新される"""
+    __tablename__ = "tech_experience_summary"
+    
+    kind = Column(Text, primary_key=True)
+    tech_id = Column(Integer, primary_key=True)
+    unique_months = Column(Integer, nullable=False, default=0)  # 重複なし経験月数
+    first_month = Column(Integer)  # 最初の月（月序数: year*12+month-1）
+    last_month = Column(Integer)  # 最後の月（月序数）
+    computed_month = Column(Integer, nullable=False)  # 集計した時点の当月（月序数）
+    open_ended = Column(Integer, nullable=False, default=0)  # 終了日なし（継続中）の使用期間を含むか
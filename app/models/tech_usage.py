@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, Text, ForeignKey, CheckConstraint, Computed
 from sqlalchemy.orm import relationship
-from models.base import Base
+from models.base import Base, month_ordinal_sql
 
 class TechUsage(Base):
     __tablename__ = "tech_usages"
@@ -11,6 +11,9 @@ class TechUsage(Base):
     tech_id = Column(Integer, nullable=False)
     start = Column(Text)
     end = Column(Text)
+    # 月序数（year*12+month-1）。start / end から自動計算される生成列
+    start_month = Column(Integer, Computed(month_ordinal_sql('start')))
+    end_month = Column(Integer, Computed(month_ordinal_sql('"end"')))
     
     project = relationship("Project", back_populates="tech_usages")
     
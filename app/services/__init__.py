@@ -1,6 +1,6 @@
 from services.db import db_service
 from services.repository import Repository
-from services.stats import StatsService
+from services.stats import StatsService, create_stats_service
 from services.export import ExportService
 from services.seed import seed_initial_data
 
@@ -8,6 +8,7 @@ __all__ = [
     'db_service',
     'Repository',
     'StatsService',
+    'create_stats_service',
     'ExportService',
     'seed_initial_data'
 ]
\ No newline at end of file
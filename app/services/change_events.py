@@ -0,0 +1,133 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Type
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """データ変更イベントの基底クラス"""
+
+@dataclass(frozen=True)
+class ProjectChanged(ChangeEvent):
+    """
+    プロジェクト（本体・役割・作業・技術選択・参画情報）の変更
+
+    project_ids: 変更されたプロジェクト（None は全プロジェクト）
+    period_changed: 作成・削除・期間の変更を含む（プロジェクト数・総月数に影響する）
+    """
+    project_ids: Optional[FrozenSet[int]] = None
+    period_changed: bool = False
+
+@dataclass(frozen=True)
+class MasterChanged(ChangeEvent):
+    """マスタの変更（kind: 'os', 'role', 'proficiency' などのマスタ種別）"""
+    kind: str
+
+@dataclass(frozen=True)
+class TechUsageChanged(ChangeEvent):
+    """
+    技術使用期間の変更（経験月数の集計結果に影響する）
+
+    tech_ids: 変更された技術（None はカテゴリ内の全技術）
+    """
+    kind: str
+    tech_ids: Optional[FrozenSet[int]] = None
+
+@dataclass(frozen=True)
+class SelfPRChanged(ChangeEvent):
+    """自己PRの変更"""
+
+@dataclass(frozen=True)
+class QualificationChanged(ChangeEvent):
+    """取得資格の変更"""
+
+@dataclass(frozen=True)
+class OtherExperienceChanged(ChangeEvent):
+    """その他経歴の変更"""
+
+def _union_ids(a: Optional[FrozenSet[int]], b: Optional[FrozenSet[int]]) -> Optional[FrozenSet[int]]:
+    """IDの和集合（None は全件を表すため None が優先）"""
+    if a is None or b is None:
+        return None
+    return a | b
+
+def merge_events(events: Iterable[ChangeEvent]) -> List[ChangeEvent]:
+    """
+    同種のイベントを1つにまとめる（発生順は最初の出現順）
+    ProjectChanged は1件に、TechUsageChanged はカテゴリごとに対象IDを合算する
+    """
+    merged: Dict[tuple, ChangeEvent] = {}
+    for change in events:
+        if isinstance(change, ProjectChanged):
+            key = (ProjectChanged,)
+            previous = merged.get(key)
+            if previous is not None:
+                change = ProjectChanged(
+                    _union_ids(previous.project_ids, change.project_ids),
+                    previous.period_changed or change.period_changed
+                )
+        elif isinstance(change, TechUsageChanged):
+            key = (TechUsageChanged, change.kind)
+            previous = merged.get(key)
+            if previous is not None:
+                change = TechUsageChanged(change.kind, _union_ids(previous.tech_ids, change.tech_ids))
+        else:
+            key = (type(change), change)
+        merged[key] = change
+    return list(merged.values())
+
+class ChangeEventBus:
+    """
+    データ変更イベントの配信
+
+    Repository が変更時に publish() でセッションにイベントを記録し、
+    コミット後にまとめて購読者へ配信する（ロールバック時は破棄）。
+    購読者はコミットしたスレッドで呼び出されるため、GUIの更新は
+    ui.change_notifier を経由してGUIスレッドで行う。
+    """
+
+    def __init__(self):
+        self._subscribers: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: Type[ChangeEvent], callback: Callable[[List[ChangeEvent]], None]):
+        """event_type（サブクラスを含む）のイベントを購読（callback にはまとめたイベントの一覧を渡す）"""
+        with self._lock:
+            self._subscribers.append((event_type, callback))
+
+    def unsubscribe(self, callback: Callable[[List[ChangeEvent]], None]):
+        with self._lock:
+            self._subscribers = [(t, c) for t, c in self._subscribers if c != callback]
+
+    def publish(self, session: Session, change: ChangeEvent):
+        """変更を記録（セッションのコミット後に配信）"""
+        session.info.setdefault('change_events', []).append(change)
+
+    def deliver(self, events: Iterable[ChangeEvent]):
+        """イベントを購読者へ配信"""
+        events = merge_events(events)
+        if not events:
+            return
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for event_type, callback in subscribers:
+            matched = [change for change in events if isinstance(change, event_type)]
+            if not matched:
+                continue
+            try:
+                callback(matched)
+            except Exception as e:
+                print(f"変更通知エラー: {e}")
+
+change_bus = ChangeEventBus()
+
+@event.listens_for(Session, "after_commit")
+def _deliver_after_commit(session):
+    change_bus.deliver(session.info.pop('change_events', ()))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop('change_events', None)
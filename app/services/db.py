@@ -1,10 +1,62 @@
+import threading
 from contextlib import contextmanager
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from models import init_db, get_session
 
 class DatabaseService:
+    """
+    設定ファイルのデータベースへのセッションを提供する
+
+    データベースは最初にセッション（engine / SessionLocal）が必要になった時点で開く。
+    import しただけではデータベースの作成・マイグレーションは行わない（テストなどで別のDBを使う場合のため）
+    """
+
     def __init__(self):
-        self.engine, self.SessionLocal = init_db()
+        self._engine = None
+        self._SessionLocal = None
+        self._init_lock = threading.Lock()
+        # 書き込みを含むコミットのたびに増えるカウンタ（集計キャッシュの無効化に使用）
+        self.write_version = 0
+    
+    def _ensure_initialized(self):
+        if self._SessionLocal is not None:
+            return
+        with self._init_lock:
+            if self._SessionLocal is not None:
+                return
+            engine, SessionLocal = init_db()
+            event.listen(SessionLocal, "after_flush", self._mark_write)
+            event.listen(SessionLocal, "do_orm_execute", self._mark_execute)
+            event.listen(SessionLocal, "after_commit", self._bump_write_version)
+            event.listen(SessionLocal, "after_rollback", self._clear_write)
+            self._engine = engine
+            self._SessionLocal = SessionLocal
+    
+    @property
+    def engine(self):
+        self._ensure_initialized()
+        return self._engine
+    
+    @property
+    def SessionLocal(self):
+        self._ensure_initialized()
+        return self._SessionLocal
+    
+    def _mark_write(self, session, flush_context):
+        session.info['has_writes'] = True
+    
+    def _mark_execute(self, orm_execute_state):
+        # text() による読み取り（SQL集計エンジンなど）は書き込みとして扱わない
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info['has_writes'] = True
+    
+    def _bump_write_version(self, session):
+        if session.info.pop('has_writes', False):
+            self.write_version += 1
+    
+    def _clear_write(self, session):
+        session.info.pop('has_writes', None)
     
     @contextmanager
     def session_scope(self):
@@ -21,4 +73,4 @@ class DatabaseService:
     def get_session(self) -> Session:
         return self.SessionLocal()
 
-db_service = DatabaseService()
\ No newline at end of file
+db_service = DatabaseService()
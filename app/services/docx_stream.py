@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DOCXストリーミング出力（WordprocessingML を zipfile へ直接書き込む）
+
+python-docx のオブジェクトモデルを組み立てずに、事前に用意した段落・表・行・セルの
+XML断片を word/document.xml へ順に書き出す。書式は名前付きスタイルで参照するため、
+ランごとのフォント指定は出力しない。
+document.xml 以外のパーツ（スタイル・テーマ等）は docx_template のベーステンプレートと共通。
+"""
+
+import os
+import re
+import zipfile
+from typing import List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from services.docx_template import (
+    get_base_parts, cm_to_twips, section_xml, DOCUMENT_START, DOCUMENT_END,
+    PAGE_WIDTH_CM, PAGE_MARGIN_CM, STYLE_HEADER_CELL, STYLE_TABLE, HEADER_CELL_FILL
+)
+
+# XMLに含められない制御文字（タブ・改行は別途 <w:tab/> / <w:br/> に変換）
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_RUN_BREAKS = re.compile('([\t\r\n])')
+
+_PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+_EMPTY_PARAGRAPH = '<w:p/>'
+
+_ALIGNMENTS = {'left': 'left', 'center': 'center', 'right': 'right'}
+
+def _run_content(text: str) -> str:
+    """ランの中身（<w:t> / <w:br/> / <w:tab/>）を生成"""
+    if not text:
+        return ''
+    parts = []
+    for token in _RUN_BREAKS.split(_INVALID_XML_CHARS.sub('', text)):
+        if not token:
+            continue
+        if token == '\t':
+            parts.append('<w:tab/>')
+        elif token in '\r\n':
+            parts.append('<w:br/>')
+        else:
+            parts.append(f'<w:t xml:space="preserve">{escape(token)}</w:t>')
+    return ''.join(parts)
+
+def _run(text: str, run_style: Optional[str] = None) -> str:
+    r_pr = f'<w:rPr><w:rStyle w:val="{run_style}"/></w:rPr>' if run_style else ''
+    return f'<w:r>{r_pr}{_run_content(text)}</w:r>'
+
+class DocxStreamWriter:
+    """
+    DOCXをストリーミングで書き出すライター
+
+    with DocxStreamWriter(filepath) as writer:
+        writer.paragraph("見出し", run_style=STYLE_STRONG)  # STYLE_*: docx_template のスタイルID
+        writer.begin_table([3.0, 17.0])
+        writer.header_row(["カテゴリ", "技術"])
+        writer.row(["OS", "Linux"])
+        writer.end_table()
+
+    例外で抜けた場合は書きかけのファイルを削除する
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._zip = None
+        self._document = None
+        self._table_cells = None  # 現在の表の (見出しセル開始, データセル開始) の一覧
+
+    def __enter__(self):
+        self._zip = zipfile.ZipFile(self.filepath, 'w', zipfile.ZIP_DEFLATED)
+        try:
+            for name, content in get_base_parts().items():
+                self._zip.writestr(name, content)
+            self._document = self._zip.open('word/document.xml', 'w')
+            self._write(DOCUMENT_START)
+        except Exception:
+            self._abort()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._abort()
+            return False
+
+        try:
+            self._write(section_xml() + DOCUMENT_END)
+            self._document.close()
+            self._zip.close()
+        except Exception:
+            self._abort()
+            raise
+        return False
+
+    def _abort(self):
+        """書きかけのファイルを閉じて削除"""
+        try:
+            if self._document is not None:
+                self._document.close()
+            self._zip.close()
+        except Exception:
+            pass
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    def _write(self, xml: str):
+        self._document.write(xml.encode('utf-8'))
+
+    def paragraph(self, text: str, run_style: Optional[str] = None,
+                  align: Optional[str] = None, style: Optional[str] = None):
+        """段落を1つ出力（run_style: 文字スタイル、style: 段落スタイル、align: left/center/right）"""
+        p_pr = ''
+        if style:
+            p_pr += f'<w:pStyle w:val="{style}"/>'
+        if align:
+            p_pr += f'<w:jc w:val="{_ALIGNMENTS[align]}"/>'
+        if p_pr:
+            p_pr = f'<w:pPr>{p_pr}</w:pPr>'
+        self._write(f'<w:p>{p_pr}{_run(text, run_style)}</w:p>')
+
+    def empty_paragraph(self):
+        """空の段落"""
+        self._write(_EMPTY_PARAGRAPH)
+
+    def page_break(self):
+        """改ページ"""
+        self._write(_PAGE_BREAK)
+
+    def begin_table(self, widths_cm: Sequence[float], fixed_layout: bool = False):
+        """
+        表を開始（widths_cm: 列幅）
+        グリッドは本文幅の等分（python-docx の add_table() と同じ）、セル幅は widths_cm で指定する
+        """
+        if self._table_cells is not None:
+            raise RuntimeError("表の中で表を開始することはできません")
+
+        block_width = int(PAGE_WIDTH_CM * 360000) - 2 * int(PAGE_MARGIN_CM * 360000)
+        grid_width = int(round(block_width // len(widths_cm) / 635))
+
+        layout = '<w:tblLayout w:type="fixed"/>' if fixed_layout else ''
+        self._write(
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="{STYLE_TABLE}"/><w:tblW w:w="0" w:type="auto"/>{layout}'
+            '<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" '
+            'w:lastColumn="0" w:noHBand="0" w:noVBand="1"/></w:tblPr>'
+            '<w:tblGrid>' + f'<w:gridCol w:w="{grid_width}"/>' * len(widths_cm) + '</w:tblGrid>'
+        )
+
+        # 列ごとのセル開始タグを事前に組み立てておく
+        self._table_cells = []
+        for width_cm in widths_cm:
+            width = f'<w:tcW w:w="{cm_to_twips(width_cm)}" w:type="dxa"/>'
+            self._table_cells.append((
+                f'<w:tc><w:tcPr>{width}<w:shd w:val="clear" w:color="auto" w:fill="{HEADER_CELL_FILL}"/>'
+                f'<w:vAlign w:val="top"/></w:tcPr><w:p><w:pPr><w:pStyle w:val="{STYLE_HEADER_CELL}"/></w:pPr>',
+                f'<w:tc><w:tcPr>{width}<w:vAlign w:val="top"/></w:tcPr><w:p>'
+            ))
+
+    def _row(self, texts: Sequence[str], header: bool):
+        if self._table_cells is None:
+            raise RuntimeError("表が開始されていません")
+        if len(texts) != len(self._table_cells):
+            raise ValueError(f"列数が一致しません（{len(texts)} / {len(self._table_cells)}）")
+
+        parts: List[str] = ['<w:tr>']
+        for (header_start, cell_start), text in zip(self._table_cells, texts):
+            parts.append(header_start if header else cell_start)
+            parts.append(_run(text or ''))
+            parts.append('</w:p></w:tc>')
+        parts.append('</w:tr>')
+        self._write(''.join(parts))
+
+    def header_row(self, texts: Sequence[str]):
+        """見出し行（背景グレー・中央揃え・太字）"""
+        self._row(texts, header=True)
+
+    def row(self, texts: Sequence[str]):
+        """データ行"""
+        self._row(texts, header=False)
+
+    def end_table(self):
+        """表を終了"""
+        self._write('</w:tbl>')
+        self._table_cells = None
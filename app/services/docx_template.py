@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+スキルシートDOCXのベーステンプレート
+
+python-docx の既定テンプレートに本文フォント（Normal スタイル）とスキルシート用の
+名前付きスタイル（段落・文字・表）を追加し、用紙設定を済ませたテンプレートを作成する。
+初回使用時にメモリ上で作成して使い回し、python-docx 出力（export_to_docx）と
+ストリーミング出力（DocxStreamWriter）の両方がこのスタイルを参照する。
+"""
+
+import io
+import os
+import threading
+import zipfile
+from typing import Optional, Dict
+
+# 本文フォント（Normal スタイル）
+BODY_FONT_NAME = 'MS 明朝'
+BODY_FONT_HALF_POINTS = 18  # 9pt
+
+# 用紙（A4）と余白（cm）
+PAGE_WIDTH_CM = 21.0
+PAGE_HEIGHT_CM = 29.7
+PAGE_MARGIN_CM = 2.0
+
+# スキルシート用の名前付きスタイル（スタイルID）
+STYLE_HEADER_CELL = 'SkillSheetHeaderCell'  # 表の見出しセル（段落）
+STYLE_SELF_PR = 'SkillSheetSelfPR'          # 自己PRの本文（段落）
+STYLE_STRONG = 'SkillSheetStrong'           # 見出し（太字の文字スタイル）
+STYLE_NOTE = 'SkillSheetNote'               # 備考（斜体の文字スタイル）
+STYLE_TABLE = 'SkillSheetTable'             # 罫線付きの表（外枠・横線は実線、縦線は破線）
+
+# スタイルID → スタイル名（python-docx ではスタイル名で参照する）
+STYLE_NAMES = {
+    STYLE_HEADER_CELL: 'Skill Sheet Header Cell',
+    STYLE_SELF_PR: 'Skill Sheet Self PR',
+    STYLE_STRONG: 'Skill Sheet Strong',
+    STYLE_NOTE: 'Skill Sheet Note',
+    STYLE_TABLE: 'Skill Sheet Table',
+}
+
+# 表の見出しセルの背景色
+HEADER_CELL_FILL = 'F2F2F2'
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+_BORDER = '<w:{0} w:val="{1}" w:sz="4" w:space="0" w:color="000000"/>'
+
+SKILL_SHEET_STYLES_XML = (
+    f'<w:style w:type="paragraph" w:customStyle="1" w:styleId="{STYLE_HEADER_CELL}">'
+    f'<w:name w:val="{STYLE_NAMES[STYLE_HEADER_CELL]}"/><w:basedOn w:val="Normal"/><w:qFormat/>'
+    '<w:pPr><w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/><w:jc w:val="center"/></w:pPr>'
+    '<w:rPr><w:b/></w:rPr>'
+    '</w:style>'
+    f'<w:style w:type="paragraph" w:customStyle="1" w:styleId="{STYLE_SELF_PR}">'
+    f'<w:name w:val="{STYLE_NAMES[STYLE_SELF_PR]}"/><w:basedOn w:val="Normal"/><w:qFormat/>'
+    '<w:pPr><w:spacing w:after="120" w:line="288" w:lineRule="auto"/></w:pPr>'
+    '</w:style>'
+    f'<w:style w:type="character" w:customStyle="1" w:styleId="{STYLE_STRONG}">'
+    f'<w:name w:val="{STYLE_NAMES[STYLE_STRONG]}"/><w:qFormat/>'
+    '<w:rPr><w:b/></w:rPr>'
+    '</w:style>'
+    f'<w:style w:type="character" w:customStyle="1" w:styleId="{STYLE_NOTE}">'
+    f'<w:name w:val="{STYLE_NAMES[STYLE_NOTE]}"/><w:qFormat/>'
+    '<w:rPr><w:i/></w:rPr>'
+    '</w:style>'
+    f'<w:style w:type="table" w:customStyle="1" w:styleId="{STYLE_TABLE}">'
+    f'<w:name w:val="{STYLE_NAMES[STYLE_TABLE]}"/><w:basedOn w:val="TableNormal"/><w:uiPriority w:val="99"/>'
+    '<w:tblPr><w:tblBorders>'
+    + ''.join(_BORDER.format(side, 'single') for side in ('top', 'left', 'bottom', 'right', 'insideH'))
+    + _BORDER.format('insideV', 'dashed')
+    + '</w:tblBorders></w:tblPr>'
+    '</w:style>'
+)
+
+DOCUMENT_START = (
+    "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+    f'<w:document xmlns:w="{W_NS}" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<w:body>'
+)
+DOCUMENT_END = '</w:body></w:document>'
+
+def cm_to_twips(cm: float) -> int:
+    """cm を twips（1/20pt）に変換（python-docx の Cm().twips と同じ丸め）"""
+    return int(round(int(cm * 360000) / 635))
+
+def section_xml() -> str:
+    """用紙サイズ・余白（sectPr）"""
+    margin = cm_to_twips(PAGE_MARGIN_CM)
+    return (
+        '<w:sectPr>'
+        f'<w:pgSz w:w="{cm_to_twips(PAGE_WIDTH_CM)}" w:h="{cm_to_twips(PAGE_HEIGHT_CM)}"/>'
+        f'<w:pgMar w:top="{margin}" w:right="{margin}" w:bottom="{margin}" w:left="{margin}" '
+        'w:header="720" w:footer="720" w:gutter="0"/>'
+        '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/>'
+        '</w:sectPr>'
+    )
+
+def _build_styles_xml(styles_xml: bytes) -> bytes:
+    """既定テンプレートの styles.xml に本文フォントとスキルシート用スタイルを設定"""
+    from lxml import etree
+
+    w = '{%s}' % W_NS
+    root = etree.fromstring(styles_xml)
+
+    normal = root.find(f'{w}style[@{w}styleId="Normal"]')
+    r_pr = normal.find(f'{w}rPr')
+    if r_pr is None:
+        r_pr = etree.SubElement(normal, f'{w}rPr')
+    for child in list(r_pr):
+        if child.tag in (f'{w}rFonts', f'{w}sz'):
+            r_pr.remove(child)
+    fonts = etree.Element(f'{w}rFonts')
+    fonts.set(f'{w}ascii', BODY_FONT_NAME)
+    fonts.set(f'{w}hAnsi', BODY_FONT_NAME)
+    r_pr.insert(0, fonts)
+    size = etree.SubElement(r_pr, f'{w}sz')
+    size.set(f'{w}val', str(BODY_FONT_HALF_POINTS))
+
+    wrapper = etree.fromstring(f'<w:styles xmlns:w="{W_NS}">{SKILL_SHEET_STYLES_XML}</w:styles>')
+    for style in wrapper:
+        root.append(style)
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+# 初回使用時に作成して使い回す
+_base_parts: Optional[Dict[str, bytes]] = None
+_base_template: Optional[bytes] = None
+_lock = threading.Lock()
+
+def get_base_parts() -> Dict[str, bytes]:
+    """document.xml 以外のパッケージパーツ（パス → 内容）"""
+    global _base_parts
+    with _lock:
+        if _base_parts is None:
+            import docx
+            template = os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx')
+            parts = {}
+            with zipfile.ZipFile(template) as source:
+                for info in source.infolist():
+                    if info.filename == 'word/document.xml':
+                        continue
+                    parts[info.filename] = source.read(info.filename)
+            parts['word/styles.xml'] = _build_styles_xml(parts['word/styles.xml'])
+            _base_parts = parts
+        return _base_parts
+
+def get_base_template() -> bytes:
+    """本文が空で用紙設定済みのベーステンプレート（.docx の内容）"""
+    global _base_template
+    parts = get_base_parts()
+    with _lock:
+        if _base_template is None:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as package:
+                for name, content in parts.items():
+                    package.writestr(name, content)
+                package.writestr('word/document.xml', DOCUMENT_START + section_xml() + DOCUMENT_END)
+            _base_template = buffer.getvalue()
+        return _base_template
+
+def open_base_document():
+    """ベーステンプレートから python-docx の Document を作成"""
+    from docx import Document
+    return Document(io.BytesIO(get_base_template()))
@@ -0,0 +1,194 @@
+from typing import List, Tuple, Optional, Dict, Any, Iterable
+from sqlalchemy.orm import Session
+from models import Project, TechUsage, TechExperienceSummary
+from services.stats import StatsService, TECH_KINDS
+
+class ExperienceSummaryService:
+    """
+    tech_experience_summary テーブル（期間フィルタなしの経験月数）の管理
+    
+    Repository の tech_usages / プロジェクト期間の更新時に影響する技術だけを再計算し、
+    フィルタなしの統計はこのテーブルを読むだけで済むようにする
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.stats = StatsService(session)
+    
+    def _compute_rows(self, kind: str, tech_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        指定カテゴリの技術ごとに集計行を計算（tech_ids未指定時は全技術）
+        """
+        query = self.session.query(
+            TechUsage.tech_id,
+            TechUsage.start_month,
+            TechUsage.end_month,
+            Project.start_month,
+            Project.end_month
+        ).join(
+            Project, Project.id == TechUsage.project_id
+        ).filter(
+            TechUsage.kind == kind
+        )
+        if tech_ids is not None:
+            query = query.filter(TechUsage.tech_id.in_(list(tech_ids)))
+        
+        intervals: Dict[int, List[Tuple[int, int]]] = {}
+        open_ended: Dict[int, bool] = {}
+        for tech_id, usage_start, usage_end, project_start, project_end in query.all():
+            intervals.setdefault(tech_id, [])
+            interval = self.stats.usage_month_interval(usage_start, usage_end, project_start, project_end)
+            if interval:
+                intervals[tech_id].append(interval)
+            # 使用期間の終了が当月に依存するか（effective_usage_period() と同じ期間選択）
+            if usage_start is not None:
+                if usage_end is None:
+                    open_ended[tech_id] = True
+            elif project_start is not None and project_end is None:
+                open_ended[tech_id] = True
+        
+        current_month = self.stats.current_month_ordinal()
+        rows = {}
+        for tech_id, tech_intervals in intervals.items():
+            rows[tech_id] = {
+                'unique_months': self.stats.merged_months_count(tech_intervals),
+                'first_month': min(i[0] for i in tech_intervals) if tech_intervals else None,
+                'last_month': max(i[1] for i in tech_intervals) if tech_intervals else None,
+                'computed_month': current_month,
+                'open_ended': 1 if open_ended.get(tech_id) else 0
+            }
+        return rows
+    
+    def refresh_techs(self, keys: Iterable[Tuple[str, int]]):
+        """
+        指定した (kind, tech_id) の集計行を再計算
+        使用期間が無くなった技術の行は削除する
+        """
+        tech_ids_by_kind: Dict[str, set] = {}
+        for kind, tech_id in keys:
+            tech_ids_by_kind.setdefault(kind, set()).add(tech_id)
+        
+        for kind, tech_ids in tech_ids_by_kind.items():
+            rows = self._compute_rows(kind, tech_ids)
+            existing = {
+                row.tech_id: row
+                for row in self.session.query(TechExperienceSummary).filter(
+                    TechExperienceSummary.kind == kind,
+                    TechExperienceSummary.tech_id.in_(list(tech_ids))
+                ).all()
+            }
+            
+            for tech_id in tech_ids:
+                values = rows.get(tech_id)
+                row = existing.get(tech_id)
+                if values is None:
+                    if row:
+                        self.session.delete(row)
+                elif row:
+                    for key, value in values.items():
+                        setattr(row, key, value)
+                else:
+                    self.session.add(TechExperienceSummary(kind=kind, tech_id=tech_id, **values))
+        
+        self.session.flush()
+    
+    def get_usage_keys_by_projects(self, project_ids: Iterable[int]) -> set:
+        """
+        指定プロジェクトの使用期間が参照している (kind, tech_id) を取得
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return set()
+        rows = self.session.query(TechUsage.kind, TechUsage.tech_id).filter(
+            TechUsage.project_id.in_(project_ids)
+        ).distinct().all()
+        return {(kind, tech_id) for kind, tech_id in rows}
+    
+    def refresh_projects(self, project_ids: Iterable[int]):
+        """
+        指定プロジェクトの使用期間に関係する技術の集計行を再計算
+        """
+        self.refresh_techs(self.get_usage_keys_by_projects(project_ids))
+    
+    def rebuild(self) -> int:
+        """
+        集計テーブルを全件再構築し、作成した行数を返す
+        """
+        self.session.query(TechExperienceSummary).delete(synchronize_session=False)
+        count = 0
+        for kind in TECH_KINDS:
+            for tech_id, values in self._compute_rows(kind).items():
+                self.session.add(TechExperienceSummary(kind=kind, tech_id=tech_id, **values))
+                count += 1
+        self.session.flush()
+        return count
+    
+    def get_months_by_tech(self, kind: str) -> Dict[int, int]:
+        """
+        指定カテゴリの技術ごとの経験月数を集計テーブルから取得（読み取りのみ）
+        継続中の使用期間を含む行で集計時点の月が古いものは、その技術だけその場で計算する
+        """
+        current_month = self.stats.current_month_ordinal()
+        months = {}
+        stale_ids = []
+        for tech_id, unique_months, open_ended, computed_month in self.session.query(
+            TechExperienceSummary.tech_id,
+            TechExperienceSummary.unique_months,
+            TechExperienceSummary.open_ended,
+            TechExperienceSummary.computed_month
+        ).filter(
+            TechExperienceSummary.kind == kind
+        ).all():
+            if open_ended and computed_month != current_month:
+                stale_ids.append(tech_id)
+            else:
+                months[tech_id] = unique_months
+        
+        if stale_ids:
+            for tech_id, values in self._compute_rows(kind, stale_ids).items():
+                months[tech_id] = values['unique_months']
+        return months
+    
+    def check_consistency(self) -> List[Dict[str, Any]]:
+        """
+        集計テーブルとその場で計算した値を比較し、不一致の一覧を返す
+        """
+        mismatches = []
+        current_month = self.stats.current_month_ordinal()
+        fields = ['unique_months', 'first_month', 'last_month', 'open_ended']
+        
+        for kind in TECH_KINDS:
+            live = self._compute_rows(kind)
+            stored = {
+                row.tech_id: row
+                for row in self.session.query(TechExperienceSummary).filter(
+                    TechExperienceSummary.kind == kind
+                ).all()
+            }
+            
+            for tech_id in sorted(set(live) | set(stored)):
+                expected = live.get(tech_id)
+                row = stored.get(tech_id)
+                if expected is None or row is None:
+                    mismatches.append({
+                        'kind': kind,
+                        'tech_id': tech_id,
+                        'expected': expected,
+                        'stored': None if row is None else {f: getattr(row, f) for f in fields}
+                    })
+                    continue
+                
+                # 継続中の行は月が変われば読み取り時にその場で計算されるので、集計時点が古いものは比較しない
+                if row.open_ended and row.computed_month != current_month:
+                    continue
+                
+                actual = {f: getattr(row, f) for f in fields}
+                if any(actual[f] != expected[f] for f in fields):
+                    mismatches.append({
+                        'kind': kind,
+                        'tech_id': tech_id,
+                        'expected': {f: expected[f] for f in fields},
+                        'stored': actual
+                    })
+        
+        return mismatches
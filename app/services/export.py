@@ -1,17 +1,308 @@
 import csv
+import io
+import json
 import os
-from typing import Optional
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from sqlalchemy.orm import Session
-from services.stats import StatsService
+from services.stats import create_stats_service, TECH_KINDS
+from services.master_cache import master_cache
+
+KIND_DISPLAY_MAP = {
+    'os': 'OS',
+    'language': '言語',
+    'framework': 'FW/ライブラリ',
+    'tool': 'ツール',
+    'cloud': 'クラウド',
+    'db': 'データベース'
+}
+
+# 出力するファイル（ファイル名, 内容, エンコーディング）
+ExportFile = Tuple[str, str, str]
+
+def _csv_text(rows: List[List[Any]]) -> str:
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+def render_category_csv(stats_data: List[Dict[str, Any]]) -> str:
+    """カテゴリ別統計のCSV"""
+    return _csv_text(
+        [['技術名', '月数', '年月']]
+        + [[item['name'], item['months'], item['display']] for item in stats_data]
+    )
+
+def render_category_md(
+    kind: str,
+    stats_data: List[Dict[str, Any]],
+    start_filter: Optional[str] = None,
+    end_filter: Optional[str] = None
+) -> str:
+    """カテゴリ別統計のMarkdown"""
+    lines = [f"# {KIND_DISPLAY_MAP.get(kind, kind)}経験\n\n"]
+
+    if start_filter or end_filter:
+        lines.append("## 集計期間\n")
+        if start_filter:
+            lines.append(f"- 開始: {start_filter}\n")
+        if end_filter:
+            lines.append(f"- 終了: {end_filter}\n")
+        lines.append("\n")
+
+    lines.append("| 技術名 | 月数 | 年月 |\n")
+    lines.append("|--------|------|------|\n")
+
+    for item in stats_data:
+        lines.append(f"| {item['name']} | {item['months']} | {item['display']} |\n")
+
+    lines.append(f"\n合計: {len(stats_data)}件\n")
+    return ''.join(lines)
+
+def render_projects_csv(projects: List[Dict[str, str]]) -> str:
+    """プロジェクト一覧のCSV"""
+    return _csv_text(
+        [['プロジェクト名', '業務内容', '開始', '終了', '役割', '作業', '規模']]
+        + [
+            [p['name'], p['work_summary'], p['start'], p['end'], p['role'], p['task'], p['scale']]
+            for p in projects
+        ]
+    )
+
+@dataclass
+class StatsSnapshot:
+    """
+    エクスポート用の集計結果（1回だけ計算し、すべての出力先で共有する）
+
+    categories: {kind: get_all_tech_stats() と同形式}
+    projects: 集計期間に該当するプロジェクト（出力用に整形済み）
+    """
+    start_filter: Optional[str]
+    end_filter: Optional[str]
+    categories: Dict[str, List[Dict[str, Any]]]
+    summary: Dict[str, Any]
+    projects: List[Dict[str, str]]
+
+@dataclass
+class SinkResult:
+    """
+    出力先ごとの結果
+
+    files: 書き出せたファイルのパス
+    file_errors: 書き出しに失敗したファイル（ファイル名 → エラー）
+    """
+    name: str
+    files: List[str] = field(default_factory=list)
+    file_errors: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+class SinkWriteError(Exception):
+    """一部のファイルの書き出しに失敗した（書き出せたファイルのパスとファイルごとのエラーを持つ）"""
+
+    def __init__(self, paths: List[str], file_errors: Dict[str, str]):
+        super().__init__(", ".join(f"{name}: {error}" for name, error in file_errors.items()))
+        self.paths = paths
+        self.file_errors = file_errors
+
+class ExportSink:
+    """
+    エクスポートの出力先
+    render() で出力するファイルを生成し、write() でディレクトリに書き出す
+    """
+    name = ""
+
+    def render(self, snapshot: StatsSnapshot) -> List[ExportFile]:
+        raise NotImplementedError
+
+    def write(self, snapshot: StatsSnapshot, directory: str) -> List[str]:
+        """
+        ファイルを書き出して、書き出したパスの一覧を返す
+        書き出しに失敗したファイルがあっても残りは続行し、最後に SinkWriteError を送出する
+        """
+        paths = []
+        file_errors = {}
+        for file_name, content, encoding in self.render(snapshot):
+            path = os.path.join(directory, file_name)
+            try:
+                with open(path, 'w', newline='', encoding=encoding) as f:
+                    f.write(content)
+            except Exception as e:
+                file_errors[file_name] = str(e)
+                continue
+            paths.append(path)
+
+        if file_errors:
+            raise SinkWriteError(paths, file_errors)
+        return paths
+
+class CsvSink(ExportSink):
+    """カテゴリ別統計のCSV（{kind}.csv）"""
+    name = "CSV"
+    extension = ".csv"
+
+    def render(self, snapshot: StatsSnapshot) -> List[ExportFile]:
+        from config import config
+        encoding = config.get_csv_encoding()
+        return [
+            (f"{kind}{self.extension}", render_category_csv(snapshot.categories[kind]), encoding)
+            for kind in TECH_KINDS
+        ]
+
+class MarkdownSink(ExportSink):
+    """カテゴリ別統計のMarkdown（{kind}.md）"""
+    name = "Markdown"
+    extension = ".md"
+
+    def render(self, snapshot: StatsSnapshot) -> List[ExportFile]:
+        return [
+            (
+                f"{kind}{self.extension}",
+                render_category_md(kind, snapshot.categories[kind], snapshot.start_filter, snapshot.end_filter),
+                'utf-8'
+            )
+            for kind in TECH_KINDS
+        ]
+
+class ProjectsCsvSink(ExportSink):
+    """プロジェクト一覧のCSV（projects.csv）"""
+    name = "プロジェクト一覧"
+
+    def render(self, snapshot: StatsSnapshot) -> List[ExportFile]:
+        from config import config
+        return [("projects.csv", render_projects_csv(snapshot.projects), config.get_csv_encoding())]
+
+class JsonSink(ExportSink):
+    """集計期間・サマリー・カテゴリ別統計・プロジェクト一覧をまとめたJSON（stats.json）"""
+    name = "JSON"
+
+    def render(self, snapshot: StatsSnapshot) -> List[ExportFile]:
+        content = json.dumps(
+            {
+                'start_filter': snapshot.start_filter,
+                'end_filter': snapshot.end_filter,
+                'summary': snapshot.summary,
+                'categories': snapshot.categories,
+                'projects': snapshot.projects
+            },
+            ensure_ascii=False,
+            indent=2
+        )
+        return [("stats.json", content, 'utf-8')]
+
+class ZipSink(ExportSink):
+    """他の出力先のファイルを1つのZIPにまとめる"""
+    name = "ZIP"
+
+    def __init__(self, sinks: List[ExportSink], file_name: str = "stats_export.zip"):
+        self.sinks = sinks
+        self.file_name = file_name
+
+    def render(self, snapshot: StatsSnapshot) -> List[ExportFile]:
+        files = []
+        for sink in self.sinks:
+            files.extend(sink.render(snapshot))
+        return files
+
+    def write(self, snapshot: StatsSnapshot, directory: str) -> List[str]:
+        path = os.path.join(directory, self.file_name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+            for file_name, content, encoding in self.render(snapshot):
+                bundle.writestr(file_name, content.encode(encoding))
+        return [path]
 
 class ExportService:
     def __init__(self, session: Session):
         self.session = session
-        self.stats = StatsService(session)
-    
+        self.stats = create_stats_service(session)
+
+    def build_snapshot(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> StatsSnapshot:
+        """
+        エクスポート用の集計結果を作成
+        全カテゴリの統計は compute_all_stats() で一括計算し、プロジェクト一覧も1回だけ取得する
+        """
+        all_stats = self.stats.compute_all_stats(start_filter, end_filter)
+
+        return StatsSnapshot(
+            start_filter=start_filter,
+            end_filter=end_filter,
+            categories=all_stats['categories'],
+            summary=all_stats['summary'],
+            projects=self._load_projects(start_filter, end_filter)
+        )
+
+    def _load_projects(self, start_filter: Optional[str], end_filter: Optional[str]) -> List[Dict[str, str]]:
+        """集計期間に該当するプロジェクトを出力用に整形して取得"""
+        from services.repository import Repository
+
+        filters = {}
+        if start_filter:
+            filters['start_date'] = start_filter
+        if end_filter:
+            filters['end_date'] = end_filter
+
+        return [
+            {
+                'name': project.name,
+                'work_summary': project.work_summary or '',
+                'start': project.project_start or '',
+                'end': project.project_end or '継続中',
+                'role': master_cache.get_name(self.session, 'role', project.role_id),
+                'task': master_cache.get_name(self.session, 'task', project.task_id),
+                'scale': project.scale_text or ''
+            }
+            for project in Repository(self.session).filter_projects(filters)
+        ]
+
+    def export_snapshot(
+        self,
+        snapshot: StatsSnapshot,
+        directory: str,
+        sinks: List[ExportSink],
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> List[SinkResult]:
+        """
+        集計結果を各出力先に書き出す
+        出力先ごとに書き込み時間を計測し、失敗した出力先があっても残りは続行する
+
+        progress: 進捗の通知先 progress(完了数, 全体数, 出力先名)（出力先ごとに呼び出す）
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        results = []
+        for i, sink in enumerate(sinks):
+            if progress:
+                progress(i, len(sinks), sink.name)
+
+            result = SinkResult(sink.name)
+            started = time.perf_counter()
+            try:
+                result.files = sink.write(snapshot, directory)
+            except SinkWriteError as e:
+                print(f"{sink.name} export error: {e}")
+                result.files = e.paths
+                result.file_errors = e.file_errors
+                result.error = str(e)
+            except Exception as e:
+                print(f"{sink.name} export error: {e}")
+                result.error = str(e)
+            result.seconds = time.perf_counter() - started
+            results.append(result)
+
+        return results
+
     def export_category_csv(
-        self, 
-        kind: str, 
+        self,
+        kind: str,
         file_path: str,
         start_filter: Optional[str] = None,
         end_filter: Optional[str] = None
@@ -21,31 +312,23 @@ class ExportService:
         """
         try:
             stats_data = self.stats.get_all_tech_stats(kind, start_filter, end_filter)
-            
+
             from config import config
             encoding = config.get_csv_encoding()
-            
+
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
+
             with open(file_path, 'w', newline='', encoding=encoding) as f:
-                writer = csv.writer(f)
-                writer.writerow(['技術名', '月数', '年月'])
-                
-                for item in stats_data:
-                    writer.writerow([
-                        item['name'],
-                        item['months'],
-                        item['display']
-                    ])
-            
+                f.write(render_category_csv(stats_data))
+
             return True
         except Exception as e:
             print(f"CSV export error: {e}")
             return False
-    
+
     def export_category_md(
-        self, 
-        kind: str, 
+        self,
+        kind: str,
         file_path: str,
         start_filter: Optional[str] = None,
         end_filter: Optional[str] = None
@@ -55,44 +338,32 @@ class ExportService:
         """
         try:
             stats_data = self.stats.get_all_tech_stats(kind, start_filter, end_filter)
-            
+
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            kind_display_map = {
-                'os': 'OS',
-                'language': '言語',
-                'framework': 'FW/ライブラリ',
-                'tool': 'ツール',
-                'cloud': 'クラウド',
-                'db': 'データベース'
-            }
-            
+
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"# {kind_display_map.get(kind, kind)}経験\n\n")
-                
-                if start_filter or end_filter:
-                    f.write("## 集計期間\n")
-                    if start_filter:
-                        f.write(f"- 開始: {start_filter}\n")
-                    if end_filter:
-                        f.write(f"- 終了: {end_filter}\n")
-                    f.write("\n")
-                
-                f.write("| 技術名 | 月数 | 年月 |\n")
-                f.write("|--------|------|------|\n")
-                
-                for item in stats_data:
-                    f.write(f"| {item['name']} | {item['months']} | {item['display']} |\n")
-                
-                f.write(f"\n合計: {len(stats_data)}件\n")
-            
+                f.write(render_category_md(kind, stats_data, start_filter, end_filter))
+
             return True
         except Exception as e:
             print(f"Markdown export error: {e}")
             return False
-    
+
+    def _export_all_categories(
+        self,
+        sink: ExportSink,
+        directory: str,
+        start_filter: Optional[str],
+        end_filter: Optional[str]
+    ) -> dict:
+        """カテゴリ別のファイルを書き出し、カテゴリごとの成否を返す（そのカテゴリのファイルを書き出せたか）"""
+        snapshot = self.build_snapshot(start_filter, end_filter)
+        result = self.export_snapshot(snapshot, directory, [sink])[0]
+        written = {os.path.basename(path) for path in result.files}
+        return {category: f"{category}{sink.extension}" in written for category in TECH_KINDS}
+
     def export_all_categories_csv(
-        self, 
+        self,
         directory: str,
         start_filter: Optional[str] = None,
         end_filter: Optional[str] = None
@@ -100,21 +371,10 @@ class ExportService:
         """
         全カテゴリーのCSVを一括エクスポート
         """
-        categories = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
-        results = {}
-        
-        for category in categories:
-            file_name = f"{category}.csv"
-            file_path = os.path.join(directory, file_name)
-            success = self.export_category_csv(
-                category, file_path, start_filter, end_filter
-            )
-            results[category] = success
-        
-        return results
-    
+        return self._export_all_categories(CsvSink(), directory, start_filter, end_filter)
+
     def export_all_categories_md(
-        self, 
+        self,
         directory: str,
         start_filter: Optional[str] = None,
         end_filter: Optional[str] = None
@@ -122,19 +382,8 @@ class ExportService:
         """
         全カテゴリーのMarkdownを一括エクスポート
         """
-        categories = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
-        results = {}
-        
-        for category in categories:
-            file_name = f"{category}.md"
-            file_path = os.path.join(directory, file_name)
-            success = self.export_category_md(
-                category, file_path, start_filter, end_filter
-            )
-            results[category] = success
-        
-        return results
-    
+        return self._export_all_categories(MarkdownSink(), directory, start_filter, end_filter)
+
     def export_projects_csv(
         self,
         file_path: str,
@@ -145,44 +394,17 @@ class ExportService:
         プロジェクト一覧をCSVにエクスポート
         """
         try:
-            from services.repository import Repository
-            repo = Repository(self.session)
-            
-            filters = {}
-            if start_filter:
-                filters['start_date'] = start_filter
-            if end_filter:
-                filters['end_date'] = end_filter
-            
-            projects = repo.filter_projects(filters)
-            
+            projects = self._load_projects(start_filter, end_filter)
+
             from config import config
             encoding = config.get_csv_encoding()
-            
+
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
+
             with open(file_path, 'w', newline='', encoding=encoding) as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'プロジェクト名', '業務内容', '開始', '終了',
-                    '役割', '作業', '規模'
-                ])
-                
-                for project in projects:
-                    role_name = project.role.name if project.role else ''
-                    task_name = project.task.name if project.task else ''
-                    
-                    writer.writerow([
-                        project.name,
-                        project.work_summary or '',
-                        project.project_start or '',
-                        project.project_end or '継続中',
-                        role_name,
-                        task_name,
-                        project.scale_text or ''
-                    ])
-            
+                f.write(render_projects_csv(projects))
+
             return True
         except Exception as e:
             print(f"Projects CSV export error: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,131 @@
+import threading
+from typing import List, Optional, Dict, Iterable
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+TECH_MASTER_KINDS = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
+
+class MasterRecord:
+    """
+    マスタ1件の読み取り専用コピー（セッション外でも参照可能）
+    ORMオブジェクトと同じ属性名を持つ。技術マスタの proficiency は習熟度の MasterRecord
+    """
+    __slots__ = ('id', 'name', 'note', 'order_index', 'proficiency_id', 'proficiency')
+
+    def __init__(self, instance, proficiency: Optional["MasterRecord"] = None):
+        self.id = instance.id
+        self.name = instance.name
+        self.note = instance.note
+        self.order_index = getattr(instance, 'order_index', None)
+        self.proficiency_id = getattr(instance, 'proficiency_id', None)
+        self.proficiency = proficiency
+
+class MasterCache:
+    """
+    マスタデータのキャッシュ（プロセス内で保持）
+
+    種別ごとに Repository.get_master_by_kind() と同じ並び順のリストと、
+    id → レコード・名前 → レコード の辞書を保持する。
+    名前の解決や一覧の取得でSQLiteへの問い合わせを不要にする。
+
+    - マスタを変更する Repository のメソッドが mark_dirty() で該当種別を破棄する
+    - コミット・ロールバック時にも再度破棄し、コミット前の状態を残さない
+    - 習熟度は技術マスタのレコードに埋め込むため、習熟度の変更時は技術マスタも破棄する
+    """
+
+    def __init__(self):
+        self._bind = None
+        self._records: Dict[str, List[MasterRecord]] = {}
+        self._by_id: Dict[str, Dict[int, MasterRecord]] = {}
+        self._by_name: Dict[str, Dict[str, MasterRecord]] = {}
+        self._lock = threading.RLock()
+
+    def invalidate(self, kind: Optional[str] = None):
+        """指定種別（省略時は全種別）のキャッシュを破棄"""
+        with self._lock:
+            if kind is None:
+                self._records = {}
+                self._by_id = {}
+                self._by_name = {}
+                return
+
+            kinds = [kind] + (TECH_MASTER_KINDS if kind == 'proficiency' else [])
+            for k in kinds:
+                self._records.pop(k, None)
+                self._by_id.pop(k, None)
+                self._by_name.pop(k, None)
+
+    def _load(self, session: Session, kind: str) -> List[MasterRecord]:
+        """指定種別のマスタを読み込んでキャッシュ"""
+        from services.repository import Repository
+
+        with self._lock:
+            bind = session.get_bind()
+            if bind is not self._bind:
+                self.invalidate()
+                self._bind = bind
+
+            if kind in self._records:
+                return self._records[kind]
+
+            proficiencies = {}
+            if kind in TECH_MASTER_KINDS:
+                proficiencies = self.get_by_id(session, 'proficiency')
+
+            records = [
+                MasterRecord(instance, proficiencies.get(getattr(instance, 'proficiency_id', None)))
+                for instance in Repository(session).get_master_by_kind(kind)
+            ]
+            self._records[kind] = records
+            self._by_id[kind] = {record.id: record for record in records}
+            self._by_name[kind] = {record.name: record for record in records}
+            return records
+
+    def get_records(self, session: Session, kind: str) -> List[MasterRecord]:
+        """Repository.get_master_by_kind() と同じ並び順のマスタ一覧"""
+        return list(self._load(session, kind))
+
+    def get_by_id(self, session: Session, kind: str) -> Dict[int, MasterRecord]:
+        """id → レコード の辞書"""
+        with self._lock:
+            self._load(session, kind)
+            return self._by_id[kind]
+
+    def get(self, session: Session, kind: str, master_id: Optional[int]) -> Optional[MasterRecord]:
+        """idからマスタを取得（存在しない場合はNone）"""
+        return self.get_by_id(session, kind).get(master_id)
+
+    def get_name(self, session: Session, kind: str, master_id: Optional[int], default: str = "") -> str:
+        """idからマスタ名を取得"""
+        record = self.get(session, kind, master_id)
+        return record.name if record else default
+
+    def get_names(self, session: Session, kind: str, master_ids: Iterable[int]) -> List[str]:
+        """複数idのマスタ名をマスタの並び順で取得"""
+        ids = set(master_ids)
+        return [record.name for record in self._load(session, kind) if record.id in ids]
+
+    def find_by_name(self, session: Session, kind: str, name: str) -> Optional[MasterRecord]:
+        """名前からマスタを取得（存在しない場合はNone）"""
+        with self._lock:
+            self._load(session, kind)
+            return self._by_name[kind].get(name)
+
+    def mark_dirty(self, session: Session, kind: str):
+        """マスタを変更したセッションを記録して該当種別を破棄"""
+        session.info.setdefault('master_cache_dirty', set()).add(kind)
+        self.invalidate(kind)
+
+master_cache = MasterCache()
+
+def _invalidate_dirty_kinds(session):
+    for kind in session.info.pop('master_cache_dirty', ()):
+        master_cache.invalidate(kind)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    _invalidate_dirty_kinds(session)
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_rollback(session):
+    _invalidate_dirty_kinds(session)
@@ -0,0 +1,228 @@
+import threading
+from typing import List, Tuple, Optional, Dict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import Project, TechUsage
+from services.stats import StatsService
+
+class MonthBitsetIndex:
+    """
+    技術ごとの経験月ビットセット索引（プロセス内で保持）
+
+    最古の使用月を0ビット目として、終了日のある使用期間が含む月のビットを立てた整数を
+    (kind, tech_id) ごとに保持する。期間フィルタ付きの月数計算は
+    マスクとpopcountで求め、日付文字列の再解析を不要にする。
+
+    - 終了日なし（継続中）の使用期間は終了月が当日・集計期間に依存するため、
+      技術ごとの最も早い開始月だけを保持し、問い合わせ時にマスクを生成する
+    - 集計期間の開始月・終了月は日単位の比較で含まれるかが変わるため、
+      その2ヶ月だけは StatsService.clipped_interval() で個別に判定する
+    - tech_usages・プロジェクト期間が変わったら invalidate() で破棄し、次回の問い合わせで再構築する
+    - バックグラウンドのジョブからも参照されるため、構築・破棄・問い合わせはロックで直列化する
+    """
+
+    def __init__(self):
+        self._bind = None
+        self._base_month = 0
+        self._closed_bits: Dict[Tuple[str, int], int] = {}
+        self._open_start: Dict[Tuple[str, int], int] = {}
+        self._periods: Dict[Tuple[str, int], List[Tuple[int, Optional[int], str, Optional[str]]]] = {}
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        """索引を破棄（次回の問い合わせで再構築）"""
+        with self._lock:
+            self._bind = None
+            self._closed_bits = {}
+            self._open_start = {}
+            self._periods = {}
+
+    def is_built(self) -> bool:
+        return self._bind is not None
+
+    def build(self, session: Session):
+        """tech_usages とプロジェクト期間から索引を構築"""
+        stats = StatsService(session)
+        rows = session.query(
+            TechUsage.kind,
+            TechUsage.tech_id,
+            TechUsage.start,
+            TechUsage.end,
+            TechUsage.start_month,
+            TechUsage.end_month,
+            Project.project_start,
+            Project.project_end,
+            Project.start_month,
+            Project.end_month
+        ).join(
+            Project, Project.id == TechUsage.project_id
+        ).all()
+
+        periods: Dict[Tuple[str, int], List[Tuple[int, Optional[int], str, Optional[str]]]] = {}
+        for (kind, tech_id, usage_start, usage_end, usage_start_month, usage_end_month,
+                project_start, project_end, project_start_month, project_end_month) in rows:
+            use_start, use_end = stats.effective_usage_period(
+                usage_start, usage_end, project_start, project_end
+            )
+            if not use_start:
+                continue
+            # 月序数は生成列から取得（effective_usage_period() と同じ期間選択）
+            if usage_start_month is not None:
+                start_month, end_month = usage_start_month, usage_end_month
+            else:
+                start_month, end_month = project_start_month, project_end_month
+            periods.setdefault((kind, tech_id), []).append((start_month, end_month, use_start, use_end))
+
+        base_month = min(
+            (p[0] for tech_periods in periods.values() for p in tech_periods),
+            default=0
+        )
+
+        closed_bits = {}
+        open_start = {}
+        for key, tech_periods in periods.items():
+            bits = 0
+            for start_month, end_month, _, _ in tech_periods:
+                if end_month is None:
+                    if key not in open_start or start_month < open_start[key]:
+                        open_start[key] = start_month
+                elif end_month >= start_month:
+                    bits |= self._range_mask(start_month - base_month, end_month - base_month)
+            closed_bits[key] = bits
+
+        with self._lock:
+            self._base_month = base_month
+            self._closed_bits = closed_bits
+            self._open_start = open_start
+            self._periods = periods
+            self._bind = session.get_bind()
+
+    def ensure_built(self, session: Session):
+        with self._lock:
+            if self._bind is None or self._bind is not session.get_bind():
+                self.build(session)
+
+    def _range_mask(self, low_bit: int, high_bit: int) -> int:
+        """low_bit〜high_bit（両端含む）のビットを立てたマスク"""
+        low_bit = max(low_bit, 0)
+        if high_bit < low_bit:
+            return 0
+        return ((1 << (high_bit - low_bit + 1)) - 1) << low_bit
+
+    def _month_covered(
+        self,
+        stats: StatsService,
+        key: Tuple[str, int],
+        month: int,
+        start_filter: Optional[str],
+        end_filter: Optional[str]
+    ) -> bool:
+        """集計期間の境界月が切り詰め後の使用期間に含まれるか"""
+        for start_month, end_month, use_start, use_end in self._periods.get(key, []):
+            if start_month > month or (end_month is not None and end_month < month):
+                continue
+            interval = stats.clipped_interval(use_start, use_end, start_filter, end_filter)
+            if interval and interval[0] <= month <= interval[1]:
+                return True
+        return False
+
+    def count_months(
+        self,
+        session: Session,
+        kind: str,
+        tech_id: int,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> int:
+        """
+        集計期間内の重複なし経験月数を取得
+        StatsService.tech_experience_unique_months() と同じ結果を返す
+        """
+        with self._lock:
+            return self._count_months(session, kind, tech_id, start_filter, end_filter)
+
+    def _count_months(
+        self,
+        session: Session,
+        kind: str,
+        tech_id: int,
+        start_filter: Optional[str],
+        end_filter: Optional[str]
+    ) -> int:
+        self.ensure_built(session)
+        key = (kind, tech_id)
+        if key not in self._periods:
+            return 0
+
+        stats = StatsService(session)
+        base = self._base_month
+        first_month = stats.month_ordinal(start_filter) if start_filter else None
+        last_month = stats.month_ordinal(end_filter) if end_filter else None
+
+        if first_month is not None and last_month is not None and last_month < first_month:
+            return 0
+
+        # 境界月（フィルタ指定のある開始月・終了月）
+        boundary_months = {m for m in (first_month, last_month) if m is not None}
+        count = sum(
+            1 for month in boundary_months
+            if self._month_covered(stats, key, month, start_filter, end_filter)
+        )
+
+        # 境界月を除いた内側の範囲
+        low = first_month + 1 if first_month is not None else base
+        if last_month is not None:
+            high = last_month - 1
+        else:
+            high = None
+
+        bits = self._closed_bits.get(key, 0)
+        open_start = self._open_start.get(key)
+        if open_start is not None:
+            open_end = last_month if last_month is not None else stats.current_month_ordinal()
+            bits |= self._range_mask(open_start - base, open_end - base)
+
+        if high is None:
+            mask_bits = bits >> max(low - base, 0)
+        else:
+            if high < low:
+                return count
+            mask_bits = bits & self._range_mask(low - base, high - base)
+
+        return count + bin(mask_bits).count('1')
+
+    def months_by_tech(
+        self,
+        session: Session,
+        kind: str,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[int, int]:
+        """指定カテゴリのtech_idごとの集計期間内の経験月数"""
+        with self._lock:
+            self.ensure_built(session)
+            result = {}
+            for index_kind, tech_id in list(self._periods.keys()):
+                if index_kind == kind:
+                    result[tech_id] = self._count_months(session, kind, tech_id, start_filter, end_filter)
+            return result
+
+    def mark_dirty(self, session: Session):
+        """
+        tech_usages を変更したセッションを記録して索引を破棄
+        コミット・ロールバック時にも再度破棄し、他セッションで構築された古い索引を残さない
+        """
+        session.info['month_index_dirty'] = True
+        self.invalidate()
+
+month_index = MonthBitsetIndex()
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop('month_index_dirty', False):
+        month_index.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_rollback(session):
+    if session.info.pop('month_index_dirty', False):
+        month_index.invalidate()
@@ -1,6 +1,7 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import List, Optional, Dict, Any, Set
+from dataclasses import dataclass, field
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, select, insert, delete, literal, union_all
 from datetime import date
 from models import (
     Project, Engagement, TechUsage, SelfPR,
@@ -12,6 +13,68 @@ from models import (
 from models.master import Qualification
 from models.qualification import UserQualification
 from models.other_experience import OtherExperience
+from models.project_search import (
+    PROJECT_SEARCH_MIN_LENGTH, is_project_search_available, project_search_matches
+)
+from services.master_cache import master_cache
+from services.change_events import (
+    change_bus, ChangeEvent, ProjectChanged, MasterChanged, TechUsageChanged,
+    SelfPRChanged, QualificationChanged, OtherExperienceChanged
+)
+
+# 技術カテゴリごとの Project の関連属性と中間テーブルの技術ID列
+PROJECT_TECH_RELATIONS = {
+    'os': ('project_oses', 'os_id'),
+    'language': ('project_languages', 'language_id'),
+    'framework': ('project_frameworks', 'framework_id'),
+    'tool': ('project_tools', 'tool_id'),
+    'cloud': ('project_clouds', 'cloud_id'),
+    'db': ('project_dbs', 'db_id')
+}
+
+@dataclass
+class ProjectAggregate:
+    """プロジェクト編集画面の表示に必要な値をまとめたもの（セッション外でも参照可能）"""
+    id: int
+    name: Optional[str] = None
+    work_summary: Optional[str] = None
+    detail: Optional[str] = None
+    project_start: Optional[str] = None
+    project_end: Optional[str] = None
+    scale_text: Optional[str] = None
+    end_user: Optional[str] = None
+    contract_company: Optional[str] = None
+    remarks: Optional[str] = None
+    role_ids: Set[int] = field(default_factory=set)
+    role_names: List[str] = field(default_factory=list)
+    task_ids: Set[int] = field(default_factory=set)
+    task_names: List[str] = field(default_factory=list)
+    tech_ids: Dict[str, Set[int]] = field(default_factory=dict)
+
+class ProjectRow:
+    """
+    プロジェクト一覧の1行（セッション外でも参照可能）
+    一覧の表示と、期間・文字列・技術による絞り込み（ProjectFilterProxyModel）に必要な値だけを持つ
+    """
+    __slots__ = (
+        'id', 'name', 'role_name', 'project_start', 'project_end',
+        'scale_text', 'end_user', 'contract_company', 'search_text', 'tech_ids'
+    )
+
+    def __init__(self, id: int, name: Optional[str], role_name: str,
+                 project_start: Optional[str], project_end: Optional[str],
+                 scale_text: Optional[str], end_user: Optional[str], contract_company: Optional[str],
+                 search_text: str, tech_ids: Dict[str, Set[int]]):
+        self.id = id
+        self.name = name
+        self.role_name = role_name
+        self.project_start = project_start
+        self.project_end = project_end
+        self.scale_text = scale_text
+        self.end_user = end_user
+        self.contract_company = contract_company
+        self.search_text = search_text  # 名前・業務内容・詳細を改行で連結して casefold した検索用文字列
+        self.tech_ids = tech_ids        # {kind: 技術IDの集合}
 
 class Repository:
     def __init__(self, session: Session):
@@ -23,28 +86,166 @@ class Repository:
     def get_project_by_id(self, project_id: int) -> Optional[Project]:
         return self.session.query(Project).filter_by(id=project_id).first()
     
+    def load_project_aggregate(self, project_id: int) -> Optional[ProjectAggregate]:
+        """
+        プロジェクトと役割・作業・技術の関連を selectinload でまとめて読み込む
+        関連の件数によらずクエリ数は一定。役割・作業名は MasterCache から解決する
+        """
+        project = self.session.query(Project).options(
+            selectinload(Project.project_roles),
+            selectinload(Project.project_tasks),
+            *[selectinload(getattr(Project, attr)) for attr, _ in PROJECT_TECH_RELATIONS.values()]
+        ).filter_by(id=project_id).first()
+
+        if not project:
+            return None
+
+        role_ids = {pr.role_id for pr in project.project_roles}
+        task_ids = {pt.task_id for pt in project.project_tasks}
+
+        return ProjectAggregate(
+            id=project.id,
+            name=project.name,
+            work_summary=project.work_summary,
+            detail=project.detail,
+            project_start=project.project_start,
+            project_end=project.project_end,
+            scale_text=project.scale_text,
+            end_user=project.end_user,
+            contract_company=project.contract_company,
+            remarks=project.remarks,
+            role_ids=role_ids,
+            role_names=master_cache.get_names(self.session, 'role', role_ids),
+            task_ids=task_ids,
+            task_names=master_cache.get_names(self.session, 'task', task_ids),
+            tech_ids={
+                kind: {getattr(row, id_field) for row in getattr(project, attr)}
+                for kind, (attr, id_field) in PROJECT_TECH_RELATIONS.items()
+            }
+        )
+    
+    def load_project_rows(self, project_ids: Optional[List[int]] = None) -> List[ProjectRow]:
+        """
+        プロジェクト一覧の行を開始日の新しい順に取得（project_ids 指定時はそのプロジェクトのみ）
+        プロジェクトの列と技術の関連はそれぞれ一括で読み込み、役割名は MasterCache から解決する
+        """
+        query = select(
+            Project.id, Project.name, Project.work_summary, Project.detail,
+            Project.project_start, Project.project_end, Project.role_id,
+            Project.scale_text, Project.end_user, Project.contract_company
+        )
+        if project_ids is not None:
+            query = query.where(Project.id.in_(project_ids))
+        projects = self.session.execute(query.order_by(Project.project_start.desc())).all()
+
+        # 技術の関連は6テーブル分を UNION ALL で1回に読み込む
+        link_selects = []
+        for kind, (attr, id_field) in PROJECT_TECH_RELATIONS.items():
+            model = getattr(Project, attr).property.mapper.class_
+            link_select = select(literal(kind), model.project_id, getattr(model, id_field))
+            if project_ids is not None:
+                link_select = link_select.where(model.project_id.in_(project_ids))
+            link_selects.append(link_select)
+
+        tech_ids: Dict[int, Dict[str, Set[int]]] = {project.id: {} for project in projects}
+        for kind, project_id, tech_id in self.session.execute(union_all(*link_selects)):
+            project_techs = tech_ids.get(project_id)
+            if project_techs is not None:
+                project_techs.setdefault(kind, set()).add(tech_id)
+
+        roles = master_cache.get_by_id(self.session, 'role')
+        return [
+            ProjectRow(
+                id=project.id,
+                name=project.name,
+                role_name=roles[project.role_id].name if project.role_id in roles else "",
+                project_start=project.project_start,
+                project_end=project.project_end,
+                scale_text=project.scale_text,
+                end_user=project.end_user,
+                contract_company=project.contract_company,
+                search_text='\n'.join(
+                    value for value in (project.name, project.work_summary, project.detail) if value
+                ).casefold(),
+                tech_ids=tech_ids[project.id]
+            )
+            for project in projects
+        ]
+    
     def create_project(self, data: Dict[str, Any]) -> Project:
         project = Project(**data)
         self.session.add(project)
         self.session.flush()
+        self._project_changed([project.id], period_changed=True)
         return project
     
     def update_project(self, project_id: int, data: Dict[str, Any]) -> Optional[Project]:
         project = self.get_project_by_id(project_id)
         if project:
+            period_changed = any(
+                key in data and data[key] != getattr(project, key)
+                for key in ('project_start', 'project_end')
+            )
             for key, value in data.items():
                 setattr(project, key, value)
             self.session.flush()
+            self._project_changed([project_id], period_changed=period_changed)
+            if period_changed:
+                self._refresh_experience_summary_for_projects([project_id])
         return project
     
     def delete_project(self, project_id: int) -> bool:
         project = self.get_project_by_id(project_id)
         if project:
+            affected = self._get_experience_summary_service().get_usage_keys_by_projects([project_id])
             self.session.delete(project)
             self.session.flush()
+            self._project_changed([project_id], period_changed=True)
+            self._refresh_experience_summary(affected)
             return True
         return False
     
+    def _publish(self, change: ChangeEvent):
+        """変更イベントを記録（コミット後に配信される）"""
+        change_bus.publish(self.session, change)
+    
+    def _project_changed(self, project_ids: List[int], period_changed: bool = False):
+        self._publish(ProjectChanged(frozenset(project_ids), period_changed))
+    
+    def _master_changed(self, kind: str):
+        """マスタキャッシュを破棄して変更イベントを記録"""
+        master_cache.mark_dirty(self.session, kind)
+        self._publish(MasterChanged(kind))
+    
+    def _tech_usages_changed(self, keys):
+        """技術使用期間の変更イベントを (kind, tech_id) からカテゴリごとに記録"""
+        tech_ids_by_kind: Dict[str, Set[int]] = {}
+        for kind, tech_id in keys:
+            tech_ids_by_kind.setdefault(kind, set()).add(tech_id)
+        for kind, tech_ids in tech_ids_by_kind.items():
+            self._publish(TechUsageChanged(kind, frozenset(tech_ids)))
+    
+    def _get_experience_summary_service(self):
+        from services.experience_summary import ExperienceSummaryService
+        return ExperienceSummaryService(self.session)
+    
+    def _refresh_experience_summary(self, keys):
+        """tech_experience_summary の指定 (kind, tech_id) を再計算し、月ビットセット索引を破棄"""
+        from services.month_index import month_index
+        month_index.mark_dirty(self.session)
+        if keys:
+            self._get_experience_summary_service().refresh_techs(keys)
+            self._tech_usages_changed(keys)
+    
+    def _refresh_experience_summary_for_projects(self, project_ids: List[int]):
+        """指定プロジェクトの使用期間に関係する tech_experience_summary を再計算し、月ビットセット索引を破棄"""
+        from services.month_index import month_index
+        month_index.mark_dirty(self.session)
+        summary_service = self._get_experience_summary_service()
+        keys = summary_service.get_usage_keys_by_projects(project_ids)
+        summary_service.refresh_techs(keys)
+        self._tech_usages_changed(keys)
+    
     def get_master_by_kind(self, kind: str) -> List:
         master_map = {
             'os': OS,
@@ -95,6 +296,7 @@ class Repository:
                     instance = model(name=name, note=note)
             self.session.add(instance)
             self.session.flush()
+            self._master_changed(kind)
             return instance
         return None
     
@@ -121,6 +323,7 @@ class Repository:
                 if kind in ['os', 'language', 'framework', 'tool', 'cloud', 'db']:
                     instance.proficiency_id = proficiency_id
                 self.session.flush()
+                self._master_changed(kind)
                 return True
         return False
     
@@ -143,6 +346,7 @@ class Repository:
             if instance:
                 self.session.delete(instance)
                 self.session.flush()
+                self._master_changed(kind)
                 return True
         return False
 
@@ -168,6 +372,7 @@ class Repository:
             item.order_index = index
 
         self.session.flush()
+        self._master_changed(kind)
 
     def move_master_up(self, kind: str, master_id: int) -> bool:
         """マスタを1つ上に移動（order_indexを小さくする）"""
@@ -204,6 +409,7 @@ class Repository:
             # order_indexを入れ替え
             target.order_index, prev_item.order_index = prev_item.order_index, target.order_index
             self.session.flush()
+            self._master_changed(kind)
             return True
 
         return False
@@ -246,6 +452,7 @@ class Repository:
             # order_indexを入れ替え
             target.order_index, next_item.order_index = next_item.order_index, target.order_index
             self.session.flush()
+            self._master_changed(kind)
             return True
 
         return False
@@ -266,6 +473,7 @@ class Repository:
             if tech:
                 tech.proficiency_id = proficiency_id
                 self.session.flush()
+                self._master_changed(kind)
                 return True
         return False
 
@@ -276,6 +484,7 @@ class Repository:
         engagement = Engagement(**data)
         self.session.add(engagement)
         self.session.flush()
+        self._project_changed([engagement.project_id])
         return engagement
     
     def update_engagement(self, engagement_id: int, data: Dict[str, Any]) -> Optional[Engagement]:
@@ -284,6 +493,7 @@ class Repository:
             for key, value in data.items():
                 setattr(engagement, key, value)
             self.session.flush()
+            self._project_changed([engagement.project_id])
         return engagement
     
     def delete_engagement(self, engagement_id: int) -> bool:
@@ -291,6 +501,7 @@ class Repository:
         if engagement:
             self.session.delete(engagement)
             self.session.flush()
+            self._project_changed([engagement.project_id])
             return True
         return False
     
@@ -301,25 +512,63 @@ class Repository:
         usage = TechUsage(**data)
         self.session.add(usage)
         self.session.flush()
+        self._refresh_experience_summary([(usage.kind, usage.tech_id)])
         return usage
     
     def update_tech_usage(self, usage_id: int, data: Dict[str, Any]) -> Optional[TechUsage]:
         usage = self.session.query(TechUsage).filter_by(id=usage_id).first()
         if usage:
+            affected = {(usage.kind, usage.tech_id)}
             for key, value in data.items():
                 setattr(usage, key, value)
             self.session.flush()
+            affected.add((usage.kind, usage.tech_id))
+            self._refresh_experience_summary(affected)
         return usage
     
     def delete_tech_usage(self, usage_id: int) -> bool:
         usage = self.session.query(TechUsage).filter_by(id=usage_id).first()
         if usage:
+            affected = [(usage.kind, usage.tech_id)]
             self.session.delete(usage)
             self.session.flush()
+            self._refresh_experience_summary(affected)
             return True
         return False
     
-    def link_project_tech(self, project_id: int, kind: str, tech_ids: List[int]):
+    def _sync_link_rows(self, model, id_field: str, project_id: int, ids: List[int]) -> bool:
+        """
+        プロジェクトの関連テーブルを差分更新
+        既存行との差集合だけを一括DELETE・一括INSERTし、変更があったかを返す
+        """
+        column = getattr(model, id_field)
+        existing = {
+            row[0] for row in self.session.query(column).filter(model.project_id == project_id)
+        }
+        desired = set(ids)
+        
+        to_delete = existing - desired
+        to_add = desired - existing
+        
+        if to_delete:
+            self.session.query(model).filter(
+                model.project_id == project_id,
+                column.in_(to_delete)
+            ).delete()
+        
+        if to_add:
+            self.session.execute(
+                insert(model),
+                [{'project_id': project_id, id_field: item_id} for item_id in to_add]
+            )
+        
+        changed = bool(to_delete or to_add)
+        if changed:
+            self._project_changed([project_id])
+        return changed
+    
+    def link_project_tech(self, project_id: int, kind: str, tech_ids: List[int]) -> bool:
+        """プロジェクトに技術を関連付ける（差分更新、変更があればTrue）"""
         relation_map = {
             'os': (ProjectOS, 'os_id'),
             'language': (ProjectLanguage, 'language_id'),
@@ -330,19 +579,10 @@ class Repository:
         }
         
         if kind not in relation_map:
-            return
+            return False
         
         model, tech_field = relation_map[kind]
-        
-        existing = self.session.query(model).filter_by(project_id=project_id).all()
-        for item in existing:
-            self.session.delete(item)
-        
-        for tech_id in tech_ids:
-            relation = model(project_id=project_id, **{tech_field: tech_id})
-            self.session.add(relation)
-        
-        self.session.flush()
+        return self._sync_link_rows(model, tech_field, project_id, tech_ids)
     
     def get_project_techs(self, project_id: int, kind: str) -> List[int]:
         relation_map = {
@@ -361,34 +601,18 @@ class Repository:
         results = self.session.query(model).filter_by(project_id=project_id).all()
         return [getattr(r, tech_field) for r in results]
 
-    def link_project_roles(self, project_id: int, role_ids: List[int]):
-        """プロジェクトに役割を複数関連付ける"""
-        # 既存の関連を削除
-        self.session.query(ProjectRole).filter_by(project_id=project_id).delete()
-
-        # 新しい関連を追加
-        for role_id in role_ids:
-            relation = ProjectRole(project_id=project_id, role_id=role_id)
-            self.session.add(relation)
-
-        self.session.flush()
+    def link_project_roles(self, project_id: int, role_ids: List[int]) -> bool:
+        """プロジェクトに役割を複数関連付ける（差分更新、変更があればTrue）"""
+        return self._sync_link_rows(ProjectRole, 'role_id', project_id, role_ids)
 
     def get_project_roles(self, project_id: int) -> List[int]:
         """プロジェクトに関連付けられた役割IDのリストを取得"""
         results = self.session.query(ProjectRole).filter_by(project_id=project_id).all()
         return [r.role_id for r in results]
 
-    def link_project_tasks(self, project_id: int, task_ids: List[int]):
-        """プロジェクトに作業を複数関連付ける"""
-        # 既存の関連を削除
-        self.session.query(ProjectTask).filter_by(project_id=project_id).delete()
-
-        # 新しい関連を追加
-        for task_id in task_ids:
-            relation = ProjectTask(project_id=project_id, task_id=task_id)
-            self.session.add(relation)
-
-        self.session.flush()
+    def link_project_tasks(self, project_id: int, task_ids: List[int]) -> bool:
+        """プロジェクトに作業を複数関連付ける（差分更新、変更があればTrue）"""
+        return self._sync_link_rows(ProjectTask, 'task_id', project_id, task_ids)
 
     def get_project_tasks(self, project_id: int) -> List[int]:
         """プロジェクトに関連付けられた作業IDのリストを取得"""
@@ -404,6 +628,7 @@ class Repository:
         existing_keys = {(u.kind, u.tech_id) for u in existing_usages}
         
         tech_kinds = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
+        added = set()
         
         for kind in tech_kinds:
             tech_ids = self.get_project_techs(project_id, kind)
@@ -417,8 +642,10 @@ class Repository:
                         end=project.project_end
                     )
                     self.session.add(usage)
+                    added.add((kind, tech_id))
         
         self.session.flush()
+        self._refresh_experience_summary(added)
     
     def auto_generate_tech_usages_from_engagement(self, project_id: int, engagement_id: int):
         engagement = self.session.query(Engagement).filter_by(id=engagement_id).first()
@@ -429,6 +656,7 @@ class Repository:
         existing_keys = {(u.kind, u.tech_id) for u in existing_usages}
         
         tech_kinds = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
+        added = set()
         
         for kind in tech_kinds:
             tech_ids = self.get_project_techs(project_id, kind)
@@ -442,8 +670,10 @@ class Repository:
                         end=engagement.site_end
                     )
                     self.session.add(usage)
+                    added.add((kind, tech_id))
         
         self.session.flush()
+        self._refresh_experience_summary(added)
     
     def filter_projects(self, filters: Dict[str, Any]) -> List[Project]:
         query = self.session.query(Project)
@@ -460,13 +690,22 @@ class Repository:
         if 'role_id' in filters and filters['role_id']:
             query = query.filter(Project.role_id == filters['role_id'])
         
+        order_by = [Project.project_start.desc()]
         if 'text' in filters and filters['text']:
-            text = f"%{filters['text']}%"
-            query = query.filter(or_(
-                Project.name.like(text),
-                Project.work_summary.like(text),
-                Project.detail.like(text)
-            ))
+            search_text = filters['text']
+            if (len(search_text) >= PROJECT_SEARCH_MIN_LENGTH
+                    and is_project_search_available(self.session.get_bind())):
+                # 全文検索索引で絞り込み、関連度の高い順に並べる
+                matches = project_search_matches(search_text)
+                query = query.join(matches, matches.c.project_id == Project.id)
+                order_by = [matches.c.rank, Project.project_start.desc()]
+            else:
+                text = f"%{search_text}%"
+                query = query.filter(or_(
+                    Project.name.like(text),
+                    Project.work_summary.like(text),
+                    Project.detail.like(text)
+                ))
         
         if 'tech_filters' in filters:
             for kind, tech_ids in filters['tech_filters'].items():
@@ -488,22 +727,95 @@ class Repository:
                         ).subquery()
                         query = query.filter(Project.id.in_(subq))
         
-        return query.order_by(Project.project_start.desc()).all()
+        return query.order_by(*order_by).all()
     
     def delete_tech_usages_by_project(self, project_id: int):
         """指定プロジェクトの技術使用期間をすべて削除"""
+        affected = self._get_experience_summary_service().get_usage_keys_by_projects([project_id])
         self.session.query(TechUsage).filter(
             TechUsage.project_id == project_id
         ).delete()
+        self._refresh_experience_summary(affected)
         self.session.commit()
     
     def create_tech_usage(self, data: dict):
         """技術使用期間を作成"""
         tech_usage = TechUsage(**data)
         self.session.add(tech_usage)
+        self.session.flush()
+        self._refresh_experience_summary([(tech_usage.kind, tech_usage.tech_id)])
         self.session.commit()
         return tech_usage
     
+    def sync_tech_usages_from_selections(self, project_ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """
+        プロジェクトの技術選択（project_* テーブル）から tech_usages を再生成
+        
+        DELETE と INSERT ... SELECT の2文で同期し、コミットは呼び出し側のトランザクションに任せる。
+        project_ids 未指定時は全プロジェクトが対象。
+        
+        戻り値: {'projects': 対象プロジェクト数, 'deleted': 削除件数, 'inserted': 作成件数}
+        """
+        relation_map = {
+            'os': (ProjectOS, ProjectOS.os_id),
+            'language': (ProjectLanguage, ProjectLanguage.language_id),
+            'framework': (ProjectFramework, ProjectFramework.framework_id),
+            'tool': (ProjectTool, ProjectTool.tool_id),
+            'cloud': (ProjectCloud, ProjectCloud.cloud_id),
+            'db': (ProjectDB, ProjectDB.db_id)
+        }
+        
+        summary_service = self._get_experience_summary_service()
+        affected = set()
+        if project_ids is not None:
+            project_ids = list(project_ids)
+            if not project_ids:
+                return {'projects': 0, 'deleted': 0, 'inserted': 0}
+            affected = summary_service.get_usage_keys_by_projects(project_ids)
+        
+        project_count_query = self.session.query(func.count(Project.id))
+        delete_stmt = delete(TechUsage)
+        if project_ids is not None:
+            project_count_query = project_count_query.filter(Project.id.in_(project_ids))
+            delete_stmt = delete_stmt.where(TechUsage.project_id.in_(project_ids))
+        project_count = project_count_query.scalar()
+        
+        selects = []
+        for kind, (model, tech_column) in relation_map.items():
+            select_stmt = select(
+                Project.id,
+                literal(kind),
+                tech_column,
+                Project.project_start,
+                Project.project_end
+            ).join(model, model.project_id == Project.id)
+            if project_ids is not None:
+                select_stmt = select_stmt.where(Project.id.in_(project_ids))
+            selects.append(select_stmt)
+        
+        self.session.flush()
+        deleted = self.session.execute(delete_stmt).rowcount
+        inserted = self.session.execute(
+            insert(TechUsage).from_select(
+                ['project_id', 'kind', 'tech_id', 'start', 'end'],
+                union_all(*selects)
+            )
+        ).rowcount
+        
+        # 集計テーブルは対象プロジェクトの前後の技術だけ、全件同期の場合は全件再構築
+        from services.month_index import month_index
+        month_index.mark_dirty(self.session)
+        if project_ids is None:
+            summary_service.rebuild()
+            for kind in relation_map:
+                self._publish(TechUsageChanged(kind))
+        else:
+            affected |= summary_service.get_usage_keys_by_projects(project_ids)
+            summary_service.refresh_techs(affected)
+            self._tech_usages_changed(affected)
+        
+        return {'projects': project_count, 'deleted': deleted, 'inserted': inserted}
+    
     # 自己PR管理
     def get_all_self_prs(self) -> List[SelfPR]:
         """全ての自己PRを取得（順序順）"""
@@ -518,6 +830,7 @@ class Repository:
         pr = SelfPR(**data)
         self.session.add(pr)
         self.session.flush()
+        self._publish(SelfPRChanged())
         return pr
     
     def update_self_pr(self, pr_id: int, data: Dict[str, Any]) -> Optional[SelfPR]:
@@ -527,6 +840,7 @@ class Repository:
             for key, value in data.items():
                 setattr(pr, key, value)
             self.session.flush()
+            self._publish(SelfPRChanged())
         return pr
     
     def delete_self_pr(self, pr_id: int) -> bool:
@@ -535,6 +849,7 @@ class Repository:
         if pr:
             self.session.delete(pr)
             self.session.flush()
+            self._publish(SelfPRChanged())
             return True
         return False
     
@@ -545,6 +860,7 @@ class Repository:
             if pr:
                 pr.order_index = item['order']
         self.session.flush()
+        self._publish(SelfPRChanged())
     
     # 資格取得年月の管理
     def get_all_user_qualifications(self) -> List[UserQualification]:
@@ -560,6 +876,7 @@ class Repository:
         qualification = UserQualification(**data)
         self.session.add(qualification)
         self.session.flush()
+        self._publish(QualificationChanged())
         return qualification
     
     def update_user_qualification(self, qualification_id: int, data: Dict[str, Any]) -> Optional[UserQualification]:
@@ -569,6 +886,7 @@ class Repository:
             for key, value in data.items():
                 setattr(qualification, key, value)
             self.session.flush()
+            self._publish(QualificationChanged())
         return qualification
     
     def delete_user_qualification(self, qualification_id: int) -> bool:
@@ -577,6 +895,7 @@ class Repository:
         if qualification:
             self.session.delete(qualification)
             self.session.flush()
+            self._publish(QualificationChanged())
             return True
         return False
     
@@ -594,6 +913,7 @@ class Repository:
         experience = OtherExperience(**data)
         self.session.add(experience)
         self.session.flush()
+        self._publish(OtherExperienceChanged())
         return experience
     
     def update_other_experience(self, experience_id: int, data: Dict[str, Any]) -> Optional[OtherExperience]:
@@ -603,6 +923,7 @@ class Repository:
             for key, value in data.items():
                 setattr(experience, key, value)
             self.session.flush()
+            self._publish(OtherExperienceChanged())
         return experience
     
     def delete_other_experience(self, experience_id: int) -> bool:
@@ -611,6 +932,7 @@ class Repository:
         if experience:
             experience.is_active = 0
             self.session.flush()
+            self._publish(OtherExperienceChanged())
             return True
         return False
     
@@ -620,4 +942,5 @@ class Repository:
             experience = self.get_other_experience_by_id(item['id'])
             if experience:
                 experience.order_index = item['order']
-        self.session.flush()
\ No newline at end of file
+        self.session.flush()
+        self._publish(OtherExperienceChanged())
\ No newline at end of file
@@ -5,100 +5,92 @@
 スキルシート出力サービス
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 from collections import defaultdict
-from docx import Document
-from docx.shared import Pt, Inches, Cm
+from docx.shared import Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_ALIGN_VERTICAL
-from docx.oxml.shared import OxmlElement, qn
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 
-from services.repository import Repository
-from services.stats import StatsService
+from services.repository import Repository, PROJECT_TECH_RELATIONS
+from services.master_cache import master_cache
+from services.stats import create_stats_service
+from services.docx_stream import DocxStreamWriter
+from services.docx_template import (
+    open_base_document, STYLE_NAMES, STYLE_HEADER_CELL, STYLE_TABLE, STYLE_STRONG, STYLE_NOTE,
+    STYLE_SELF_PR, HEADER_CELL_FILL
+)
+from config import config
 from models import Project, TechUsage, SelfPR
 
 
+# 進捗の通知先 progress(完了数, 全体数, メッセージ)
+ProgressCallback = Callable[[int, int, str], None]
+
+
 class SkillSheetExportService:
     """スキルシートエクスポートサービス"""
     
+    # データを生成するセクション（キー, 表示名, 生成メソッド）
+    SECTIONS = [
+        ("projects", "開発経歴", "_generate_projects_data"),
+        ("technical_skills", "テクニカルスキル", "_generate_technical_skills_data"),
+        ("qualifications", "取得資格", "_generate_qualification_data"),
+        ("other_experiences", "その他経歴", "_generate_other_experience_data"),
+        ("self_pr", "自己PR", "_generate_self_pr_data")
+    ]
+    
     def __init__(self, session: Session):
         self.session = session
         self.repo = Repository(session)
-        self.stats_service = StatsService(session)
+        self.stats_service = create_stats_service(session)
     
-    def _set_table_borders(self, table):
-        """テーブルに罫線を設定（縦罫線は破線）"""
-        tbl = table._tbl
-        tbl_borders = OxmlElement('w:tblBorders')
-        
-        # 外枠は実線、縦罫線は破線に設定
-        border_settings = {
-            'top': 'single',
-            'left': 'single', 
-            'bottom': 'single',
-            'right': 'single',
-            'insideH': 'single',  # 横線は実線
-            'insideV': 'dashed'   # 縦線は破線
-        }
+    def _add_paragraph(self, doc, text: str = "", run_style=None, style=None, alignment=None):
+        """段落を追加（書式は名前付きスタイルで指定）"""
+        paragraph = doc.add_paragraph(style=style)
+        if alignment is not None:
+            paragraph.alignment = alignment
+        if text:
+            paragraph.add_run(text, run_style)
+        return paragraph
+    
+    def _add_table(self, doc, widths_cm: List[float], header_texts: List[str], fixed_layout: bool = False):
+        """表を追加して見出し行を設定（罫線は表スタイル、見出しの書式は段落スタイルで指定）"""
+        table = doc.add_table(rows=1, cols=len(widths_cm), style=STYLE_NAMES[STYLE_TABLE])
+        if fixed_layout:
+            table.autofit = False
         
-        for border_name, border_style in border_settings.items():
-            border = OxmlElement(f'w:{border_name}')
-            border.set(qn('w:val'), border_style)
-            border.set(qn('w:sz'), '4')  # 0.5pt
-            border.set(qn('w:space'), '0')
-            border.set(qn('w:color'), '000000')
-            tbl_borders.append(border)
-        
-        tbl_pr = tbl.find(qn('w:tblPr'))
-        if tbl_pr is None:
-            tbl_pr = OxmlElement('w:tblPr')
-            tbl.insert(0, tbl_pr)
-        tbl_pr.append(tbl_borders)
+        header_style = doc.styles[STYLE_NAMES[STYLE_HEADER_CELL]]
+        for cell, text, width_cm in zip(table.rows[0].cells, header_texts, widths_cm):
+            cell.width = Cm(width_cm)
+            cell.text = text
+            cell.paragraphs[0].style = header_style
+            # 背景色を薄いグレーに設定
+            cell._tc.get_or_add_tcPr().append(
+                parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), HEADER_CELL_FILL))
+            )
+        return table
     
-    def _set_cell_properties(self, cell, width_cm=None, vertical_align='top'):
-        """セルのプロパティを設定"""
-        # セル幅設定
-        if width_cm:
+    def _add_table_row(self, table, widths_cm: List[float], texts: List[str]):
+        """表にデータ行を追加"""
+        for cell, text, width_cm in zip(table.add_row().cells, texts, widths_cm):
             cell.width = Cm(width_cm)
-        
-        # 垂直方向の配置
-        cell.vertical_alignment = getattr(WD_ALIGN_VERTICAL, vertical_align.upper())
-        
-        # セル内のパラグラフの書式設定
-        for paragraph in cell.paragraphs:
-            paragraph.paragraph_format.space_before = Pt(0)
-            paragraph.paragraph_format.space_after = Pt(0)
-            paragraph.paragraph_format.line_spacing = 1.0
-            
-            # フォント設定
-            for run in paragraph.runs:
-                run.font.name = 'MS 明朝'
-                run.font.size = Pt(9)
+            cell.text = text
     
-    def _format_header_cell(self, cell, text):
-        """ヘッダーセルの書式設定"""
-        cell.text = text
-        # 背景色を薄いグレーに設定
-        shading_elm = parse_xml(r'<w:shd {} w:fill="F2F2F2"/>'.format(nsdecls('w')))
-        cell._tc.get_or_add_tcPr().append(shading_elm)
-        
-        # フォント設定
-        for paragraph in cell.paragraphs:
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            for run in paragraph.runs:
-                run.font.bold = True
-                run.font.name = 'MS 明朝'
-                run.font.size = Pt(9)
+    def _report_progress(self, progress: Optional[ProgressCallback], step: int, message: str):
+        """進捗を報告（全体はセクション数＋ファイル出力）"""
+        if progress:
+            progress(step, len(self.SECTIONS) + 1, message)
     
-    def generate_skill_sheet_data(self, name: str = "氏名") -> Dict[str, Any]:
+    def generate_skill_sheet_data(self, name: str = "氏名", progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
         """スキルシートデータを生成
         
         Args:
             name: 氏名
+            progress: 進捗の通知先 progress(完了数, 全体数, メッセージ)（セクションごとに呼び出す）
         
         Returns:
             スキルシートデータ
@@ -108,19 +100,29 @@ class SkillSheetExportService:
                 "title": "職務経歴書",
                 "date": datetime.now().strftime("%Y年%m月現在"),
                 "name": name
-            },
-            "projects": self._generate_projects_data(),
-            "technical_skills": self._generate_technical_skills_data(),
-            "qualifications": self._generate_qualification_data(),
-            "other_experiences": self._generate_other_experience_data(),
-            "self_pr": self._generate_self_pr_data()
+            }
         }
         
+        for step, (key, label, method) in enumerate(self.SECTIONS):
+            self._report_progress(progress, step, label)
+            data[key] = getattr(self, method)()
+        
         return data
     
+    def _load_projects(self) -> List[Project]:
+        """
+        全プロジェクトを役割・作業・技術の関連ごと selectinload でまとめて読み込む
+        プロジェクト数によらずクエリ数は一定（名前は MasterCache から解決する）
+        """
+        return self.session.query(Project).options(
+            selectinload(Project.project_roles),
+            selectinload(Project.project_tasks),
+            *[selectinload(getattr(Project, attr)) for attr, _ in PROJECT_TECH_RELATIONS.values()]
+        ).all()
+    
     def _generate_projects_data(self) -> List[Dict[str, Any]]:
         """プロジェクトデータを生成（契約会社で合算）"""
-        projects = self.repo.get_all_projects()
+        projects = self._load_projects()
         
         # 契約会社ごとにグループ化
         company_groups = defaultdict(list)
@@ -134,32 +136,23 @@ class SkillSheetExportService:
             # 契約会社内でプロジェクトを開始日順にソート
             company_projects.sort(key=lambda p: p.project_start or "9999-99-99")
             
-            # 参画期間を計算（同じ契約会社の最初と最後）
-            first_start = None
-            last_end = None
-            
-            for project in company_projects:
-                if project.project_start:
-                    if not first_start or project.project_start < first_start:
-                        first_start = project.project_start
-                
-                if project.project_end:
-                    if not last_end or project.project_end > last_end:
-                        last_end = project.project_end
-                elif not last_end:
-                    last_end = None  # 現在進行中
+            # 参画期間を計算（同じ契約会社の最初の開始月と最後の終了月、終了月なしは現在進行中）
+            start_months = [p.start_month for p in company_projects if p.start_month is not None]
+            end_months = [p.end_month for p in company_projects if p.end_month is not None]
+            first_start = min(start_months) if start_months else None
+            last_end = max(end_months) if end_months else None
             
             # 各プロジェクトをエクスポート
             for project in company_projects:
                 project_data = {
                     "participation_period": self._format_period_with_duration(first_start, last_end),
-                    "project_period": self._format_period(project.project_start, project.project_end),
+                    "project_period": self._format_period(project.start_month, project.end_month),
                     "project_name": project.name,
                     "business_content": project.work_summary,
                     "project_detail": project.detail,
-                    "environment": self._get_project_environment(project.id),
-                    "role": self._get_project_roles_sorted(project.id),
-                    "task": self._get_project_tasks_sorted(project.id),
+                    "environment": self._get_project_environment(project),
+                    "role": self._get_project_roles_sorted(project),
+                    "task": self._get_project_tasks_sorted(project),
                     "team_size": project.scale_text or "",
                     "contract_company": company,
                     "end_user": project.end_user or "",
@@ -172,8 +165,8 @@ class SkillSheetExportService:
         
         return result
     
-    def _get_project_environment(self, project_id: int) -> Dict[str, List[str]]:
-        """プロジェクトの開発環境を取得"""
+    def _get_project_environment(self, project: Project) -> Dict[str, List[str]]:
+        """プロジェクトの開発環境を取得（読み込み済みの関連から）"""
         environment = {
             "os": [],
             "language": [],
@@ -184,50 +177,35 @@ class SkillSheetExportService:
         }
         
         # 各技術カテゴリの情報を取得
-        for kind in ["os", "language", "framework", "tool", "cloud", "db"]:
-            tech_ids = self.repo.get_project_techs(project_id, kind)
-            techs = self.repo.get_master_by_kind(kind)
-            
-            for tech in techs:
-                if tech.id in tech_ids:
-                    if kind == "framework":
-                        environment["framework"].append(tech.name)
-                    else:
-                        environment[kind].append(tech.name)
+        for kind, (attr, id_field) in PROJECT_TECH_RELATIONS.items():
+            tech_ids = [getattr(row, id_field) for row in getattr(project, attr)]
+            environment[kind].extend(master_cache.get_names(self.session, kind, tech_ids))
         
         return environment
     
-    def _get_project_roles_sorted(self, project_id: int) -> str:
+    def _get_project_roles_sorted(self, project: Project) -> str:
         """プロジェクトの役割を順序で取得"""
-        from models import ProjectRole, Role
-
-        # プロジェクトに関連する役割を順序で取得
-        roles = self.session.query(Role).join(ProjectRole).filter(
-            ProjectRole.project_id == project_id
-        ).order_by(Role.order_index, Role.name).all()
+        names = master_cache.get_names(
+            self.session, 'role', [pr.role_id for pr in project.project_roles]
+        )
 
         # 単一プロジェクトの場合は従来通り
-        project = self.repo.get_project_by_id(project_id)
-        if project and project.role and not roles:
-            return project.role.name
+        if not names and project.role_id:
+            return master_cache.get_name(self.session, 'role', project.role_id)
 
-        return "\n".join([role.name for role in roles]) if roles else ""
+        return "\n".join(names)
 
-    def _get_project_tasks_sorted(self, project_id: int) -> str:
+    def _get_project_tasks_sorted(self, project: Project) -> str:
         """プロジェクトの作業を順序で取得"""
-        from models import ProjectTask, Task
-
-        # プロジェクトに関連する作業を順序で取得
-        tasks = self.session.query(Task).join(ProjectTask).filter(
-            ProjectTask.project_id == project_id
-        ).order_by(Task.order_index, Task.name).all()
+        names = master_cache.get_names(
+            self.session, 'task', [pt.task_id for pt in project.project_tasks]
+        )
 
         # 単一プロジェクトの場合は従来通り
-        project = self.repo.get_project_by_id(project_id)
-        if project and project.task and not tasks:
-            return project.task.name
+        if not names and project.task_id:
+            return master_cache.get_name(self.session, 'task', project.task_id)
 
-        return "\n".join([task.name for task in tasks]) if tasks else ""
+        return "\n".join(names)
     
     def _generate_technical_skills_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """技術スキルデータを生成"""
@@ -242,8 +220,11 @@ class SkillSheetExportService:
             ('cloud', 'クラウド')
         ]
         
+        # 全カテゴリを一括計算
+        all_stats = self.stats_service.compute_all_stats()['categories']
+        
         for kind, label in categories:
-            stats = self.stats_service.get_all_tech_stats(kind)
+            stats = all_stats[kind]
             
             skills_data[label] = [
                 {
@@ -275,7 +256,7 @@ class SkillSheetExportService:
         
         return [
             {
-                "name": qual.qualification.name,
+                "name": master_cache.get_name(self.session, 'qualification', qual.qualification_id),
                 "date": qual.obtained_date.strftime("%Y年%m月") if qual.obtained_date else "",
                 "note": qual.note or ""
             }
@@ -324,370 +305,310 @@ class SkillSheetExportService:
         except:
             return ""
     
-    def _format_period(self, start_date: Optional[str], end_date: Optional[str]) -> str:
-        """期間をフォーマット"""
-        if not start_date:
+    def _format_month(self, month: int) -> str:
+        """月序数を「YYYY年M月」にフォーマット"""
+        return f"{month // 12}年{month % 12 + 1}月"
+    
+    def _format_period(self, start_month: Optional[int], end_month: Optional[int]) -> str:
+        """期間（月序数）をフォーマット"""
+        if start_month is None:
             return ""
         
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            start_str = f"{start.year}年{start.month}月"
-            
-            if end_date:
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                end_str = f"{end.year}年{end.month}月"
-                return f"{start_str}\n｜\n{end_str}"
-            else:
-                return f"{start_str}\n｜\n現在"
-        except:
-            return ""
+        start_str = self._format_month(start_month)
+        if end_month is not None:
+            return f"{start_str}\n｜\n{self._format_month(end_month)}"
+        else:
+            return f"{start_str}\n｜\n現在"
     
-    def _format_period_with_duration(self, start_date: Optional[str], end_date: Optional[str]) -> str:
+    def _format_period_with_duration(self, start_month: Optional[int], end_month: Optional[int]) -> str:
         """期間と期間長をフォーマット"""
-        period = self._format_period(start_date, end_date)
+        period = self._format_period(start_month, end_month)
         
         if not period:
             return ""
         
-        duration = self._calculate_duration(start_date, end_date)
+        duration = self._calculate_duration(start_month, end_month)
         
         if duration:
             return f"{period}\n（{duration}）"
         
         return period
     
-    def _calculate_duration(self, start_date: Optional[str], end_date: Optional[str]) -> str:
-        """期間の長さを計算"""
-        if not start_date:
+    def _calculate_duration(self, start_month: Optional[int], end_month: Optional[int]) -> str:
+        """期間（月序数）の長さを計算"""
+        if start_month is None:
             return ""
         
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            
-            if end_date:
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-            else:
-                end = datetime.now()
-            
-            # 月数を計算
-            months = (end.year - start.year) * 12 + (end.month - start.month) + 1
-            
-            years = months // 12
-            remaining_months = months % 12
-            
-            if years > 0 and remaining_months > 0:
-                return f"{years}年{remaining_months}ヶ月"
-            elif years > 0:
-                return f"{years}年"
-            else:
-                return f"{remaining_months}ヶ月"
-        except:
-            return ""
+        if end_month is None:
+            now = datetime.now()
+            end_month = now.year * 12 + now.month - 1
+        
+        # 月数を計算
+        months = end_month - start_month + 1
+        
+        years = months // 12
+        remaining_months = months % 12
+        
+        if years > 0 and remaining_months > 0:
+            return f"{years}年{remaining_months}ヶ月"
+        elif years > 0:
+            return f"{years}年"
+        else:
+            return f"{remaining_months}ヶ月"
     
     def _get_career_period(self) -> str:
         """開発経歴期間を取得"""
-        projects = self.repo.get_all_projects()
-        if not projects:
+        earliest_start = self.session.query(func.min(Project.start_month)).scalar()
+        if earliest_start is None:
             return "期間未設定"
         
-        # 最も古い開始日と最新の終了日を取得
-        start_dates = [p.project_start for p in projects if p.project_start]
-        
-        if not start_dates:
-            return "期間未設定"
-        
-        earliest_start = min(start_dates)
+        return f"{earliest_start // 12}年{earliest_start % 12 + 1:02d}月～現在"
+    
+    def _project_row_texts(self, project: Dict[str, Any]) -> List[str]:
+        """プロジェクト表の1行分のセル文字列（現場参画期間・プロジェクト期間・名称/業務内容・開発環境・役割/担当/規模）"""
+        # プロジェクト詳細（サンプルの形式に合わせる）
+        project_text = f"【プロジェクト】\n{project['project_name']}\n\n"
+        if project["business_content"]:
+            project_text += f"【業務内容】\n{project['business_content']}\n\n"
+        if project["project_detail"]:
+            project_text += f"【プロジェクト詳細】\n{project['project_detail']}"
+        
+        # 開発環境（改行で区切る）
+        env_parts = []
+        if project["environment"]["os"]:
+            env_parts.append(f"【OS】\n{chr(10).join(project['environment']['os'])}")
+        if project["environment"]["language"]:
+            env_parts.append(f"【言語】\n{chr(10).join(project['environment']['language'])}")
+        if project["environment"]["db"]:
+            env_parts.append(f"【DB】\n{chr(10).join(project['environment']['db'])}")
+        if project["environment"]["framework"]:
+            env_parts.append(f"【FW/ライブラリ】\n{chr(10).join(project['environment']['framework'])}")
+        if project["environment"]["tool"]:
+            # ツールは多いので主要なもののみ
+            main_tools = project['environment']['tool'][:8]
+            env_parts.append(f"【ツール】\n{chr(10).join(main_tools)}")
+        if project["environment"]["cloud"]:
+            env_parts.append(f"【クラウド】\n{chr(10).join(project['environment']['cloud'])}")
+        
+        # 役割/担当/規模（サンプルの形式に合わせる）
+        role_parts = []
+        if project["role"]:
+            role_parts.append(f"【役割】\n{project['role']}")
+        if project["task"]:
+            role_parts.append(f"【担当】\n{project['task']}")
+        if project["team_size"]:
+            role_parts.append(f"【プロジェクト規模】\n{project['team_size']}")
+        
+        # 期間セル（縦書き風に改行を入れる）
+        return [
+            project["participation_period"],
+            project["project_period"],
+            project_text,
+            '\n\n'.join(env_parts),
+            '\n\n'.join(role_parts)
+        ]
+    
+    def _technical_skill_rows(self, technical_skills: Dict[str, List[Dict[str, Any]]]) -> List[tuple]:
+        """テクニカルスキル表の (カテゴリ, 技術) の行一覧"""
+        rows = []
+        
+        # カテゴリ順序をサンプルに合わせる
+        category_order = ["OS", "言語", "DB", "FW/ライブラリ", "ツール", "クラウド"]
+        
+        for category in category_order:
+            if category in technical_skills and technical_skills[category]:
+                # 技術名、期間、習熟度を結合した形式で出力
+                tech_lines = []
+                for s in technical_skills[category]:
+                    parts = [s["name"], s["experience"]]
+                    if s.get("proficiency"):
+                        parts.append(s["proficiency"])
+                    tech_lines.append("　".join(parts))
+                
+                rows.append((category, "\n".join(tech_lines)))
         
-        try:
-            start_date = datetime.strptime(earliest_start, "%Y-%m-%d")
-            return f"{start_date.year}年{start_date.month:02d}月～現在"
-        except:
-            return "期間未設定"
+        return rows
     
-    def export_to_docx(self, filepath: str, name: str = "氏名"):
+    def export_to_docx(
+        self,
+        filepath: str,
+        name: str = "氏名",
+        writer: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None
+    ):
         """DOCXファイルとしてエクスポート
         
         Args:
             filepath: 出力ファイルパス
             name: 氏名
+            writer: 出力方式（python-docx / stream、省略時は設定の [export] docx_writer）
+            progress: 進捗の通知先（generate_skill_sheet_data() を参照）
         """
-        data = self.generate_skill_sheet_data(name)
-        doc = Document()
-        
-        # ページ設定とマージン（狭めに調整）
-        sections = doc.sections
-        for section in sections:
-            section.top_margin = Cm(2.0)    # 2.54から2.0に
-            section.bottom_margin = Cm(2.0) # 2.54から2.0に
-            section.left_margin = Cm(2.0)   # 2.54から2.0に
-            section.right_margin = Cm(2.0)  # 2.54から2.0に
-            section.page_height = Cm(29.7)  # A4
-            section.page_width = Cm(21.0)
-        
-        # ドキュメント全体のフォント設定
-        style = doc.styles['Normal']
-        font = style.font
-        font.name = 'MS 明朝'
-        font.size = Pt(9)
+        if writer is None:
+            writer = config.get_docx_writer()
+        
+        data = self.generate_skill_sheet_data(name, progress)
+        self._report_progress(progress, len(self.SECTIONS), "ファイル出力")
+        if writer == 'stream':
+            self._export_to_docx_stream(filepath, data)
+            return
+        
+        # 用紙・余白・本文フォントとスキルシート用スタイルはベーステンプレートで設定済み
+        doc = open_base_document()
+        strong = doc.styles[STYLE_NAMES[STYLE_STRONG]]
         
         # ヘッダー（段落として作成、下線なし）
-        title = doc.add_paragraph()
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_run = title.add_run(data["header"]["title"])
-        title_run.font.name = 'MS 明朝'
-        title_run.font.size = Pt(9)
-        title_run.font.bold = True
+        self._add_paragraph(doc, data["header"]["title"], strong, alignment=WD_ALIGN_PARAGRAPH.CENTER)
         
         # 日付と氏名を右寄せ
-        date_para = doc.add_paragraph()
-        date_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        date_run = date_para.add_run(data["header"]["date"])
-        date_run.font.name = 'MS 明朝'
-        date_run.font.size = Pt(9)
-        
-        name_para = doc.add_paragraph()
-        name_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        name_run = name_para.add_run(f"氏名：{data['header']['name']}")
-        name_run.font.name = 'MS 明朝'
-        name_run.font.size = Pt(9)
+        self._add_paragraph(doc, data["header"]["date"], alignment=WD_ALIGN_PARAGRAPH.RIGHT)
+        self._add_paragraph(doc, f"氏名：{data['header']['name']}", alignment=WD_ALIGN_PARAGRAPH.RIGHT)
         
         # 開発経歴セクション
-        history_para = doc.add_paragraph()
-        history_run = history_para.add_run(f"開発経歴（{self._get_career_period()}）")
-        history_run.font.name = 'MS 明朝'
-        history_run.font.size = Pt(9)
-        history_run.font.bold = True
+        self._add_paragraph(doc, f"開発経歴（{self._get_career_period()}）", strong)
         
-        # プロジェクトテーブル
+        # プロジェクトテーブル（列幅はサンプルに合わせて調整）
         if data["projects"]:
-            table = doc.add_table(rows=1, cols=5)
-            self._set_table_borders(table)
-            
-            # テーブル幅の設定
-            table.autofit = False
-            table.allow_autofit = False
-            
-            # ヘッダー行の設定
-            header_cells = table.rows[0].cells
-            self._format_header_cell(header_cells[0], "現場参画\n期間")
-            self._format_header_cell(header_cells[1], "プロジェクト\n期間")
-            self._format_header_cell(header_cells[2], "プロジェクト名および業務内容")
-            self._format_header_cell(header_cells[3], "開発環境")
-            self._format_header_cell(header_cells[4], "役割／担当／規模")
-            
-            # 列幅の設定（サンプルに合わせて調整）
-            self._set_cell_properties(header_cells[0], width_cm=2.5)  # 現場参画期間
-            self._set_cell_properties(header_cells[1], width_cm=2.5)  # プロジェクト期間
-            self._set_cell_properties(header_cells[2], width_cm=8.0)  # プロジェクト名・業務内容
-            self._set_cell_properties(header_cells[3], width_cm=3.5)  # 開発環境
-            self._set_cell_properties(header_cells[4], width_cm=3.5)  # 役割・担当・規模
-            
-            # プロジェクトデータ
+            widths = [2.5, 2.5, 8.0, 3.5, 3.5]
+            table = self._add_table(
+                doc, widths,
+                ["現場参画\n期間", "プロジェクト\n期間", "プロジェクト名および業務内容", "開発環境", "役割／担当／規模"],
+                fixed_layout=True
+            )
             for project in data["projects"]:
-                row_cells = table.add_row().cells
-                
-                # 各セルの書式設定
-                for i, cell in enumerate(row_cells):
-                    widths = [2.5, 2.5, 8.0, 3.5, 3.5]
-                    self._set_cell_properties(cell, width_cm=widths[i], vertical_align='top')
-                
-                # 期間セル（縦書き風に改行を入れる）
-                row_cells[0].text = project["participation_period"]
-                row_cells[1].text = project["project_period"]
-                
-                # プロジェクト詳細（サンプルの形式に合わせる）
-                project_text = f"【プロジェクト】\n{project['project_name']}\n\n"
-                if project["business_content"]:
-                    project_text += f"【業務内容】\n{project['business_content']}\n\n"
-                if project["project_detail"]:
-                    project_text += f"【プロジェクト詳細】\n{project['project_detail']}"
-                row_cells[2].text = project_text
-                
-                # 開発環境（改行で区切る）
-                env_parts = []
-                if project["environment"]["os"]:
-                    env_parts.append(f"【OS】\n{chr(10).join(project['environment']['os'])}")
-                if project["environment"]["language"]:
-                    env_parts.append(f"【言語】\n{chr(10).join(project['environment']['language'])}")
-                if project["environment"]["db"]:
-                    env_parts.append(f"【DB】\n{chr(10).join(project['environment']['db'])}")
-                if project["environment"]["framework"]:
-                    env_parts.append(f"【FW/ライブラリ】\n{chr(10).join(project['environment']['framework'])}")
-                if project["environment"]["tool"]:
-                    # ツールは多いので主要なもののみ
-                    main_tools = project['environment']['tool'][:8]
-                    env_parts.append(f"【ツール】\n{chr(10).join(main_tools)}")
-                if project["environment"]["cloud"]:
-                    env_parts.append(f"【クラウド】\n{chr(10).join(project['environment']['cloud'])}")
-                
-                row_cells[3].text = '\n\n'.join(env_parts)
-                
-                # 役割/担当/規模（サンプルの形式に合わせる）
-                role_parts = []
-                if project["role"]:
-                    role_parts.append(f"【役割】\n{project['role']}")
-                if project["task"]:
-                    role_parts.append(f"【担当】\n{project['task']}")
-                if project["team_size"]:
-                    role_parts.append(f"【プロジェクト規模】\n{project['team_size']}")
-                
-                row_cells[4].text = '\n\n'.join(role_parts)
+                self._add_table_row(table, widths, self._project_row_texts(project))
         
         # テクニカルスキル
         doc.add_page_break()
-        skill_heading = doc.add_paragraph()
-        skill_run = skill_heading.add_run("■　テクニカルスキル")
-        skill_run.font.name = 'MS 明朝'
-        skill_run.font.size = Pt(9)
-        skill_run.font.bold = True
+        self._add_paragraph(doc, "■　テクニカルスキル", strong)
         
         if data["technical_skills"]:
-            skill_table = doc.add_table(rows=1, cols=2)
-            self._set_table_borders(skill_table)
-
-            # ヘッダー行の設定
-            header_cells = skill_table.rows[0].cells
-            self._format_header_cell(header_cells[0], "カテゴリ")
-            self._format_header_cell(header_cells[1], "技術")
-
-            # 列幅設定
-            self._set_cell_properties(header_cells[0], width_cm=3.0)  # カテゴリ
-            self._set_cell_properties(header_cells[1], width_cm=17.0)  # 技術（技術名　期間　習熟度の形式）
-
-            # カテゴリ順序をサンプルに合わせる
-            category_order = ["OS", "言語", "DB", "FW/ライブラリ", "ツール", "クラウド"]
-
-            for category in category_order:
-                if category in data["technical_skills"] and data["technical_skills"][category]:
-                    skills = data["technical_skills"][category]
-
-                    # 技術名、期間、習熟度を結合した形式で出力
-                    tech_lines = []
-                    for s in skills:
-                        parts = [s["name"], s["experience"]]
-                        if s.get("proficiency"):
-                            parts.append(s["proficiency"])
-                        tech_lines.append("　".join(parts))
-
-                    row_cells = skill_table.add_row().cells
-
-                    # 各セルの書式設定
-                    self._set_cell_properties(row_cells[0], width_cm=3.0, vertical_align='top')
-                    self._set_cell_properties(row_cells[1], width_cm=17.0, vertical_align='top')
-
-                    row_cells[0].text = category
-                    row_cells[1].text = "\n".join(tech_lines)
+            # 技術は「技術名　期間　習熟度」の形式
+            widths = [3.0, 17.0]
+            skill_table = self._add_table(doc, widths, ["カテゴリ", "技術"])
+            for category, tech_text in self._technical_skill_rows(data["technical_skills"]):
+                self._add_table_row(skill_table, widths, [category, tech_text])
         
         # 取得資格
         if data["qualifications"]:
-            qualification_heading = doc.add_paragraph()
-            qualification_run = qualification_heading.add_run("■　取得資格")
-            qualification_run.font.name = 'MS 明朝'
-            qualification_run.font.size = Pt(9)
-            qualification_run.font.bold = True
-            
-            qual_table = doc.add_table(rows=1, cols=3)
-            self._set_table_borders(qual_table)
+            self._add_paragraph(doc, "■　取得資格", strong)
             
-            # ヘッダー行
-            qual_header_cells = qual_table.rows[0].cells
-            self._format_header_cell(qual_header_cells[0], "資格名")
-            self._format_header_cell(qual_header_cells[1], "取得年月")
-            self._format_header_cell(qual_header_cells[2], "備考")
-            
-            # 列幅設定
-            self._set_cell_properties(qual_header_cells[0], width_cm=8.0)
-            self._set_cell_properties(qual_header_cells[1], width_cm=3.0)
-            self._set_cell_properties(qual_header_cells[2], width_cm=9.0)
-            
-            # 資格データ
+            widths = [8.0, 3.0, 9.0]
+            qual_table = self._add_table(doc, widths, ["資格名", "取得年月", "備考"])
             for qual in data["qualifications"]:
-                row_cells = qual_table.add_row().cells
-                
-                for i, cell in enumerate(row_cells):
-                    widths = [8.0, 3.0, 9.0]
-                    self._set_cell_properties(cell, width_cm=widths[i], vertical_align='top')
-                
-                row_cells[0].text = qual["name"]
-                row_cells[1].text = qual["date"]
-                row_cells[2].text = qual["note"]
+                self._add_table_row(qual_table, widths, [qual["name"], qual["date"], qual["note"]])
         
         # その他経歴
         if data["other_experiences"]:
-            other_heading = doc.add_paragraph()
-            other_run = other_heading.add_run("■　その他経歴（学習）")
-            other_run.font.name = 'MS 明朝'
-            other_run.font.size = Pt(9)
-            other_run.font.bold = True
+            self._add_paragraph(doc, "■　その他経歴（学習）", strong)
+            note = doc.styles[STYLE_NAMES[STYLE_NOTE]]
             
             for exp in data["other_experiences"]:
                 # タイトルと期間
-                title_para = doc.add_paragraph()
                 title_text = exp["title"]
                 if exp["period"]:
                     title_text += f"　（{exp['period']}）"
-                title_run = title_para.add_run(f"◆{title_text}")
-                title_run.font.name = 'MS 明朝'
-                title_run.font.size = Pt(9)
-                title_run.font.bold = True
+                self._add_paragraph(doc, f"◆{title_text}", strong)
                 
                 # 内容
-                content_para = doc.add_paragraph()
-                content_run = content_para.add_run(exp["content"])
-                content_run.font.name = 'MS 明朝'
-                content_run.font.size = Pt(9)
+                self._add_paragraph(doc, exp["content"])
                 
                 # 備考があれば追加
                 if exp["note"]:
-                    note_para = doc.add_paragraph()
-                    note_run = note_para.add_run(f"※{exp['note']}")
-                    note_run.font.name = 'MS 明朝'
-                    note_run.font.size = Pt(9)
-                    note_run.font.italic = True
+                    self._add_paragraph(doc, f"※{exp['note']}", note)
                 
                 doc.add_paragraph()  # 項目間のスペース
         
         # 自己PR
         if data["self_pr"]:
             doc.add_page_break()
-            pr_heading = doc.add_paragraph()
-            pr_run = pr_heading.add_run("■　自己PR")
-            pr_run.font.name = 'MS 明朝'
-            pr_run.font.size = Pt(9)
-            pr_run.font.bold = True
+            self._add_paragraph(doc, "■　自己PR", strong)
+            self_pr = doc.styles[STYLE_NAMES[STYLE_SELF_PR]]
             
             for i, pr in enumerate(data["self_pr"]):
                 if i > 0:
                     doc.add_paragraph()  # PR項目間にスペース
                 
-                # サブタイトル
-                subtitle_para = doc.add_paragraph()
-                subtitle_run = subtitle_para.add_run(f"◆{pr['title']}")
-                subtitle_run.font.name = 'MS 明朝'
-                subtitle_run.font.size = Pt(9)
-                subtitle_run.font.bold = True
-                
-                # 内容
-                content_para = doc.add_paragraph()
-                content_run = content_para.add_run(pr['content'])
-                content_run.font.name = 'MS 明朝'
-                content_run.font.size = Pt(9)
-                
-                # 行間設定
-                content_para.paragraph_format.line_spacing = 1.2
-                content_para.paragraph_format.space_after = Pt(6)
+                # サブタイトルと内容（行間は段落スタイルで設定）
+                self._add_paragraph(doc, f"◆{pr['title']}", strong)
+                self._add_paragraph(doc, pr['content'], style=self_pr)
         
         # 保存
         doc.save(filepath)
     
-    def export_to_markdown(self, filepath: str, name: str = "氏名"):
+    def _export_to_docx_stream(self, filepath: str, data: Dict[str, Any]):
+        """DOCXをストリーミングで出力（export_to_docx() と同じレイアウト・スタイル）"""
+        with DocxStreamWriter(filepath) as writer:
+            # ヘッダー
+            writer.paragraph(data["header"]["title"], run_style=STYLE_STRONG, align='center')
+            writer.paragraph(data["header"]["date"], align='right')
+            writer.paragraph(f"氏名：{data['header']['name']}", align='right')
+            
+            # 開発経歴セクション
+            writer.paragraph(f"開発経歴（{self._get_career_period()}）", run_style=STYLE_STRONG)
+            
+            if data["projects"]:
+                writer.begin_table([2.5, 2.5, 8.0, 3.5, 3.5], fixed_layout=True)
+                writer.header_row(["現場参画\n期間", "プロジェクト\n期間", "プロジェクト名および業務内容", "開発環境", "役割／担当／規模"])
+                for project in data["projects"]:
+                    writer.row(self._project_row_texts(project))
+                writer.end_table()
+            
+            # テクニカルスキル
+            writer.page_break()
+            writer.paragraph("■　テクニカルスキル", run_style=STYLE_STRONG)
+            
+            if data["technical_skills"]:
+                writer.begin_table([3.0, 17.0])
+                writer.header_row(["カテゴリ", "技術"])
+                for category, tech_text in self._technical_skill_rows(data["technical_skills"]):
+                    writer.row([category, tech_text])
+                writer.end_table()
+            
+            # 取得資格
+            if data["qualifications"]:
+                writer.paragraph("■　取得資格", run_style=STYLE_STRONG)
+                writer.begin_table([8.0, 3.0, 9.0])
+                writer.header_row(["資格名", "取得年月", "備考"])
+                for qual in data["qualifications"]:
+                    writer.row([qual["name"], qual["date"], qual["note"]])
+                writer.end_table()
+            
+            # その他経歴
+            if data["other_experiences"]:
+                writer.paragraph("■　その他経歴（学習）", run_style=STYLE_STRONG)
+                
+                for exp in data["other_experiences"]:
+                    title_text = exp["title"]
+                    if exp["period"]:
+                        title_text += f"　（{exp['period']}）"
+                    writer.paragraph(f"◆{title_text}", run_style=STYLE_STRONG)
+                    writer.paragraph(exp["content"])
+                    if exp["note"]:
+                        writer.paragraph(f"※{exp['note']}", run_style=STYLE_NOTE)
+                    writer.empty_paragraph()  # 項目間のスペース
+            
+            # 自己PR
+            if data["self_pr"]:
+                writer.page_break()
+                writer.paragraph("■　自己PR", run_style=STYLE_STRONG)
+                
+                for i, pr in enumerate(data["self_pr"]):
+                    if i > 0:
+                        writer.empty_paragraph()  # PR項目間にスペース
+                    writer.paragraph(f"◆{pr['title']}", run_style=STYLE_STRONG)
+                    writer.paragraph(pr['content'], style=STYLE_SELF_PR)
+    
+    def export_to_markdown(self, filepath: str, name: str = "氏名", progress: Optional[ProgressCallback] = None):
         """Markdownファイルとしてエクスポート
         
         Args:
             filepath: 出力ファイルパス
             name: 氏名
+            progress: 進捗の通知先（generate_skill_sheet_data() を参照）
         """
-        data = self.generate_skill_sheet_data(name)
+        data = self.generate_skill_sheet_data(name, progress)
+        self._report_progress(progress, len(self.SECTIONS), "ファイル出力")
         
         content = []
         content.append(f"# {data['header']['title']}")
@@ -3,6 +3,9 @@ from datetime import date, datetime
 from sqlalchemy.orm import Session
 from models import Project, TechUsage, Engagement
 from services.repository import Repository
+from services.master_cache import master_cache
+
+TECH_KINDS = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
 
 class StatsService:
     def __init__(self, session: Session):
@@ -45,6 +48,224 @@ class StatsService:
             result.update(range_list)
         return result
     
+    def month_ordinal(self, date_str: str) -> int:
+        """
+        日付文字列を月序数（year*12+month-1）に変換
+        """
+        year, month = int(date_str[0:4]), int(date_str[5:7])
+        return year * 12 + month - 1
+    
+    def current_month_ordinal(self) -> int:
+        """
+        当月の月序数を取得
+        """
+        today = date.today()
+        return today.year * 12 + today.month - 1
+    
+    def month_interval(self, start_str: Optional[str], end_str: Optional[str]) -> Optional[Tuple[int, int]]:
+        """
+        期間を月序数の区間 [start, end] に変換（両端含む）
+        month_range_inclusive() と同じ月を表すが、月ごとのリストは生成しない
+        """
+        if not start_str:
+            return None
+        
+        start = self.month_ordinal(start_str)
+        if end_str:
+            end = self.month_ordinal(end_str)
+        else:
+            end = self.current_month_ordinal()
+        
+        if end < start:
+            return None
+        return (start, end)
+    
+    def month_ordinal_interval(
+        self,
+        start_month: Optional[int],
+        end_month: Optional[int]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        月序数列（start_month / end_month など）の期間を区間 [start, end] に変換
+        month_interval() と同じ区間を、日付文字列を解析せずに求める
+        """
+        if start_month is None:
+            return None
+        
+        if end_month is None:
+            end_month = self.current_month_ordinal()
+        
+        if end_month < start_month:
+            return None
+        return (start_month, end_month)
+    
+    def merged_months_count(self, intervals: List[Tuple[int, int]]) -> int:
+        """
+        月序数区間をソート・マージして重複なしの月数を合計
+        union_months() の結果件数と同じ値をO(n log n)で求める
+        """
+        if not intervals:
+            return 0
+        
+        intervals = sorted(intervals)
+        total = 0
+        cur_start, cur_end = intervals[0]
+        
+        for start, end in intervals[1:]:
+            if start <= cur_end + 1:
+                if end > cur_end:
+                    cur_end = end
+            else:
+                total += cur_end - cur_start + 1
+                cur_start, cur_end = start, end
+        
+        total += cur_end - cur_start + 1
+        return total
+    
+    def effective_usage_period(
+        self,
+        usage_start: Optional[str],
+        usage_end: Optional[str],
+        project_start: Optional[str],
+        project_end: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        集計に使う技術使用期間を決定
+        使用期間が未設定の場合はプロジェクト期間を使用する
+        """
+        if usage_start and usage_end:
+            return usage_start, usage_end
+        elif usage_start:
+            return usage_start, None
+        else:
+            return project_start, project_end
+    
+    def clipped_interval(
+        self,
+        use_start: Optional[str],
+        use_end: Optional[str],
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        期間を集計期間で切り詰めた月序数区間を取得
+        """
+        if not use_start:
+            return None
+        
+        if start_filter:
+            if use_end and use_end < start_filter:
+                return None
+            if use_start < start_filter:
+                use_start = start_filter
+        
+        if end_filter:
+            if use_start > end_filter:
+                return None
+            if not use_end or use_end > end_filter:
+                use_end = end_filter
+        
+        return self.month_interval(use_start, use_end)
+    
+    def usage_interval(
+        self,
+        usage_start: Optional[str],
+        usage_end: Optional[str],
+        project_start: Optional[str],
+        project_end: Optional[str],
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        技術使用期間を集計期間で切り詰めた月序数区間を取得
+        使用期間が未設定の場合はプロジェクト期間を使用する
+        """
+        use_start, use_end = self.effective_usage_period(
+            usage_start, usage_end, project_start, project_end
+        )
+        return self.clipped_interval(use_start, use_end, start_filter, end_filter)
+    
+    def usage_month_interval(
+        self,
+        usage_start_month: Optional[int],
+        usage_end_month: Optional[int],
+        project_start_month: Optional[int],
+        project_end_month: Optional[int]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        月序数列から技術使用期間の区間を取得（集計期間なしの usage_interval() と同じ結果）
+        使用期間が未設定の場合はプロジェクト期間を使用する
+        """
+        if usage_start_month is not None:
+            return self.month_ordinal_interval(usage_start_month, usage_end_month)
+        return self.month_ordinal_interval(project_start_month, project_end_month)
+    
+    def get_usage_intervals_by_tech(
+        self,
+        kind: str,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        指定カテゴリの全使用期間をプロジェクトと結合して1クエリで取得し、
+        tech_idごとの月序数区間にまとめる
+        """
+        if not start_filter and not end_filter:
+            return self._get_usage_month_intervals(kind)
+        
+        rows = self.session.query(
+            TechUsage.tech_id,
+            TechUsage.start,
+            TechUsage.end,
+            Project.project_start,
+            Project.project_end
+        ).join(
+            Project, Project.id == TechUsage.project_id
+        ).filter(
+            TechUsage.kind == kind
+        ).all()
+        
+        intervals_by_tech: Dict[int, List[Tuple[int, int]]] = {}
+        for tech_id, usage_start, usage_end, project_start, project_end in rows:
+            interval = self.usage_interval(
+                usage_start, usage_end, project_start, project_end,
+                start_filter, end_filter
+            )
+            if interval:
+                intervals_by_tech.setdefault(tech_id, []).append(interval)
+        
+        return intervals_by_tech
+    
+    def _get_usage_month_intervals(
+        self,
+        kind: str,
+        tech_id: Optional[int] = None
+    ) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        集計期間なしの使用期間を月序数列から取得し、tech_idごとの区間にまとめる
+        """
+        query = self.session.query(
+            TechUsage.tech_id,
+            TechUsage.start_month,
+            TechUsage.end_month,
+            Project.start_month,
+            Project.end_month
+        ).join(
+            Project, Project.id == TechUsage.project_id
+        ).filter(
+            TechUsage.kind == kind
+        )
+        if tech_id is not None:
+            query = query.filter(TechUsage.tech_id == tech_id)
+        
+        intervals_by_tech: Dict[int, List[Tuple[int, int]]] = {}
+        for row_tech_id, usage_start, usage_end, project_start, project_end in query.all():
+            interval = self.usage_month_interval(usage_start, usage_end, project_start, project_end)
+            if interval:
+                intervals_by_tech.setdefault(row_tech_id, []).append(interval)
+        
+        return intervals_by_tech
+    
     def tech_experience_unique_months(
         self, 
         kind: str, 
@@ -57,53 +278,14 @@ class StatsService:
         
         # 将来の拡張ポイント：
         # 設定により重複許容（ダブルカウント）モードに切り替える場合は
-        # union_months() を使わずに各期間の月数を単純合計する実装に変更
+        # merged_months_count() を使わずに各区間の月数を単純合計する実装に変更
         """
-        usages = self.session.query(TechUsage).filter(
-            TechUsage.kind == kind,
-            TechUsage.tech_id == tech_id
-        ).all()
+        if start_filter or end_filter:
+            from services.month_index import month_index
+            return month_index.count_months(self.session, kind, tech_id, start_filter, end_filter)
         
-        if not usages:
-            return 0
-        
-        all_ranges = []
-        
-        for usage in usages:
-            project = self.session.query(Project).filter_by(id=usage.project_id).first()
-            if not project:
-                continue
-            
-            if usage.start and usage.end:
-                use_start = usage.start
-                use_end = usage.end
-            elif usage.start:
-                use_start = usage.start
-                use_end = None
-            else:
-                use_start = project.project_start
-                use_end = project.project_end
-            
-            if not use_start:
-                continue
-            
-            if start_filter:
-                if use_end and use_end < start_filter:
-                    continue
-                if use_start < start_filter:
-                    use_start = start_filter
-            
-            if end_filter:
-                if use_start > end_filter:
-                    continue
-                if not use_end or use_end > end_filter:
-                    use_end = end_filter
-            
-            month_range = self.month_range_inclusive(use_start, use_end)
-            all_ranges.append(month_range)
-        
-        unique_months = self.union_months(all_ranges)
-        return len(unique_months)
+        intervals = self._get_usage_month_intervals(kind, tech_id).get(tech_id, [])
+        return self.merged_months_count(intervals)
     
     def get_all_tech_stats(
         self, 
@@ -114,13 +296,51 @@ class StatsService:
         """
         指定カテゴリの全技術の統計を取得
         """
-        techs = self.repo.get_master_by_kind(kind)
+        techs = master_cache.get_records(self.session, kind)
+        return self.build_tech_stats(techs, self.get_months_by_tech(kind, start_filter, end_filter))
+    
+    def get_months_by_tech(
+        self,
+        kind: str,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[int, int]:
+        """
+        指定カテゴリのtech_idごとの経験月数を取得
+        期間フィルタなしの場合は tech_experience_summary テーブルを読むだけで済ませる
+        """
+        if not start_filter and not end_filter:
+            from services.experience_summary import ExperienceSummaryService
+            return ExperienceSummaryService(self.session).get_months_by_tech(kind)
+        
+        from services.month_index import month_index
+        return month_index.months_by_tech(self.session, kind, start_filter, end_filter)
+    
+    def get_months_by_kind(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[str, Dict[int, int]]:
+        """
+        全カテゴリのtech_idごとの経験月数を取得
+        """
+        return {
+            kind: self.get_months_by_tech(kind, start_filter, end_filter)
+            for kind in TECH_KINDS
+        }
+    
+    def build_tech_stats(
+        self,
+        techs: List,
+        months_by_tech: Dict[int, int]
+    ) -> List[Dict[str, Any]]:
+        """
+        マスタ一覧とtech_idごとの経験月数から統計行を生成
+        """
         stats = []
         
         for tech in techs:
-            months = self.tech_experience_unique_months(
-                kind, tech.id, start_filter, end_filter
-            )
+            months = months_by_tech.get(tech.id, 0)
             
             if months > 0:
                 years = months // 12
@@ -157,25 +377,18 @@ class StatsService:
         if not project:
             return {}
         
-        if project.project_start:
-            months = self.month_range_inclusive(
-                project.project_start, 
-                project.project_end
-            )
-            month_count = len(months)
-        else:
-            month_count = 0
+        month_count = 0
+        interval = self.month_ordinal_interval(project.start_month, project.end_month)
+        if interval:
+            month_count = interval[1] - interval[0] + 1
         
         engagements = self.repo.get_engagements_by_project(project_id)
         engagement_months = 0
         
         for engagement in engagements:
-            if engagement.site_start:
-                e_months = self.month_range_inclusive(
-                    engagement.site_start,
-                    engagement.site_end
-                )
-                engagement_months += len(e_months)
+            e_interval = self.month_ordinal_interval(engagement.site_start_month, engagement.site_end_month)
+            if e_interval:
+                engagement_months += e_interval[1] - e_interval[0] + 1
         
         return {
             'project_months': month_count,
@@ -191,33 +404,89 @@ class StatsService:
         """
         全体のサマリー統計を取得
         """
-        projects = self.repo.filter_projects({
-            'start_date': start_filter,
-            'end_date': end_filter
-        })
+        return self.compute_all_stats(start_filter, end_filter)['summary']
+    
+    def compute_all_stats(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        全カテゴリの技術統計とサマリーを一括計算
+        projects は1回だけ走査し、技術ごとの月数は集計テーブル（期間指定なし）
+        または月ビットセット索引（期間指定あり）から取得する
         
-        total_projects = len(projects)
+        戻り値: {'categories': {kind: get_all_tech_stats()と同形式}, 'summary': get_summary_stats()と同形式}
+        """
+        project_rows = self.session.query(
+            Project.project_start, Project.project_end, Project.start_month, Project.end_month
+        ).all()
         
-        categories = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
-        tech_counts = {}
+        months = self.get_months_by_kind(start_filter, end_filter)
         
-        for category in categories:
-            stats = self.get_all_tech_stats(category, start_filter, end_filter)
-            tech_counts[category] = len(stats)
+        categories = {}
+        for kind in TECH_KINDS:
+            techs = master_cache.get_records(self.session, kind)
+            categories[kind] = self.build_tech_stats(techs, months[kind])
         
-        all_months = []
-        for project in projects:
-            if project.project_start:
-                months = self.month_range_inclusive(
-                    project.project_start,
-                    project.project_end
-                )
-                all_months.append(months)
+        # filter_projects() の期間条件と同じ判定
+        total_projects = 0
+        project_intervals = []
+        for project_start, project_end, start_month, end_month in project_rows:
+            if start_filter and project_end is not None and project_end < start_filter:
+                continue
+            if end_filter and (project_start is None or project_start > end_filter):
+                continue
+            total_projects += 1
+            interval = self.month_ordinal_interval(start_month, end_month)
+            if interval:
+                project_intervals.append(interval)
         
-        unique_project_months = len(self.union_months(all_months))
+        summary = {
+            'total_projects': total_projects,
+            'total_months': self.merged_months_count(project_intervals),
+            'tech_counts': {kind: len(categories[kind]) for kind in TECH_KINDS}
+        }
         
         return {
-            'total_projects': total_projects,
-            'total_months': unique_project_months,
-            'tech_counts': tech_counts
-        }
\ No newline at end of file
+            'categories': categories,
+            'summary': summary
+        }
+
+def create_stats_service(
+    session: Session,
+    engine: Optional[str] = None,
+    use_cache: bool = True
+):
+    """
+    設定（[stats] engine）に応じた集計エンジンを生成
+    
+    - python: 標準の StatsService
+    - numpy: NumPyで技術×月の行列を一括計算する NumpyStatsService（NumPy未導入時は python にフォールバック）
+    - sql: 再帰CTEで月数をSQLite側で集計する SqlStatsService
+    
+    use_cache が真の場合は集計結果キャッシュ（CachedStatsService）を前段に置く
+    """
+    if engine is None:
+        from config import config
+        engine = config.get_stats_engine()
+    
+    service = None
+    if engine == 'numpy':
+        try:
+            from services.stats_numpy import NumpyStatsService
+            service = NumpyStatsService(session)
+        except ImportError:
+            print("NumPyが見つからないため、標準の集計エンジンを使用します")
+    
+    elif engine == 'sql':
+        from services.stats_sql import SqlStatsService
+        service = SqlStatsService(session)
+    
+    if service is None:
+        service = StatsService(session)
+    
+    if use_cache:
+        from services.stats_cache import CachedStatsService, stats_cache
+        return CachedStatsService(service, stats_cache)
+    return service
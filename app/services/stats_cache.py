@@ -0,0 +1,173 @@
+import copy
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session
+
+class StatsCache:
+    """
+    集計結果のLRUキャッシュ
+
+    キーは (メソッド名, kind, start_filter, end_filter)。
+    データベースの変更は以下の2つで検知し、変わっていればキャッシュ全体を破棄する。
+    - DatabaseService.write_version: このプロセスで書き込みを含むコミットがあるたびに増える
+    - PRAGMA data_version: 監視用の専用接続から見て、他の接続（他プロセスを含む）がコミットすると変わる
+    """
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._token = None
+        self._lock = threading.Lock()
+        # 監視用の専用接続 (データベースのパス, sqlite3接続)。self._lock の下で使用する
+        self._monitor: Optional[Tuple[str, sqlite3.Connection]] = None
+
+    def _data_version(self, session: Session) -> Optional[int]:
+        """
+        監視用接続の PRAGMA data_version を取得（取得できない場合は None）
+        接続はキャッシュごとに1つだけ sqlite3 で直接開き、エンジンの接続プールは使わない
+        """
+        database = session.get_bind().url.database
+        if not database or database == ':memory:':
+            return None
+
+        with self._lock:
+            try:
+                if self._monitor is None or self._monitor[0] != database:
+                    self._close_monitor()
+                    self._monitor = (database, sqlite3.connect(database, check_same_thread=False))
+                return self._monitor[1].execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.Error:
+                self._close_monitor()
+                return None
+
+    def _close_monitor(self):
+        """監視用接続を閉じる（self._lock を保持して呼び出す）"""
+        if self._monitor is not None:
+            try:
+                self._monitor[1].close()
+            except sqlite3.Error:
+                pass
+            self._monitor = None
+
+    def _current_token(self, session: Session) -> Tuple:
+        from services.db import db_service
+        return (str(session.get_bind().url), db_service.write_version, self._data_version(session))
+
+    def get_or_compute(
+        self,
+        session: Session,
+        method: str,
+        kind: Optional[str],
+        start_filter: Optional[str],
+        end_filter: Optional[str],
+        compute
+    ) -> Any:
+        """キャッシュ済みの結果を返す。無い場合は compute() で計算して保存する"""
+        # 未コミットの書き込みがあるセッションでは、コミット前の状態をキャッシュしない
+        if self.max_size <= 0 or session.info.get('has_writes') or session.new or session.dirty or session.deleted:
+            return compute()
+
+        key = (method, kind, start_filter, end_filter)
+        token = self._current_token(session)
+        # 他の接続の変更を検知できない場合はキャッシュを使わない
+        if token[2] is None:
+            return compute()
+
+        with self._lock:
+            if token != self._token:
+                self._entries.clear()
+                self._token = token
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+
+        result = compute()
+
+        with self._lock:
+            if token == self._token:
+                self._entries[key] = copy.deepcopy(result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return result
+
+    def clear(self):
+        """キャッシュを破棄"""
+        with self._lock:
+            self._entries.clear()
+            self._token = None
+
+    def close(self):
+        """キャッシュを破棄し、監視用接続を閉じる"""
+        with self._lock:
+            self._entries.clear()
+            self._token = None
+            self._close_monitor()
+
+    def get_stats(self) -> Dict[str, int]:
+        """ヒット・ミス回数と保持件数を取得"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size
+            }
+
+class CachedStatsService:
+    """
+    StatsService の前段に置くキャッシュ層
+    get_all_tech_stats / get_summary_stats / compute_all_stats の結果を StatsCache に保持し、
+    それ以外の属性は元のサービスにそのまま委譲する
+    """
+
+    def __init__(self, service, cache: StatsCache):
+        self.service = service
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    def get_all_tech_stats(
+        self,
+        kind: str,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ):
+        return self.cache.get_or_compute(
+            self.service.session, 'get_all_tech_stats', kind, start_filter, end_filter,
+            lambda: self.service.get_all_tech_stats(kind, start_filter, end_filter)
+        )
+
+    def get_summary_stats(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ):
+        return self.cache.get_or_compute(
+            self.service.session, 'get_summary_stats', None, start_filter, end_filter,
+            lambda: self.service.get_summary_stats(start_filter, end_filter)
+        )
+
+    def compute_all_stats(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ):
+        return self.cache.get_or_compute(
+            self.service.session, 'compute_all_stats', None, start_filter, end_filter,
+            lambda: self.service.compute_all_stats(start_filter, end_filter)
+        )
+
+def _create_stats_cache() -> StatsCache:
+    from config import config
+    return StatsCache(config.get_stats_cache_size())
+
+stats_cache = _create_stats_cache()
@@ -0,0 +1,216 @@
+from typing import List, Tuple, Optional, Dict, Any
+from datetime import date
+import numpy as np
+from sqlalchemy.orm import Session
+from models import Project, TechUsage
+from services.stats import StatsService, TECH_KINDS
+from services.master_cache import master_cache
+
+class NumpyStatsService(StatsService):
+    """
+    NumPyで技術×月のブール行列を構築して集計するエンジン
+
+    使用期間の決定と集計期間での切り詰めを全使用期間に対してベクトル演算で行い、
+    行列の行和で技術ごとの重複なし月数を求める。
+    大量の経歴データを一括集計する用途向けで、結果は StatsService と同一。
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session)
+        self._usage_arrays: Optional[Dict[str, np.ndarray]] = None
+
+    def _to_datetime64(self, values: List[Optional[str]]) -> np.ndarray:
+        """
+        日付文字列のリストを datetime64[D] 配列に変換（None・空文字は NaT）
+        期間の決定（effective_usage_period() / clipped_interval()）では空文字は未設定と同じ扱いになる
+        """
+        return np.array([v[:10] if v else 'NaT' for v in values], dtype='datetime64[D]')
+
+    def _month_ordinals(self, days: np.ndarray) -> np.ndarray:
+        """datetime64[D] 配列を月序数（year*12+month-1）に変換"""
+        return days.astype('datetime64[M]').astype(np.int64) + 1970 * 12
+
+    def _load_usage_arrays(self) -> Dict[str, np.ndarray]:
+        """tech_usages をプロジェクトと結合して読み込み、使用期間を配列化"""
+        if self._usage_arrays is not None:
+            return self._usage_arrays
+
+        rows = self.session.query(
+            TechUsage.kind,
+            TechUsage.tech_id,
+            TechUsage.start,
+            TechUsage.end,
+            Project.project_start,
+            Project.project_end
+        ).join(
+            Project, Project.id == TechUsage.project_id
+        ).all()
+
+        kinds = np.array([r[0] for r in rows], dtype=object)
+        tech_ids = np.array([r[1] for r in rows], dtype=np.int64)
+        usage_start = self._to_datetime64([r[2] for r in rows])
+        usage_end = self._to_datetime64([r[3] for r in rows])
+        project_start = self._to_datetime64([r[4] for r in rows])
+        project_end = self._to_datetime64([r[5] for r in rows])
+
+        # effective_usage_period() と同じ期間選択
+        has_start = ~np.isnat(usage_start)
+        has_end = ~np.isnat(usage_end)
+        use_start = np.where(has_start, usage_start, project_start)
+        use_end = np.where(
+            has_start & has_end, usage_end,
+            np.where(has_start, np.datetime64('NaT', 'D'), project_end)
+        )
+
+        self._usage_arrays = {
+            'kind': kinds,
+            'tech_id': tech_ids,
+            'start': use_start,
+            'end': use_end
+        }
+        return self._usage_arrays
+
+    def _clipped_month_ranges(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        start_filter: Optional[str],
+        end_filter: Optional[str]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        clipped_interval() のベクトル版
+        戻り値: (有効フラグ, 開始月序数, 終了月序数)
+        """
+        valid = ~np.isnat(start)
+        open_end = np.isnat(end)
+
+        if start_filter:
+            s = np.datetime64(start_filter[:10], 'D')
+            valid &= open_end | (end >= s)
+            start = np.where(start < s, s, start)
+
+        if end_filter:
+            e = np.datetime64(end_filter[:10], 'D')
+            valid &= ~(start > e)
+            end = np.where(open_end | (end > e), e, end)
+            open_end = np.zeros_like(open_end)
+
+        today = date.today()
+        start_months = np.where(valid, self._month_ordinals(np.where(valid, start, np.datetime64('1970-01-01'))), 0)
+        end_months = np.where(
+            open_end, today.year * 12 + today.month - 1,
+            self._month_ordinals(np.where(open_end, np.datetime64('1970-01-01'), end))
+        )
+        valid &= end_months >= start_months
+        return valid, start_months, end_months
+
+    def _experience_matrix(
+        self,
+        row_index: np.ndarray,
+        n_rows: int,
+        start_months: np.ndarray,
+        end_months: np.ndarray
+    ) -> np.ndarray:
+        """
+        行ごとの月区間から 行×月 のブール行列を生成
+        区間の始点に+1、終点の翌月に-1を置いて累積和を取る
+        """
+        if len(start_months) == 0:
+            return np.zeros((n_rows, 0), dtype=bool)
+
+        base = int(start_months.min())
+        n_cols = int(end_months.max()) - base + 1
+        diff = np.zeros((n_rows, n_cols + 1), dtype=np.int32)
+        np.add.at(diff, (row_index, start_months - base), 1)
+        np.add.at(diff, (row_index, end_months - base + 1), -1)
+        return np.cumsum(diff[:, :-1], axis=1) > 0
+
+    def get_months_by_kind(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[str, Dict[int, int]]:
+        """
+        全カテゴリのtech_idごとの経験月数を1つの行列から取得
+        """
+        arrays = self._load_usage_arrays()
+        result: Dict[str, Dict[int, int]] = {kind: {} for kind in TECH_KINDS}
+        if len(arrays['kind']) == 0:
+            return result
+
+        valid, start_months, end_months = self._clipped_month_ranges(
+            arrays['start'], arrays['end'], start_filter, end_filter
+        )
+
+        keys = list(zip(arrays['kind'][valid].tolist(), arrays['tech_id'][valid].tolist()))
+        unique_keys = sorted(set(keys))
+        key_rows = {key: i for i, key in enumerate(unique_keys)}
+        row_index = np.array([key_rows[key] for key in keys], dtype=np.int64)
+
+        matrix = self._experience_matrix(
+            row_index, len(unique_keys), start_months[valid], end_months[valid]
+        )
+        months = matrix.sum(axis=1)
+
+        for (kind, tech_id), count in zip(unique_keys, months.tolist()):
+            if kind in result:
+                result[kind][tech_id] = int(count)
+        return result
+
+    def get_months_by_tech(
+        self,
+        kind: str,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[int, int]:
+        return self.get_months_by_kind(start_filter, end_filter).get(kind, {})
+
+    def compute_all_stats(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        全カテゴリの技術統計とサマリーを行列演算で一括計算
+        """
+        months = self.get_months_by_kind(start_filter, end_filter)
+
+        categories = {}
+        for kind in TECH_KINDS:
+            techs = master_cache.get_records(self.session, kind)
+            categories[kind] = self.build_tech_stats(techs, months[kind])
+
+        project_rows = self.session.query(Project.project_start, Project.project_end).all()
+        project_start = self._to_datetime64([r[0] for r in project_rows])
+        project_end = self._to_datetime64([r[1] for r in project_rows])
+        start_is_null = np.array([r[0] is None for r in project_rows], dtype=bool)
+        end_is_null = np.array([r[1] is None for r in project_rows], dtype=bool)
+
+        # filter_projects() の期間条件と同じ判定
+        # 文字列比較のため、空文字の終了日は開始条件より前（除外）、空文字の開始日は終了条件以前（対象）になる
+        selected = np.ones(len(project_rows), dtype=bool)
+        if start_filter:
+            s = np.datetime64(start_filter[:10], 'D')
+            selected &= end_is_null | (project_end >= s)
+        if end_filter:
+            e = np.datetime64(end_filter[:10], 'D')
+            selected &= ~start_is_null & (np.isnat(project_start) | (project_start <= e))
+
+        valid, start_months, end_months = self._clipped_month_ranges(
+            project_start[selected], project_end[selected], None, None
+        )
+        matrix = self._experience_matrix(
+            np.zeros(int(valid.sum()), dtype=np.int64), 1,
+            start_months[valid], end_months[valid]
+        )
+
+        summary = {
+            'total_projects': int(selected.sum()),
+            'total_months': int(matrix.sum()),
+            'tech_counts': {kind: len(categories[kind]) for kind in TECH_KINDS}
+        }
+
+        return {
+            'categories': categories,
+            'summary': summary
+        }
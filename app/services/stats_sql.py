@@ -0,0 +1,121 @@
+from typing import Optional, Dict
+from sqlalchemy import text
+from services.stats import StatsService, TECH_KINDS
+
+# 使用期間の決定（StatsService.effective_usage_period()）・集計期間での切り詰め
+# （StatsService.clipped_interval()）・月の展開・重複なしカウントをすべてSQLiteで行う
+# 月序数は生成列（start_month / end_month）を使い、日付文字列は集計期間の日単位の比較にだけ使う
+EXPERIENCE_MONTHS_SQL = """
+WITH RECURSIVE
+usage_periods AS (
+    SELECT
+        tu.kind,
+        tu.tech_id,
+        CASE WHEN tu.start_month IS NOT NULL THEN tu.start
+             ELSE NULLIF(p.project_start, '') END AS use_start,
+        CASE WHEN tu.start_month IS NOT NULL THEN NULLIF(tu."end", '')
+             ELSE NULLIF(p.project_end, '') END AS use_end,
+        CASE WHEN tu.start_month IS NOT NULL THEN tu.start_month
+             ELSE p.start_month END AS start_month,
+        CASE WHEN tu.start_month IS NOT NULL THEN tu.end_month
+             ELSE p.end_month END AS end_month
+    FROM tech_usages tu
+    JOIN projects p ON p.id = tu.project_id
+    WHERE (:kind IS NULL OR tu.kind = :kind)
+      AND (:tech_id IS NULL OR tu.tech_id = :tech_id)
+),
+start_clipped AS (
+    SELECT
+        kind,
+        tech_id,
+        CASE WHEN :start_filter IS NOT NULL AND use_start < :start_filter
+             THEN :start_filter ELSE use_start END AS use_start,
+        CASE WHEN :start_filter IS NOT NULL AND use_start < :start_filter
+             THEN :start_filter_month ELSE start_month END AS first_month,
+        use_end,
+        end_month
+    FROM usage_periods
+    WHERE use_start IS NOT NULL
+      AND (:start_filter IS NULL OR use_end IS NULL OR use_end >= :start_filter)
+),
+clipped AS (
+    SELECT
+        kind,
+        tech_id,
+        first_month,
+        CASE WHEN :end_filter IS NOT NULL AND (use_end IS NULL OR use_end > :end_filter)
+             THEN :end_filter_month
+             WHEN use_end IS NULL THEN :current_month
+             ELSE end_month END AS last_month
+    FROM start_clipped
+    WHERE :end_filter IS NULL OR use_start <= :end_filter
+),
+months(kind, tech_id, month, last_month) AS (
+    SELECT kind, tech_id, first_month, last_month
+    FROM clipped
+    WHERE last_month >= first_month
+    UNION ALL
+    SELECT kind, tech_id, month + 1, last_month
+    FROM months
+    WHERE month < last_month
+)
+SELECT kind, tech_id, COUNT(DISTINCT month) AS unique_months
+FROM months
+GROUP BY kind, tech_id
+"""
+
+class SqlStatsService(StatsService):
+    """
+    経験月数の重複なしカウントをSQLite側で行うエンジン
+
+    再帰CTEで使用期間ごとに月序数を展開し、(kind, tech_id) ごとに COUNT(DISTINCT) する。
+    Pythonに渡るのは技術ごとの集計行だけになる。結果は StatsService と同一。
+    """
+
+    def _query_months(
+        self,
+        kind: Optional[str],
+        start_filter: Optional[str],
+        end_filter: Optional[str],
+        tech_id: Optional[int] = None
+    ) -> Dict[str, Dict[int, int]]:
+        rows = self.session.execute(text(EXPERIENCE_MONTHS_SQL), {
+            'kind': kind,
+            'tech_id': tech_id,
+            'start_filter': start_filter or None,
+            'end_filter': end_filter or None,
+            'start_filter_month': self.month_ordinal(start_filter) if start_filter else None,
+            'end_filter_month': self.month_ordinal(end_filter) if end_filter else None,
+            'current_month': self.current_month_ordinal()
+        }).all()
+
+        result: Dict[str, Dict[int, int]] = {k: {} for k in TECH_KINDS}
+        for row_kind, row_tech_id, unique_months in rows:
+            if row_kind in result:
+                result[row_kind][row_tech_id] = unique_months
+        return result
+
+    def get_months_by_kind(
+        self,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[str, Dict[int, int]]:
+        return self._query_months(None, start_filter, end_filter)
+
+    def get_months_by_tech(
+        self,
+        kind: str,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> Dict[int, int]:
+        return self._query_months(kind, start_filter, end_filter).get(kind, {})
+
+    def tech_experience_unique_months(
+        self,
+        kind: str,
+        tech_id: int,
+        start_filter: Optional[str] = None,
+        end_filter: Optional[str] = None
+    ) -> int:
+        months = self._query_months(kind, start_filter, end_filter, tech_id)
+        return months.get(kind, {}).get(tech_id, 0)
@@ -0,0 +1,36 @@
+"""
+データ変更イベントのGUIスレッドへの中継
+
+services.change_events の change_bus を購読し、コミットしたスレッド（GUIスレッド・
+ジョブのワーカースレッド）によらず、GUIスレッドで changed シグナルを発行する。
+同じイベントループ内で続けて届いたイベント（複数回のコミット）は1回にまとめる。
+"""
+from typing import List
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+from services.change_events import change_bus, merge_events, ChangeEvent
+
+class ChangeNotifier(QObject):
+    """changed: まとめた変更イベントの一覧（GUIスレッドで発行）"""
+    changed = Signal(object)
+    _received = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self._pending: List[ChangeEvent] = []
+        # 発行元のスレッドによらず、キューを経由してGUIスレッドで受け取る
+        self._received.connect(self._on_received, Qt.QueuedConnection)
+        change_bus.subscribe(ChangeEvent, self._received.emit)
+
+    @Slot(object)
+    def _on_received(self, events):
+        if not self._pending:
+            QTimer.singleShot(0, self._flush)
+        self._pending.extend(events)
+
+    def _flush(self):
+        events = merge_events(self._pending)
+        self._pending = []
+        if events:
+            self.changed.emit(events)
+
+change_notifier = ChangeNotifier()
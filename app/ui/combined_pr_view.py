@@ -4,10 +4,11 @@ from PySide6.QtWidgets import (
     QDialogButtonBox, QFormLayout, QMessageBox, QSplitter,
     QAbstractItemView, QGroupBox, QDateEdit, QComboBox
 )
-from PySide6.QtCore import Qt, QDate, Signal
+from PySide6.QtCore import Qt, QDate
 from datetime import date
 from services.db import db_service
 from services.repository import Repository
+from services.change_events import SelfPRChanged, OtherExperienceChanged
 from ui.styles import BUTTON_STYLES
 
 class CombinedPRDialog(QDialog):
@@ -175,7 +176,8 @@ class CombinedPRDialog(QDialog):
 class CombinedPRView(QWidget):
     """自己PR・その他経歴統合ビュー"""
     
-    data_changed = Signal()
+    # 購読する変更イベント（MainWindow から on_change() で渡される）
+    CHANGE_EVENTS = (SelfPRChanged, OtherExperienceChanged)
     
     def __init__(self):
         super().__init__()
@@ -184,6 +186,10 @@ class CombinedPRView(QWidget):
         self.init_ui()
         self.load_data()
     
+    def on_change(self, events):
+        """自己PR・その他経歴の変更時に一覧を再読み込み"""
+        self.load_data()
+    
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 5, 10, 10)
@@ -495,8 +501,6 @@ class CombinedPRView(QWidget):
                     
                     repo.create_self_pr(data)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "自己PRを追加しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"追加に失敗しました: {str(e)}")
@@ -516,8 +520,6 @@ class CombinedPRView(QWidget):
                     
                     repo.create_other_experience(data)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "その他経歴を追加しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"追加に失敗しました: {str(e)}")
@@ -544,8 +546,6 @@ class CombinedPRView(QWidget):
                 try:
                     repo.update_self_pr(pr_id, data)
                     
-                    self.load_data()
-                    self.data_changed.emit()
                     self.update_pr_preview()
                     QMessageBox.information(self, "成功", "自己PRを更新しました")
                 except Exception as e:
@@ -573,8 +573,6 @@ class CombinedPRView(QWidget):
                 try:
                     repo.update_other_experience(exp_id, data)
                     
-                    self.load_data()
-                    self.data_changed.emit()
                     self.update_exp_preview()
                     QMessageBox.information(self, "成功", "その他経歴を更新しました")
                 except Exception as e:
@@ -600,8 +598,6 @@ class CombinedPRView(QWidget):
                     repo = Repository(session)
                     repo.delete_self_pr(pr_id)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "自己PRを削除しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"削除に失敗しました: {str(e)}")
@@ -626,8 +622,6 @@ class CombinedPRView(QWidget):
                     repo = Repository(session)
                     repo.delete_other_experience(exp_id)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "その他経歴を削除しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"削除に失敗しました: {str(e)}")
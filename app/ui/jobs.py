@@ -0,0 +1,236 @@
+"""
+バックグラウンドジョブ（QThreadPool / QRunnable）
+
+エクスポートや一括同期など時間のかかる処理をGUIスレッドの外で実行する。
+ジョブごとに db_service.session_scope() で専用のセッションを開き、正常終了でコミット、
+例外・キャンセルでロールバックする。進捗と結果はシグナルでGUIスレッドへ渡し、
+ステータスバーに進捗バーとキャンセルボタンを表示する。
+"""
+from typing import Callable, Dict, Optional, Any
+from PySide6.QtWidgets import QStatusBar, QLabel, QProgressBar, QPushButton
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from services.db import db_service
+
+class JobCancelled(Exception):
+    """ジョブがキャンセルされた（Job.progress() / Job.check_cancelled() が送出）"""
+
+class JobSignals(QObject):
+    """ジョブからGUIスレッドへの通知（引数の先頭はジョブのキー）"""
+    progress = Signal(str, int, int, str)   # key, 完了数, 全体数（0で不定）, メッセージ
+    finished = Signal(str, object)          # key, 戻り値
+    failed = Signal(str, str)               # key, エラーメッセージ
+    cancelled = Signal(str)                 # key
+
+class Job(QRunnable):
+    """
+    ワーカースレッドで func(session, job) を実行するジョブ
+
+    func は job.progress() で進捗を報告する。キャンセル要求後の progress() /
+    check_cancelled() は JobCancelled を送出し、セッションはロールバックされる
+    """
+
+    def __init__(self, key: str, title: str, func: Callable[[Any, "Job"], Any], quiet: bool = False):
+        super().__init__()
+        self.key = key
+        self.title = title
+        self.func = func
+        self.quiet = quiet
+        self.signals = JobSignals()
+        self._cancel_requested = False
+
+    def cancel(self):
+        """キャンセルを要求（次の progress() / check_cancelled() で中断）"""
+        self._cancel_requested = True
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_requested
+
+    def check_cancelled(self):
+        if self._cancel_requested:
+            raise JobCancelled()
+
+    def progress(self, done: int, total: int, message: str = ""):
+        """進捗を報告（total=0 は進捗不定）"""
+        self.check_cancelled()
+        self.signals.progress.emit(self.key, done, total, message)
+
+    def run(self):
+        try:
+            with db_service.session_scope() as session:
+                result = self.func(session, self)
+                self.check_cancelled()
+        except JobCancelled:
+            self.signals.cancelled.emit(self.key)
+        except Exception as e:
+            self.signals.failed.emit(self.key, str(e))
+        else:
+            self.signals.finished.emit(self.key, result)
+
+class JobRunner(QObject):
+    """
+    ジョブの実行と状態表示
+
+    - 同じキーのジョブが実行中の場合は新たに開始しない
+    - 完了・失敗・キャンセル時のコールバックはGUIスレッドで呼び出す
+    - quiet のジョブ（統計の再計算など）はステータスバーに表示せず、キャンセルボタンの対象にもしない
+    - quiet のジョブは専用のスレッドプールで実行し、エクスポートなどの長いジョブの終了を待たせない
+    """
+
+    MAX_THREADS = 2
+    MAX_QUIET_THREADS = 1
+
+    def __init__(self):
+        super().__init__()
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(self.MAX_THREADS)
+        self._quiet_pool = QThreadPool()
+        self._quiet_pool.setMaxThreadCount(self.MAX_QUIET_THREADS)
+        self._jobs: Dict[str, Job] = {}
+        self._callbacks: Dict[str, Dict[str, Optional[Callable]]] = {}
+        self._progress: Dict[str, tuple] = {}
+        self._status_bar: Optional[QStatusBar] = None
+        self._status_label = None
+        self._progress_bar = None
+        self._cancel_button = None
+
+    def attach_status_bar(self, status_bar: QStatusBar):
+        """ステータスバーに進捗表示（ラベル・進捗バー・キャンセルボタン）を追加"""
+        self._status_bar = status_bar
+
+        self._status_label = QLabel()
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setMaximumWidth(160)
+        self._progress_bar.setMaximumHeight(16)
+        self._cancel_button = QPushButton("キャンセル")
+        self._cancel_button.clicked.connect(self._cancel_visible)
+
+        for widget in (self._status_label, self._progress_bar, self._cancel_button):
+            status_bar.addPermanentWidget(widget)
+        self._update_status()
+
+    def is_running(self, key: str) -> bool:
+        return key in self._jobs
+
+    def start(
+        self,
+        key: str,
+        title: str,
+        func: Callable[[Any, Job], Any],
+        on_finished: Optional[Callable[[Any], None]] = None,
+        on_failed: Optional[Callable[[str], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+        quiet: bool = False
+    ) -> Optional[Job]:
+        """ジョブを開始（同じキーのジョブが実行中の場合は None）"""
+        if key in self._jobs:
+            if not self._jobs[key].quiet:
+                self._show_message(f"{self._jobs[key].title}は実行中です")
+            return None
+
+        job = Job(key, title, func, quiet)
+        job.signals.progress.connect(self._on_progress)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+
+        self._jobs[key] = job
+        self._callbacks[key] = {
+            'finished': on_finished,
+            'failed': on_failed,
+            'cancelled': on_cancelled
+        }
+        self._progress[key] = (0, 0, "")
+        (self._quiet_pool if quiet else self._pool).start(job)
+        self._update_status()
+        return job
+
+    def cancel(self, key: Optional[str] = None):
+        """ジョブのキャンセルを要求（キー省略時は実行中のすべて）"""
+        if key is None:
+            jobs = list(self._jobs.values())
+        else:
+            jobs = [self._jobs[key]] if key in self._jobs else []
+        for job in jobs:
+            job.cancel()
+        if jobs:
+            self._show_message("キャンセルしています...")
+
+    def _cancel_visible(self):
+        """ステータスバーに表示中のジョブをキャンセル"""
+        for key, job in list(self._jobs.items()):
+            if not job.quiet:
+                self.cancel(key)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """実行中のジョブの終了を待つ（アプリ終了時）"""
+        return self._pool.waitForDone(msecs) and self._quiet_pool.waitForDone(msecs)
+
+    def _finish(self, key: str, callback_name: str):
+        job = self._jobs.pop(key, None)
+        self._progress.pop(key, None)
+        callbacks = self._callbacks.pop(key, {})
+        self._update_status()
+        return job, callbacks.get(callback_name)
+
+    @Slot(str, int, int, str)
+    def _on_progress(self, key: str, done: int, total: int, message: str):
+        if key in self._jobs:
+            self._progress[key] = (done, total, message)
+            self._update_status()
+
+    @Slot(str, object)
+    def _on_finished(self, key: str, result):
+        job, callback = self._finish(key, 'finished')
+        if job and not job.quiet:
+            self._show_message(f"{job.title}が完了しました", 5000)
+        if callback:
+            callback(result)
+
+    @Slot(str, str)
+    def _on_failed(self, key: str, error: str):
+        job, callback = self._finish(key, 'failed')
+        if job and not job.quiet:
+            self._show_message(f"{job.title}に失敗しました", 5000)
+        if callback:
+            callback(error)
+
+    @Slot(str)
+    def _on_cancelled(self, key: str):
+        job, callback = self._finish(key, 'cancelled')
+        if job and not job.quiet:
+            self._show_message(f"{job.title}をキャンセルしました", 5000)
+        if callback:
+            callback()
+
+    def _show_message(self, message: str, timeout: int = 3000):
+        if self._status_bar is not None:
+            self._status_bar.showMessage(message, timeout)
+
+    def _update_status(self):
+        """最後に開始したジョブの進捗をステータスバーに表示"""
+        if self._status_label is None:
+            return
+
+        visible = [key for key, job in self._jobs.items() if not job.quiet]
+        if not visible:
+            for widget in (self._status_label, self._progress_bar, self._cancel_button):
+                widget.hide()
+            return
+
+        key = visible[-1]
+        done, total, message = self._progress.get(key, (0, 0, ""))
+        text = self._jobs[key].title
+        if message:
+            text += f"：{message}"
+        if len(visible) > 1:
+            text += f"（他{len(visible) - 1}件）"
+
+        self._status_label.setText(text)
+        # total=0 は進捗不定（ビジー表示）
+        self._progress_bar.setRange(0, total)
+        self._progress_bar.setValue(done)
+        for widget in (self._status_label, self._progress_bar, self._cancel_button):
+            widget.show()
+
+job_runner = JobRunner()
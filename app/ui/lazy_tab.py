@@ -0,0 +1,63 @@
+"""
+遅延構築タブ
+
+タブには軽量なプレースホルダーだけを置き、初めて表示（描画）されたときに
+ビューを構築してデータを読み込む。構築はプレースホルダーの描画後に行うため、
+ウィンドウは先に描画され、読み込み中の表示が出る。
+"""
+import time
+from typing import Callable, Optional
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtCore import Qt, QTimer, Signal
+
+class LazyTab(QWidget):
+    """
+    初回表示時に factory() でビューを構築するタブ
+
+    painted: 初めて描画された（構築前のプレースホルダー）
+    built: ビューを構築した (ビュー, 構築にかかった秒数)
+    """
+    painted = Signal()
+    built = Signal(object, float)
+
+    def __init__(self, factory: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._view: Optional[QWidget] = None
+        self._build_scheduled = False
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel("読み込み中...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self._placeholder)
+
+    @property
+    def view(self) -> Optional[QWidget]:
+        """構築済みのビュー（未構築の場合は None）"""
+        return self._view
+
+    @property
+    def is_built(self) -> bool:
+        return self._view is not None
+
+    def ensure_built(self) -> QWidget:
+        """ビューを構築して返す（構築済みの場合はそのまま返す）"""
+        if self._view is None:
+            started = time.perf_counter()
+            view = self._factory()
+            self._layout.removeWidget(self._placeholder)
+            self._placeholder.deleteLater()
+            self._placeholder = None
+            self._layout.addWidget(view)
+            self._view = view
+            self.built.emit(view, time.perf_counter() - started)
+        return self._view
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._view is None and not self._build_scheduled:
+            # プレースホルダーを描画してから構築する
+            self._build_scheduled = True
+            self.painted.emit()
+            QTimer.singleShot(0, self.ensure_built)
@@ -1,3 +1,4 @@
+import time
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QMenuBar, QMenu, QMessageBox, QStatusBar,
@@ -12,14 +13,25 @@ from ui.self_pr_view import SelfPRView
 from ui.qualification_view import QualificationView
 from ui.other_experience_view import OtherExperienceView
 from ui.styles import APP_STYLESHEET, COLORS
+from ui.jobs import job_runner
+from ui.lazy_tab import LazyTab
+from ui.change_notifier import change_notifier
 from services.skill_sheet_export import SkillSheetExportService
-from services.db import db_service
+from services.change_events import merge_events
+from services.stats_cache import stats_cache
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, started_at=None):
+        """started_at: 起動時刻（time.perf_counter()）。初回描画までの時間の計測に使用"""
         super().__init__()
         from config import config
         
+        self._started_at = started_at if started_at is not None else time.perf_counter()
+        self._first_paint_ms = None
+        self._startup_reported = False
+        # 非表示中のビュー宛ての変更イベント（表示したときに渡す）
+        self._pending_events = {}
+        
         self.setWindowTitle(config.get_app_name())
         width, height = config.get_window_size()
         self.setGeometry(100, 100, width, height)
@@ -42,27 +54,74 @@ class MainWindow(QMainWindow):
         self.tab_widget.setMovable(False)
         layout.addWidget(self.tab_widget)
         
-        self.projects_view = ProjectsView()
-        self.tab_widget.addTab(self.projects_view, "プロジェクト管理")
-        
-        self.masters_view = MastersView()
-        self.tab_widget.addTab(self.masters_view, "マスタ管理")
-        
-        self.stats_view = StatsView()
-        self.tab_widget.addTab(self.stats_view, "経験年数統計")
-        
-        # 自己PR・その他経歴を統合した単一ビューを作成
+        # 自己PR・その他経歴を統合した単一ビュー
         from ui.combined_pr_view import CombinedPRView
-        self.combined_pr_view = CombinedPRView()
-        self.tab_widget.addTab(self.combined_pr_view, "自己PR・その他")
         
-        self.qualification_view = QualificationView()
-        self.tab_widget.addTab(self.qualification_view, "資格管理")
+        # タブはプレースホルダーで作成し、初めて表示したときにビューを構築する
+        tabs = [
+            ('projects', "プロジェクト管理", ProjectsView),
+            ('masters', "マスタ管理", MastersView),
+            ('stats', "経験年数統計", StatsView),
+            ('combined_pr', "自己PR・その他", CombinedPRView),
+            ('qualification', "資格管理", QualificationView)
+        ]
+        
+        self.tabs = {}
+        for key, title, view_class in tabs:
+            tab = LazyTab(view_class)
+            tab.painted.connect(self.on_first_paint)
+            tab.built.connect(lambda view, seconds, key=key: self.on_view_built(key, view, seconds))
+            self.tabs[key] = tab
+            self.tab_widget.addTab(tab, title)
         
-        self.projects_view.data_changed.connect(self.on_data_changed)
-        self.masters_view.data_changed.connect(self.on_data_changed)
-        self.combined_pr_view.data_changed.connect(self.on_data_changed)
-        self.qualification_view.data_changed.connect(self.on_data_changed)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        change_notifier.changed.connect(self.on_data_changed)
+    
+    def get_view(self, key):
+        """ビューを取得（未構築の場合は構築する）"""
+        return self.tabs[key].ensure_built()
+    
+    @property
+    def projects_view(self):
+        return self.get_view('projects')
+    
+    @property
+    def masters_view(self):
+        return self.get_view('masters')
+    
+    @property
+    def stats_view(self):
+        return self.get_view('stats')
+    
+    @property
+    def combined_pr_view(self):
+        return self.get_view('combined_pr')
+    
+    @property
+    def qualification_view(self):
+        return self.get_view('qualification')
+    
+    def on_view_built(self, key, view, seconds):
+        if not self._startup_reported:
+            # 最初に表示したタブの読み込みまでを起動時間として表示
+            self._startup_reported = True
+            message = (
+                f"準備完了（初回描画: {self._first_paint_ms:.0f}ms / "
+                f"{self.tab_widget.tabText(self.tab_widget.indexOf(self.tabs[key]))}の読み込み: {seconds * 1000:.0f}ms）"
+            )
+            print(message)
+            self.status_bar.showMessage(message, 10000)
+    
+    def on_first_paint(self):
+        if self._first_paint_ms is None:
+            self._first_paint_ms = (time.perf_counter() - self._started_at) * 1000
+    
+    def on_tab_changed(self, index):
+        # 非表示中に届いた変更イベントは、表示したときにまとめて渡す
+        key = next((k for k, tab in self.tabs.items() if self.tab_widget.widget(index) is tab), None)
+        events = self._pending_events.pop(key, None)
+        if events:
+            self.tabs[key].view.on_change(merge_events(events))
     
     def init_menu(self):
         menubar = self.menuBar()
@@ -70,7 +129,7 @@ class MainWindow(QMainWindow):
         file_menu = menubar.addMenu("ファイル(&F)")
         
         export_action = file_menu.addAction("統計をエクスポート(&E)")
-        export_action.triggered.connect(self.stats_view.export_all)
+        export_action.triggered.connect(lambda: self.stats_view.export_all())
         
         skill_sheet_action = file_menu.addAction("スキルシートをエクスポート(&S)")
         skill_sheet_action.triggered.connect(self.export_skill_sheet)
@@ -89,10 +148,33 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("準備完了")
+        job_runner.attach_status_bar(self.status_bar)
+    
+    def closeEvent(self, event):
+        # 実行中のジョブをキャンセルし、終了を待ってから閉じる
+        job_runner.cancel()
+        job_runner.wait_for_done()
+        stats_cache.close()
+        super().closeEvent(event)
     
-    def on_data_changed(self):
-        self.projects_view.refresh_data()
-        self.stats_view.refresh_stats()
+    def on_data_changed(self, events):
+        """
+        変更イベントを、そのイベントを購読している（CHANGE_EVENTS に含む）構築済みのビューへ渡す
+        未構築のビューは構築時に最新のデータを読み込むため対象外、
+        表示中でないビューへのイベントは次に表示したときに渡す
+        """
+        current = self.tab_widget.currentWidget()
+        for key, tab in self.tabs.items():
+            if not tab.is_built:
+                continue
+            subscribed = getattr(tab.view, 'CHANGE_EVENTS', ())
+            relevant = [change for change in events if isinstance(change, subscribed)]
+            if not relevant:
+                continue
+            if tab is current:
+                tab.view.on_change(relevant)
+            else:
+                self._pending_events.setdefault(key, []).extend(relevant)
         self.status_bar.showMessage("データが更新されました", 3000)
     
     def show_about(self):
@@ -140,29 +222,36 @@ class MainWindow(QMainWindow):
         if not filepath:
             return
         
-        try:
-            with db_service.session_scope() as session:
-                export_service = SkillSheetExportService(session)
-                
-                if selected_filter == "Markdown (*.md)" or filepath.endswith(".md"):
-                    if not filepath.endswith(".md"):
-                        filepath += ".md"
-                    export_service.export_to_markdown(filepath, name)
-                    QMessageBox.information(
-                        self, "成功", 
-                        f"スキルシートをMarkdown形式で保存しました:\n{filepath}"
-                    )
-                else:
-                    if not filepath.endswith(".docx"):
-                        filepath += ".docx"
-                    export_service.export_to_docx(filepath, name)
-                    QMessageBox.information(
-                        self, "成功", 
-                        f"スキルシートをWord文書として保存しました:\n{filepath}"
-                    )
-                    
-        except Exception as e:
+        if selected_filter == "Markdown (*.md)" or filepath.endswith(".md"):
+            if not filepath.endswith(".md"):
+                filepath += ".md"
+            file_format = "Markdown形式で"
+        else:
+            if not filepath.endswith(".docx"):
+                filepath += ".docx"
+            file_format = "Word文書として"
+        
+        def run(session, job):
+            export_service = SkillSheetExportService(session)
+            if filepath.endswith(".md"):
+                export_service.export_to_markdown(filepath, name, progress=job.progress)
+            else:
+                export_service.export_to_docx(filepath, name, progress=job.progress)
+        
+        def on_finished(_):
+            QMessageBox.information(
+                self, "成功", 
+                f"スキルシートを{file_format}保存しました:\n{filepath}"
+            )
+        
+        def on_failed(error):
             QMessageBox.critical(
                 self, "エラー",
-                f"スキルシートの出力中にエラーが発生しました:\n{str(e)}"
-            )
\ No newline at end of file
+                f"スキルシートの出力中にエラーが発生しました:\n{error}"
+            )
+        
+        # 出力はバックグラウンドで行い、進捗はステータスバーに表示
+        job_runner.start(
+            "skill_sheet_export", "スキルシート出力", run,
+            on_finished=on_finished, on_failed=on_failed
+        )
@@ -4,11 +4,13 @@ from PySide6.QtWidgets import (
     QLabel, QMessageBox, QDialog, QDialogButtonBox,
     QFormLayout, QHeaderView, QComboBox
 )
-from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QStandardItemModel, QStandardItem
 from typing import List
 from services.db import db_service
 from services.repository import Repository
+from services.master_cache import master_cache
+from services.change_events import MasterChanged
 from ui.styles import BUTTON_STYLES
 
 class MasterTableModel(QAbstractTableModel):
@@ -100,8 +102,7 @@ class MasterEditDialog(QDialog):
             self.proficiency_combo = QComboBox()
             self.proficiency_combo.addItem("(未選択)", None)
             with db_service.session_scope() as session:
-                repo = Repository(session)
-                proficiencies = repo.get_master_by_kind('proficiency')
+                proficiencies = master_cache.get_records(session, 'proficiency')
                 for prof in proficiencies:
                     self.proficiency_combo.addItem(prof.name, prof.id)
             layout.addRow("習熟度:", self.proficiency_combo)
@@ -119,20 +120,15 @@ class MasterEditDialog(QDialog):
     
     def load_data(self):
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            masters = repo.get_master_by_kind(self.kind)
-            for master in masters:
-                if master.id == self.master_id:
-                    self.name_edit.setText(master.name)
-                    self.note_edit.setText(master.note or "")
-                    # 習熟度が設定されている場合は選択状態にする
-                    if self.proficiency_combo and hasattr(master, 'proficiency_id'):
-                        if master.proficiency_id:
-                            for i in range(self.proficiency_combo.count()):
-                                if self.proficiency_combo.itemData(i) == master.proficiency_id:
-                                    self.proficiency_combo.setCurrentIndex(i)
-                                    break
-                    break
+            master = master_cache.get(session, self.kind, self.master_id)
+            if master:
+                self.name_edit.setText(master.name)
+                self.note_edit.setText(master.note or "")
+                # 習熟度が設定されている場合は選択状態にする
+                if self.proficiency_combo and master.proficiency_id:
+                    index = self.proficiency_combo.findData(master.proficiency_id)
+                    if index >= 0:
+                        self.proficiency_combo.setCurrentIndex(index)
     
     def validate_and_accept(self):
         if not self.name_edit.text().strip():
@@ -140,14 +136,10 @@ class MasterEditDialog(QDialog):
             return
         
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            masters = repo.get_master_by_kind(self.kind)
-            
-            for master in masters:
-                if master.name == self.name_edit.text().strip():
-                    if not self.master_id or master.id != self.master_id:
-                        QMessageBox.warning(self, "警告", "同じ名称が既に存在します")
-                        return
+            master = master_cache.find_by_name(session, self.kind, self.name_edit.text().strip())
+            if master and (not self.master_id or master.id != self.master_id):
+                QMessageBox.warning(self, "警告", "同じ名称が既に存在します")
+                return
         
         self.accept()
     
@@ -163,8 +155,6 @@ class MasterEditDialog(QDialog):
         return data
 
 class MasterTabWidget(QWidget):
-    data_changed = Signal()
-    
     def __init__(self, kind, title):
         super().__init__()
         self.kind = kind
@@ -218,10 +208,19 @@ class MasterTabWidget(QWidget):
         layout.addLayout(button_layout)
     
     def refresh_data(self):
+        """一覧を再読み込み（選択中のマスタはIDで選択し直す）"""
+        current = self.table_view.currentIndex()
+        selected_id = self.model.data(current.siblingAtColumn(0), Qt.UserRole) if current.isValid() else None
+        
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            data = repo.get_master_by_kind(self.kind)
+            data = master_cache.get_records(session, self.kind)
             self.model.update_data(data)
+        
+        if selected_id is not None:
+            for row in range(self.model.rowCount()):
+                if self.model.data(self.model.index(row, 0), Qt.UserRole) == selected_id:
+                    self.table_view.selectRow(row)
+                    break
     
     def add_master(self):
         dialog = MasterEditDialog(self.kind, parent=self)
@@ -237,8 +236,6 @@ class MasterTabWidget(QWidget):
                         data.get('proficiency_id')
                     )
 
-                self.refresh_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", f"{self.title}を追加しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"追加に失敗しました: {str(e)}")
@@ -265,8 +262,6 @@ class MasterTabWidget(QWidget):
                         data.get('proficiency_id')
                     )
 
-                self.refresh_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", f"{self.title}を更新しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"更新に失敗しました: {str(e)}")
@@ -295,8 +290,6 @@ class MasterTabWidget(QWidget):
                     repo = Repository(session)
                     repo.delete_master(self.kind, master_id)
 
-                self.refresh_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", f"{self.title}を削除しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"削除に失敗しました: {str(e)}")
@@ -308,23 +301,13 @@ class MasterTabWidget(QWidget):
             QMessageBox.warning(self, "警告", f"{self.title}を選択してください")
             return
 
-        current_row = current.row()
         master_id = self.model.data(current.siblingAtColumn(0), Qt.UserRole)
 
         try:
             with db_service.session_scope() as session:
                 repo = Repository(session)
-                if repo.move_master_up(self.kind, master_id):
-                    self.refresh_data()
-                    self.data_changed.emit()
-                    # 上に移動したので、移動後は1つ上の行になる
-                    new_row = max(0, current_row - 1)
-                    # IDで選択を復元
-                    for row in range(self.model.rowCount()):
-                        if self.model.data(self.model.index(row, 0), Qt.UserRole) == master_id:
-                            self.table_view.selectRow(row)
-                            break
-                else:
+                # 一覧はコミット後の MasterChanged で再読み込みされ、選択はIDで維持される
+                if not repo.move_master_up(self.kind, master_id):
                     QMessageBox.information(self, "情報", "これ以上上に移動できません")
         except Exception as e:
             QMessageBox.critical(self, "エラー", f"移動に失敗しました: {str(e)}")
@@ -336,29 +319,20 @@ class MasterTabWidget(QWidget):
             QMessageBox.warning(self, "警告", f"{self.title}を選択してください")
             return
 
-        current_row = current.row()
         master_id = self.model.data(current.siblingAtColumn(0), Qt.UserRole)
 
         try:
             with db_service.session_scope() as session:
                 repo = Repository(session)
-                if repo.move_master_down(self.kind, master_id):
-                    self.refresh_data()
-                    self.data_changed.emit()
-                    # 下に移動したので、移動後は1つ下の行になる
-                    new_row = min(self.model.rowCount() - 1, current_row + 1)
-                    # IDで選択を復元
-                    for row in range(self.model.rowCount()):
-                        if self.model.data(self.model.index(row, 0), Qt.UserRole) == master_id:
-                            self.table_view.selectRow(row)
-                            break
-                else:
+                # 一覧はコミット後の MasterChanged で再読み込みされ、選択はIDで維持される
+                if not repo.move_master_down(self.kind, master_id):
                     QMessageBox.information(self, "情報", "これ以上下に移動できません")
         except Exception as e:
             QMessageBox.critical(self, "エラー", f"移動に失敗しました: {str(e)}")
 
 class MastersView(QWidget):
-    data_changed = Signal()
+    # 購読する変更イベント（MainWindow から on_change() で渡される）
+    CHANGE_EVENTS = (MasterChanged,)
     
     def __init__(self):
         super().__init__()
@@ -383,10 +357,15 @@ class MastersView(QWidget):
             ('proficiency', '習熟度')
         ]
         
+        self.master_tabs = {}
         for kind, title in categories:
             tab = MasterTabWidget(kind, title)
-            tab.data_changed.connect(self.on_data_changed)
+            self.master_tabs[kind] = tab
             self.tab_widget.addTab(tab, title)
     
-    def on_data_changed(self):
-        self.data_changed.emit()
\ No newline at end of file
+    def on_change(self, events):
+        """変更されたマスタ種別のタブのみ再読み込み"""
+        for kind in {change.kind for change in events}:
+            tab = self.master_tabs.get(kind)
+            if tab:
+                tab.refresh_data()
\ No newline at end of file
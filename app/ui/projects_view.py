@@ -6,24 +6,38 @@ from PySide6.QtWidgets import (
     QAbstractItemView, QHeaderView, QDialog, QDialogButtonBox,
     QFormLayout, QSpinBox
 )
-from PySide6.QtCore import Qt, QDate, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtCore import (
+    Qt, QDate, QTimer, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+)
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QKeySequence, QShortcut
 from ui.styles import BUTTON_STYLES
+from ui.jobs import job_runner
 from datetime import date, datetime
 from typing import List, Optional
 from services.db import db_service
 from services.repository import Repository
+from services.master_cache import master_cache, TECH_MASTER_KINDS
+from services.change_events import ProjectChanged, MasterChanged
 
 class ProjectTableModel(QAbstractTableModel):
-    def __init__(self, projects=None):
+    """
+    プロジェクト一覧（Repository.load_project_rows() の ProjectRow を保持）
+
+    行は開始日の新しい順（開始日なしは末尾）に並べる。保存・削除の反映は
+    upsert_rows() / remove_rows() で変更された行だけを挿入・更新・移動・削除するため、
+    一覧の選択とスクロール位置は維持される。
+    """
+
+    def __init__(self, rows=None):
         super().__init__()
-        self.projects = []
+        self.rows = []
+        self.row_by_id = {}
         self.headers = ["プロジェクト名", "役割", "期間", "規模", "エンドユーザー", "契約会社"]
-        if projects:
-            self.update_projects(projects)
+        if rows:
+            self.set_rows(rows)
     
     def rowCount(self, parent=QModelIndex()):
-        return len(self.projects)
+        return len(self.rows)
     
     def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
@@ -32,17 +46,17 @@ class ProjectTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
         
-        project = self.projects[index.row()]
+        project = self.rows[index.row()]
         col = index.column()
         
         if role == Qt.DisplayRole:
             if col == 0:
-                return project['name']
+                return project.name
             elif col == 1:
-                return project['role_name']
+                return project.role_name
             elif col == 2:
-                start = project['project_start'] or ""
-                end = project['project_end'] or "継続中"
+                start = project.project_start or ""
+                end = project.project_end or "継続中"
                 if start:
                     start = start[:7]
                     if end != "継続中":
@@ -50,14 +64,14 @@ class ProjectTableModel(QAbstractTableModel):
                     return f"{start} ~ {end}"
                 return ""
             elif col == 3:
-                return project['scale_text'] or ""
+                return project.scale_text or ""
             elif col == 4:
-                return project['end_user'] or ""
+                return project.end_user or ""
             elif col == 5:
-                return project['contract_company'] or ""
+                return project.contract_company or ""
         
         elif role == Qt.UserRole:
-            return project['id']
+            return project.id
         
         return None
     
@@ -66,22 +80,120 @@ class ProjectTableModel(QAbstractTableModel):
             return self.headers[section]
         return None
     
-    def update_projects(self, projects):
+    def set_rows(self, rows):
+        """一覧全体を置き換える（rows は開始日の新しい順）"""
         self.beginResetModel()
-        # SQLAlchemyオブジェクトを辞書に変換してセッション依存を回避
-        self.projects = []
-        for project in projects:
-            self.projects.append({
-                'id': project.id,
-                'name': project.name,
-                'role_name': project.role.name if project.role else "",
-                'project_start': project.project_start,
-                'project_end': project.project_end,
-                'scale_text': project.scale_text,
-                'end_user': project.end_user,
-                'contract_company': project.contract_company
-            })
+        self.rows = list(rows)
+        self.row_by_id = {}
+        self._reindex(0)
         self.endResetModel()
+    
+    def upsert_rows(self, rows):
+        """行を追加・更新する（開始日が変わった行は並び順の位置へ移動する）"""
+        for project in rows:
+            row = self.row_by_id.get(project.id)
+            if row is None:
+                self._insert_row(project)
+            else:
+                self._update_row(row, project)
+    
+    def remove_rows(self, project_ids):
+        """指定したプロジェクトの行を削除する（一覧にないIDは無視する）"""
+        for project_id in project_ids:
+            row = self.row_by_id.pop(project_id, None)
+            if row is None:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self._reindex(row)
+            self.endRemoveRows()
+    
+    def _reindex(self, start):
+        """start 行目以降の ID → 行番号の対応を更新"""
+        for row in range(start, len(self.rows)):
+            self.row_by_id[self.rows[row].id] = row
+    
+    @staticmethod
+    def _sorts_before(a, b) -> bool:
+        """a が b より前に並ぶか（開始日の新しい順、開始日なしは末尾）"""
+        if a.project_start is None:
+            return False
+        return b.project_start is None or a.project_start > b.project_start
+    
+    def _insert_position(self, project, skip_row=None) -> int:
+        """project を挿入する位置（同じ開始日の行の後ろ）を二分探索で求める（skip_row の行は除いて数える）"""
+        rows = self.rows
+        low, high = 0, len(rows) - (0 if skip_row is None else 1)
+        while low < high:
+            mid = (low + high) // 2
+            row = mid if skip_row is None or mid < skip_row else mid + 1
+            if self._sorts_before(project, rows[row]):
+                high = mid
+            else:
+                low = mid + 1
+        return low
+    
+    def _insert_row(self, project):
+        row = self._insert_position(project)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(row, project)
+        self._reindex(row)
+        self.endInsertRows()
+    
+    def _update_row(self, row, project):
+        target = self._insert_position(project, skip_row=row)
+        if target != row:
+            # beginMoveRows() の移動先は移動前の行番号で指定する
+            destination = target if target < row else target + 1
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination)
+            del self.rows[row]
+            self.rows.insert(target, project)
+            self._reindex(min(row, target))
+            self.endMoveRows()
+            row = target
+        else:
+            self.rows[row] = project
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+class ProjectFilterProxyModel(QSortFilterProxyModel):
+    """
+    プロジェクト一覧の絞り込み（SQLiteへは問い合わせない）
+
+    条件は Repository.filter_projects() と同じ:
+    - 期間: 終了日が開始条件以降（継続中を含む）かつ開始日が終了条件以前
+    - 文字列: 名前・業務内容・詳細のいずれかに部分一致（大文字小文字を区別しない）
+    - 技術: 種別ごとに指定した技術のいずれかを使用（種別間は AND）
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.start_filter = None
+        self.end_filter = None
+        self.text_filter = ""
+        self.tech_filters = {}
+
+    def set_filters(self, start_filter=None, end_filter=None, text_filter="", tech_filters=None):
+        self.start_filter = start_filter
+        self.end_filter = end_filter
+        self.text_filter = (text_filter or "").casefold()
+        self.tech_filters = {kind: set(ids) for kind, ids in (tech_filters or {}).items() if ids}
+        self.invalidateFilter()
+
+    def accepts(self, project) -> bool:
+        """1行分の判定"""
+        if self.start_filter and project.project_end is not None and project.project_end < self.start_filter:
+            return False
+        if self.end_filter and (project.project_start is None or project.project_start > self.end_filter):
+            return False
+        if self.text_filter and self.text_filter not in project.search_text:
+            return False
+        for kind, tech_ids in self.tech_filters.items():
+            if not tech_ids & project.tech_ids.get(kind, set()):
+                return False
+        return True
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.accepts(self.sourceModel().rows[source_row])
 
 class RoleSelectionDialog(QDialog):
     def __init__(self, selected_role_ids, parent=None):
@@ -126,8 +238,7 @@ class RoleSelectionDialog(QDialog):
 
     def load_roles(self):
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            roles = repo.get_master_by_kind('role')
+            roles = master_cache.get_records(session, 'role')
 
             # 全ての役割データを保持
             self.all_roles = [(role.id, role.name) for role in roles]
@@ -219,8 +330,7 @@ class TaskSelectionDialog(QDialog):
 
     def load_tasks(self):
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            tasks = repo.get_master_by_kind('task')
+            tasks = master_cache.get_records(session, 'task')
 
             # 全ての作業データを保持
             self.all_tasks = [(task.id, task.name) for task in tasks]
@@ -326,12 +436,7 @@ class TechUsageDialog(QDialog):
                 kind_item = QStandardItem(usage.kind)
                 kind_item.setData(usage.id, Qt.UserRole)
                 
-                master = repo.get_master_by_kind(usage.kind)
-                tech_name = ""
-                for m in master:
-                    if m.id == usage.tech_id:
-                        tech_name = m.name
-                        break
+                tech_name = master_cache.get_name(session, usage.kind, usage.tech_id)
                 
                 tech_item = QStandardItem(tech_name)
                 tech_item.setData(usage.tech_id, Qt.UserRole)
@@ -358,8 +463,7 @@ class TechUsageDialog(QDialog):
         def update_tech_combo():
             tech_combo.clear()
             with db_service.session_scope() as session:
-                repo = Repository(session)
-                techs = repo.get_master_by_kind(kind_combo.currentText())
+                techs = master_cache.get_records(session, kind_combo.currentText())
                 for tech in techs:
                     tech_combo.addItem(tech.name, tech.id)
         
@@ -452,15 +556,21 @@ class TechUsageDialog(QDialog):
             QMessageBox.critical(self, "エラー", f"保存に失敗しました: {str(e)}")
 
 class ProjectsView(QWidget):
-    data_changed = Signal()
+    # 購読する変更イベント（MainWindow から on_change() で渡される）
+    CHANGE_EVENTS = (ProjectChanged, MasterChanged)
+    
+    # 入力中の絞り込みを反映するまでの待ち時間（ミリ秒）
+    FILTER_DELAY_MS = 200
     
     def __init__(self):
         super().__init__()
         self.current_project_id = None
+        self.tech_item_rows = {}
         self.init_ui()
         self.load_masters()
-        self.set_default_filters()
         self.refresh_data()
+        self.set_default_filters()
+        self.apply_filters()
         self.setup_shortcuts()
     
     def init_ui(self):
@@ -498,16 +608,35 @@ class ProjectsView(QWidget):
         search_layout.addWidget(self.search_text)
         
         self.search_button = QPushButton("検索")
-        self.search_button.clicked.connect(self.refresh_data)
+        self.search_button.clicked.connect(self.apply_filters)
         search_layout.addWidget(self.search_button)
         filter_layout.addLayout(search_layout)
         
+        tech_filter_layout = QHBoxLayout()
+        tech_filter_layout.addWidget(QLabel("技術:"))
+        self.tech_filter_combo = QComboBox()
+        tech_filter_layout.addWidget(self.tech_filter_combo, 1)
+        filter_layout.addLayout(tech_filter_layout)
+        
         filter_group.setLayout(filter_layout)
         left_layout.addWidget(filter_group)
         
+        # 絞り込みはメモリ上の一覧に対して行い、入力中は FILTER_DELAY_MS 待ってから反映する
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        self.search_text.textChanged.connect(self.filter_timer.start)
+        self.search_text.returnPressed.connect(self.apply_filters)
+        self.start_date.dateChanged.connect(self.filter_timer.start)
+        self.end_date.dateChanged.connect(self.filter_timer.start)
+        self.tech_filter_combo.currentIndexChanged.connect(self.apply_filters)
+        
         self.project_table = QTableView()
         self.project_model = ProjectTableModel()
-        self.project_table.setModel(self.project_model)
+        self.project_proxy = ProjectFilterProxyModel(self)
+        self.project_proxy.setSourceModel(self.project_model)
+        self.project_table.setModel(self.project_proxy)
         self.project_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.project_table.selectionModel().selectionChanged.connect(self.on_project_selected)
         
@@ -741,29 +870,7 @@ class ProjectsView(QWidget):
     def sync_tech_usages_with_project_selections(self, repo, project_id):
         """プロジェクトの技術選択とtech_usagesを同期"""
         try:
-            project = repo.get_project_by_id(project_id)
-            if not project:
-                return
-            
-            # 現在のtech_usagesを削除
-            repo.delete_tech_usages_by_project(project_id)
-            
-            # プロジェクトの技術選択から新しいtech_usagesを生成
-            tech_kinds = ['os', 'language', 'framework', 'tool', 'cloud', 'db']
-            
-            for kind in tech_kinds:
-                selected_tech_ids = repo.get_project_techs(project_id, kind)
-                
-                for tech_id in selected_tech_ids:
-                    # プロジェクト期間をデフォルトの技術使用期間として設定
-                    repo.create_tech_usage({
-                        'project_id': project_id,
-                        'kind': kind,
-                        'tech_id': tech_id,
-                        'start': project.project_start,
-                        'end': project.project_end
-                    })
-                    
+            repo.sync_tech_usages_from_selections([project_id])
         except Exception as e:
             print(f"技術使用期間同期エラー: {e}")
     
@@ -791,9 +898,9 @@ class ProjectsView(QWidget):
             else:
                 self.task_button.setText("選択...")
 
-    def load_masters(self):
+    def load_masters(self, kinds=None):
+        """技術の選択リストを読み込む（kinds 指定時はその種別のみ、選択状態は維持）"""
         with db_service.session_scope() as session:
-            repo = Repository(session)
 
             tech_lists = [
                 ('os', self.os_list),
@@ -804,139 +911,184 @@ class ProjectsView(QWidget):
                 ('db', self.db_list)
             ]
             
+            # 選択状態の復元用に tech_id → 行番号 を保持
             for kind, list_widget in tech_lists:
+                if kinds is not None and kind not in kinds:
+                    continue
+                selected_ids = {item.data(Qt.UserRole) for item in list_widget.selectedItems()}
                 list_widget.clear()
-                for tech in repo.get_master_by_kind(kind):
+                rows = {}
+                for tech in master_cache.get_records(session, kind):
                     item = QListWidgetItem(tech.name)
                     item.setData(Qt.UserRole, tech.id)
+                    rows[tech.id] = list_widget.count()
                     list_widget.addItem(item)
+                    if tech.id in selected_ids:
+                        item.setSelected(True)
+                self.tech_item_rows[kind] = rows
+            
+            self.load_tech_filter_combo(session)
+    
+    def load_tech_filter_combo(self, session):
+        """技術の絞り込み候補（全種別）を読み込む（選択中の技術は維持）"""
+        kind_names = {
+            'os': 'OS', 'language': '言語', 'framework': 'FW/ライブラリ',
+            'tool': 'ツール', 'cloud': 'クラウド', 'db': 'DB'
+        }
+        current = self.tech_filter_combo.currentData()
+        
+        self.tech_filter_combo.blockSignals(True)
+        self.tech_filter_combo.clear()
+        self.tech_filter_combo.addItem("指定なし", None)
+        for kind in TECH_MASTER_KINDS:
+            for tech in master_cache.get_records(session, kind):
+                self.tech_filter_combo.addItem(f"{kind_names[kind]}: {tech.name}", (kind, tech.id))
+        # (kind, tech_id) のタプルは findData() では一致しないため値で探す
+        index = next(
+            (i for i in range(self.tech_filter_combo.count()) if self.tech_filter_combo.itemData(i) == current),
+            -1
+        )
+        self.tech_filter_combo.setCurrentIndex(max(index, 0))
+        self.tech_filter_combo.blockSignals(False)
+        
+        if current is not None and index < 0:
+            # 選択中の技術が削除された
+            self.apply_filters()
+    
+    def on_change(self, events):
+        """
+        変更イベントに応じて更新
+        - 技術マスタの変更: その種別の選択リストを再読み込み
+        - プロジェクトの変更: 変更されたプロジェクトの行だけを読み込んで一覧に反映
+        - 役割マスタの変更・対象が特定できないプロジェクトの変更: 一覧を再読み込み（役割名を表示しているため）
+        """
+        master_kinds = {change.kind for change in events if isinstance(change, MasterChanged)}
+        tech_kinds = master_kinds & set(TECH_MASTER_KINDS)
+        if tech_kinds:
+            self.load_masters(tech_kinds)
+        
+        project_changes = [change for change in events if isinstance(change, ProjectChanged)]
+        if 'role' in master_kinds or any(change.project_ids is None for change in project_changes):
+            self.refresh_data()
+        elif project_changes:
+            project_ids = set().union(*(change.project_ids for change in project_changes))
+            self.refresh_rows(project_ids)
     
     def set_default_filters(self):
         """デフォルトのフィルタを設定（全期間）"""
-        # 最も古いプロジェクトの開始日を取得
-        try:
-            with db_service.session_scope() as session:
-                repo = Repository(session)
-                projects = repo.get_all_projects()
-                
-                if projects:
-                    # 最も古い開始日を探す
-                    oldest_date = None
-                    for project in projects:
-                        if project.project_start:
-                            project_date = QDate.fromString(project.project_start, "yyyy-MM-dd")
-                            if project_date.isValid():
-                                if oldest_date is None or project_date < oldest_date:
-                                    oldest_date = project_date
-                    
-                    # デフォルト値を設定
-                    if oldest_date:
-                        self.start_date.setDate(oldest_date)
-                    else:
-                        self.start_date.setDate(QDate.currentDate().addYears(-10))
-                    
-                    self.end_date.setDate(QDate.currentDate())
-                else:
-                    # プロジェクトがない場合のデフォルト
-                    self.start_date.setDate(QDate.currentDate().addYears(-10))
-                    self.end_date.setDate(QDate.currentDate())
-        except Exception as e:
-            print(f"フィルタ設定エラー: {e}")
-            # エラー時のデフォルト
+        # 読み込み済みの一覧から最も古いプロジェクトの開始日を取得
+        oldest_date = None
+        for project in self.project_model.rows:
+            if project.project_start:
+                project_date = QDate.fromString(project.project_start, "yyyy-MM-dd")
+                if project_date.isValid():
+                    if oldest_date is None or project_date < oldest_date:
+                        oldest_date = project_date
+        
+        # デフォルト値を設定（プロジェクトがない場合は過去10年）
+        if oldest_date:
+            self.start_date.setDate(oldest_date)
+        else:
             self.start_date.setDate(QDate.currentDate().addYears(-10))
-            self.end_date.setDate(QDate.currentDate())
+        self.end_date.setDate(QDate.currentDate())
     
     def refresh_data(self):
-        filters = {}
+        """プロジェクト一覧をSQLiteから読み込み直す（絞り込みは読み込んだ一覧に適用される）"""
+        with db_service.session_scope() as session:
+            rows = Repository(session).load_project_rows()
+        self.project_model.set_rows(rows)
+    
+    def refresh_rows(self, project_ids):
+        """指定したプロジェクトの行だけを読み込み直す（削除されたプロジェクトの行は取り除く）"""
+        with db_service.session_scope() as session:
+            rows = Repository(session).load_project_rows(list(project_ids))
+        self.project_model.upsert_rows(rows)
+        self.project_model.remove_rows(set(project_ids) - {project.id for project in rows})
+    
+    def apply_filters(self):
+        """期間・検索文字列・技術の絞り込みを一覧に適用"""
+        self.filter_timer.stop()
         
+        start_filter = None
+        end_filter = None
         if self.start_date.date() != self.start_date.minimumDate():
-            filters['start_date'] = self.start_date.date().toString("yyyy-MM-dd")
-        
+            start_filter = self.start_date.date().toString("yyyy-MM-dd")
         if self.end_date.date() != self.end_date.minimumDate():
-            filters['end_date'] = self.end_date.date().toString("yyyy-MM-dd")
+            end_filter = self.end_date.date().toString("yyyy-MM-dd")
         
-        if self.search_text.text():
-            filters['text'] = self.search_text.text()
+        tech_filters = {}
+        selected_tech = self.tech_filter_combo.currentData()
+        if selected_tech is not None:
+            kind, tech_id = selected_tech
+            tech_filters[kind] = {tech_id}
         
-        with db_service.session_scope() as session:
-            repo = Repository(session)
-            projects = repo.filter_projects(filters)
-            self.project_model.update_projects(projects)
+        self.project_proxy.set_filters(start_filter, end_filter, self.search_text.text(), tech_filters)
     
     def on_project_selected(self, selected, deselected):
         indexes = self.project_table.selectionModel().selectedRows()
         if indexes:
-            project_id = self.project_model.data(indexes[0], Qt.UserRole)
+            project_id = self.project_proxy.data(indexes[0], Qt.UserRole)
             self.load_project(project_id)
     
     def load_project(self, project_id):
         self.current_project_id = project_id
 
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            project = repo.get_project_by_id(project_id)
+            project = Repository(session).load_project_aggregate(project_id)
 
-            if project:
-                self.name_edit.setText(project.name or "")
-                self.summary_edit.setText(project.work_summary or "")
-                self.detail_edit.setText(project.detail or "")
+        if not project:
+            return
 
-                if project.project_start:
-                    self.project_start.setDate(QDate.fromString(project.project_start, "yyyy-MM-dd"))
-                else:
-                    self.project_start.setDate(self.project_start.minimumDate())
+        self.name_edit.setText(project.name or "")
+        self.summary_edit.setText(project.work_summary or "")
+        self.detail_edit.setText(project.detail or "")
+
+        if project.project_start:
+            self.project_start.setDate(QDate.fromString(project.project_start, "yyyy-MM-dd"))
+        else:
+            self.project_start.setDate(self.project_start.minimumDate())
+
+        if project.project_end:
+            self.project_end.setDate(QDate.fromString(project.project_end, "yyyy-MM-dd"))
+        else:
+            self.project_end.setDate(self.project_end.minimumDate())
+
+        # 役割の複数選択を復元
+        self.selected_roles = list(project.role_ids)
+        if project.role_names:
+            self.role_button.setText(", ".join(project.role_names))
+        else:
+            self.role_button.setText("選択...")
+
+        # 作業の複数選択を復元
+        self.selected_tasks = list(project.task_ids)
+        if project.task_names:
+            self.task_button.setText(", ".join(project.task_names))
+        else:
+            self.task_button.setText("選択...")
+
+        self.scale_edit.setText(project.scale_text or "")
+        self.end_user_edit.setText(project.end_user or "")
+        self.contract_company_edit.setText(project.contract_company or "")
+        self.remarks_edit.setText(project.remarks or "")
+
+        tech_lists = [
+            ('os', self.os_list),
+            ('language', self.language_list),
+            ('framework', self.framework_list),
+            ('tool', self.tool_list),
+            ('cloud', self.cloud_list),
+            ('db', self.db_list)
+        ]
 
-                if project.project_end:
-                    self.project_end.setDate(QDate.fromString(project.project_end, "yyyy-MM-dd"))
-                else:
-                    self.project_end.setDate(self.project_end.minimumDate())
-
-                # 役割の複数選択を復元
-                self.selected_roles = repo.get_project_roles(project_id)
-                role_names = []
-                for role in repo.get_master_by_kind('role'):
-                    if role.id in self.selected_roles:
-                        role_names.append(role.name)
-                if role_names:
-                    self.role_button.setText(", ".join(role_names))
-                else:
-                    self.role_button.setText("選択...")
-
-                # 作業の複数選択を復元
-                self.selected_tasks = repo.get_project_tasks(project_id)
-                task_names = []
-                for task in repo.get_master_by_kind('task'):
-                    if task.id in self.selected_tasks:
-                        task_names.append(task.name)
-                if task_names:
-                    self.task_button.setText(", ".join(task_names))
-                else:
-                    self.task_button.setText("選択...")
+        for kind, list_widget in tech_lists:
+            list_widget.clearSelection()
+            rows = self.tech_item_rows.get(kind, {})
+            for tech_id in project.tech_ids.get(kind, ()):
+                row = rows.get(tech_id)
+                if row is not None:
+                    list_widget.item(row).setSelected(True)
 
-                self.scale_edit.setText(project.scale_text or "")
-                self.end_user_edit.setText(project.end_user or "")
-                self.contract_company_edit.setText(project.contract_company or "")
-                self.remarks_edit.setText(project.remarks or "")
-                
-                tech_lists = [
-                    ('os', self.os_list),
-                    ('language', self.language_list),
-                    ('framework', self.framework_list),
-                    ('tool', self.tool_list),
-                    ('cloud', self.cloud_list),
-                    ('db', self.db_list)
-                ]
-                
-                for kind, list_widget in tech_lists:
-                    list_widget.clearSelection()
-                    selected_ids = repo.get_project_techs(project_id, kind)
-                    
-                    for i in range(list_widget.count()):
-                        item = list_widget.item(i)
-                        if item.data(Qt.UserRole) in selected_ids:
-                            item.setSelected(True)
-                
-    
     def new_project(self):
         self.current_project_id = None
         self.name_edit.clear()
@@ -1000,7 +1152,14 @@ class ProjectsView(QWidget):
             with db_service.session_scope() as session:
                 repo = Repository(session)
 
+                period_changed = False
                 if self.current_project_id:
+                    existing = repo.get_project_by_id(self.current_project_id)
+                    if existing:
+                        period_changed = (
+                            (existing.project_start, existing.project_end)
+                            != (data['project_start'], data['project_end'])
+                        )
                     project = repo.update_project(self.current_project_id, data)
                 else:
                     project = repo.create_project(data)
@@ -1020,20 +1179,21 @@ class ProjectsView(QWidget):
                     ('db', self.db_list)
                 ]
 
+                techs_changed = False
                 for kind, list_widget in tech_lists:
                     selected_ids = []
                     for i in range(list_widget.count()):
                         item = list_widget.item(i)
                         if item.isSelected():
                             selected_ids.append(item.data(Qt.UserRole))
-                    repo.link_project_tech(self.current_project_id, kind, selected_ids)
+                    if repo.link_project_tech(self.current_project_id, kind, selected_ids):
+                        techs_changed = True
 
-                # プロジェクト保存時に技術使用期間を同期
-                self.sync_tech_usages_with_project_selections(repo, self.current_project_id)
+                # 技術選択か期間が変わった場合のみ技術使用期間を同期
+                if techs_changed or period_changed:
+                    self.sync_tech_usages_with_project_selections(repo, self.current_project_id)
                 
             
-            self.refresh_data()
-            self.data_changed.emit()
             QMessageBox.information(self, "成功", "プロジェクトを保存しました")
             
         except Exception as e:
@@ -1056,8 +1216,6 @@ class ProjectsView(QWidget):
                     repo.delete_project(self.current_project_id)
                 
                 self.new_project()
-                self.refresh_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "プロジェクトを削除しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"削除に失敗しました: {str(e)}")
@@ -1101,8 +1259,6 @@ class ProjectsView(QWidget):
                     tech_ids = repo.get_project_techs(self.current_project_id, kind)
                     repo.link_project_tech(new_project.id, kind, tech_ids)
 
-        self.refresh_data()
-        self.data_changed.emit()
         QMessageBox.information(self, "成功", "プロジェクトを複製しました")
     
     
@@ -1112,8 +1268,7 @@ class ProjectsView(QWidget):
             return
         
         dialog = TechUsageDialog(self.current_project_id, self)
-        if dialog.exec_() == QDialog.Accepted:
-            self.data_changed.emit()
+        dialog.exec_()
     
     def sync_all_projects(self):
         """全プロジェクトの技術選択とtech_usagesを同期"""
@@ -1125,24 +1280,25 @@ class ProjectsView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                with db_service.session_scope() as session:
-                    repo = Repository(session)
-                    projects = repo.get_all_projects()
-
-                    synced_count = 0
-                    for project in projects:
-                        self.sync_tech_usages_with_project_selections(repo, project.id)
-                        synced_count += 1
-
-                    self.refresh_data()
-                    self.data_changed.emit()
-                    QMessageBox.information(
-                        self, "成功",
-                        f"{synced_count}件のプロジェクトで技術使用期間を同期しました"
-                    )
-            except Exception as e:
-                QMessageBox.critical(self, "エラー", f"同期に失敗しました: {str(e)}")
+            def run(session, job):
+                job.progress(0, 0, "技術使用期間を再生成しています")
+                return Repository(session).sync_tech_usages_from_selections()
+
+            def on_finished(result):
+                QMessageBox.information(
+                    self, "成功",
+                    f"{result['projects']}件のプロジェクトで技術使用期間を同期しました\n"
+                    f"（削除: {result['deleted']}件 / 作成: {result['inserted']}件）"
+                )
+
+            def on_failed(error):
+                QMessageBox.critical(self, "エラー", f"同期に失敗しました: {error}")
+
+            # 同期はバックグラウンドで行い、キャンセル時はロールバックする
+            job_runner.start(
+                "sync_all_projects", "技術使用期間の同期", run,
+                on_finished=on_finished, on_failed=on_failed
+            )
 
     def setup_shortcuts(self):
         """キーボードショートカットを設定"""
@@ -3,10 +3,11 @@ from PySide6.QtWidgets import (
     QLabel, QDialog, QDialogButtonBox, QFormLayout, QMessageBox,
     QComboBox, QDateEdit, QTextEdit, QAbstractItemView, QHeaderView
 )
-from PySide6.QtCore import Qt, QDate, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex
 from datetime import date
 from services.db import db_service
 from services.repository import Repository
+from services.change_events import QualificationChanged, MasterChanged
 from ui.styles import BUTTON_STYLES
 
 class UserQualificationTableModel(QAbstractTableModel):
@@ -178,13 +179,23 @@ class QualificationEditDialog(QDialog):
         super().accept()
 
 class QualificationView(QWidget):
-    data_changed = Signal()
+    # 購読する変更イベント（MainWindow から on_change() で渡される）
+    CHANGE_EVENTS = (QualificationChanged, MasterChanged)
     
     def __init__(self):
         super().__init__()
         self.init_ui()
         self.load_data()
     
+    def on_change(self, events):
+        """取得資格・資格マスタ（資格名を表示）の変更時に一覧を再読み込み"""
+        if any(
+            isinstance(change, QualificationChanged)
+            or (isinstance(change, MasterChanged) and change.kind == 'qualification')
+            for change in events
+        ):
+            self.load_data()
+    
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 5, 10, 10)
@@ -252,8 +263,6 @@ class QualificationView(QWidget):
                     repo = Repository(session)
                     repo.create_user_qualification(data)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "資格取得情報を追加しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"追加に失敗しました: {str(e)}")
@@ -285,8 +294,6 @@ class QualificationView(QWidget):
                     repo = Repository(session)
                     repo.update_user_qualification(qualification_id, data)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "資格取得情報を更新しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"更新に失敗しました: {str(e)}")
@@ -313,8 +320,6 @@ class QualificationView(QWidget):
                     repo = Repository(session)
                     repo.delete_user_qualification(qualification_id)
                 
-                self.load_data()
-                self.data_changed.emit()
                 QMessageBox.information(self, "成功", "資格取得情報を削除しました")
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"削除に失敗しました: {str(e)}")
\ No newline at end of file
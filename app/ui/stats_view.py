@@ -2,17 +2,64 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QTableView, QPushButton, QLabel, QDateEdit,
     QGroupBox, QMessageBox, QFileDialog, QHeaderView,
-    QComboBox, QStyledItemDelegate
+    QComboBox, QStyledItemDelegate, QDialog, QDialogButtonBox, QCheckBox
 )
-from PySide6.QtCore import Qt, QDate, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtCore import Qt, QDate, QTimer, Signal, QAbstractTableModel, QModelIndex
 from datetime import date
 import os
 from typing import List, Optional
 from services.db import db_service
-from services.stats import StatsService
-from services.export import ExportService
+from services.stats import create_stats_service
+from services.export import (
+    ExportService, CsvSink, MarkdownSink, JsonSink, ProjectsCsvSink, ZipSink
+)
 from services.repository import Repository
+from services.master_cache import master_cache, TECH_MASTER_KINDS
+from services.change_events import ProjectChanged, MasterChanged, TechUsageChanged
 from ui.styles import BUTTON_STYLES
+from ui.jobs import job_runner
+
+class ExportFormatDialog(QDialog):
+    """統計エクスポートの出力形式を選択するダイアログ"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("エクスポート形式")
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("エクスポート形式を選択してください（プロジェクト一覧のCSVは常に出力します）"))
+
+        self.csv_check = QCheckBox("CSV（カテゴリ別）")
+        self.csv_check.setChecked(True)
+        self.md_check = QCheckBox("Markdown（カテゴリ別）")
+        self.json_check = QCheckBox("JSON（全カテゴリ・サマリー・プロジェクト一覧）")
+        self.zip_check = QCheckBox("1つのZIPファイルにまとめる")
+        for check in (self.csv_check, self.md_check, self.json_check, self.zip_check):
+            layout.addWidget(check)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def get_sinks(self):
+        """選択された出力先の一覧"""
+        sinks = []
+        if self.csv_check.isChecked():
+            sinks.append(CsvSink())
+        if self.md_check.isChecked():
+            sinks.append(MarkdownSink())
+        if self.json_check.isChecked():
+            sinks.append(JsonSink())
+        sinks.append(ProjectsCsvSink())
+
+        if self.zip_check.isChecked():
+            return [ZipSink(sinks)]
+        return sinks
 
 class ProficiencyDelegate(QStyledItemDelegate):
     """習熟度カラム用のコンボボックスデリゲート"""
@@ -20,13 +67,12 @@ class ProficiencyDelegate(QStyledItemDelegate):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.proficiencies = []
-        self._load_proficiencies()
+        self.load_proficiencies()
 
-    def _load_proficiencies(self):
+    def load_proficiencies(self):
         """習熟度リストを読み込み"""
         with db_service.session_scope() as session:
-            repo = Repository(session)
-            profs = repo.get_master_by_kind('proficiency')
+            profs = master_cache.get_records(session, 'proficiency')
             self.proficiencies = [(None, "(未選択)")] + [(p.id, p.name) for p in profs]
 
     def createEditor(self, parent, option, index):
@@ -129,8 +175,8 @@ class CategoryStatsTab(QWidget):
         self.table_view.setModel(self.model)
 
         # 習熟度カラム（3列目）にコンボボックスデリゲートを設定
-        proficiency_delegate = ProficiencyDelegate(self.table_view)
-        self.table_view.setItemDelegateForColumn(3, proficiency_delegate)
+        self.proficiency_delegate = ProficiencyDelegate(self.table_view)
+        self.table_view.setItemDelegateForColumn(3, self.proficiency_delegate)
 
         self.table_view.horizontalHeader().setStretchLastSection(True)
         self.table_view.setAlternatingRowColors(True)
@@ -152,36 +198,45 @@ class CategoryStatsTab(QWidget):
         layout.addLayout(button_layout)
     
     def refresh_stats(self, start_filter=None, end_filter=None):
-        self.start_filter = start_filter
-        self.end_filter = end_filter
-        
         try:
             with db_service.session_scope() as session:
-                stats_service = StatsService(session)
+                stats_service = create_stats_service(session)
                 stats_data = stats_service.get_all_tech_stats(
                     self.kind, start_filter, end_filter
                 )
-                self.model.update_data(stats_data)
-                
-                total_techs = len(stats_data)
-                total_months = sum(item['months'] for item in stats_data)
-                
-                period_text = ""
-                if start_filter or end_filter:
-                    if start_filter and end_filter:
-                        period_text = f" (期間: {start_filter} ~ {end_filter})"
-                    elif start_filter:
-                        period_text = f" (期間: {start_filter} ~)"
-                    else:
-                        period_text = f" (期間: ~ {end_filter})"
-                
-                self.summary_label.setText(
-                    f"{self.title}: {total_techs}件 / 合計{total_months}ヶ月{period_text}"
-                )
+                self.set_stats(stats_data, start_filter, end_filter)
         except Exception as e:
             print(f"統計データ取得エラー: {e}")
-            self.model.update_data([])
-            self.summary_label.setText(f"{self.title}: データなし")
+            self.clear_stats(start_filter, end_filter)
+    
+    def set_stats(self, stats_data, start_filter=None, end_filter=None):
+        """計算済みの統計データを表示"""
+        self.start_filter = start_filter
+        self.end_filter = end_filter
+        self.model.update_data(stats_data)
+        
+        total_techs = len(stats_data)
+        total_months = sum(item['months'] for item in stats_data)
+        
+        period_text = ""
+        if start_filter or end_filter:
+            if start_filter and end_filter:
+                period_text = f" (期間: {start_filter} ~ {end_filter})"
+            elif start_filter:
+                period_text = f" (期間: {start_filter} ~)"
+            else:
+                period_text = f" (期間: ~ {end_filter})"
+        
+        self.summary_label.setText(
+            f"{self.title}: {total_techs}件 / 合計{total_months}ヶ月{period_text}"
+        )
+    
+    def clear_stats(self, start_filter=None, end_filter=None):
+        """統計データ取得失敗時の表示"""
+        self.start_filter = start_filter
+        self.end_filter = end_filter
+        self.model.update_data([])
+        self.summary_label.setText(f"{self.title}: データなし")
     
     def export_csv(self):
         file_path, _ = QFileDialog.getSaveFileName(
@@ -234,8 +289,28 @@ class CategoryStatsTab(QWidget):
                     )
 
 class StatsView(QWidget):
+    # 購読する変更イベント（MainWindow から on_change() で渡される）
+    CHANGE_EVENTS = (TechUsageChanged, MasterChanged, ProjectChanged)
+    
+    # 再計算の要求が続いた場合に、最後の要求から待ってまとめて1回計算する（ミリ秒）
+    REFRESH_DELAY_MS = 100
+    
     def __init__(self):
         super().__init__()
+        self.start_filter = None
+        self.end_filter = None
+        self.summary = None
+        
+        # 統計の再計算はワーカースレッドで行う
+        # 要求のたびに世代を進め、実行中に新しい要求があった場合はその結果を表示しない
+        self._generation = 0
+        self._pending = None   # 未実行の要求 (カテゴリの集合, 全体を再計算するか)
+        self._running = None   # 実行中の要求 (世代, カテゴリの集合, 全体を再計算するか)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(self.REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._start_refresh)
+        
         self.init_ui()
         self.set_default_filters()
         # デフォルトフィルタの値で統計を表示
@@ -357,41 +432,143 @@ class StatsView(QWidget):
             print(f"統計フィルタ設定エラー: {e}")
     
     def refresh_stats(self, start_filter=None, end_filter=None):
-        try:
+        """集計期間を設定して全体の再計算を要求"""
+        self.start_filter = start_filter
+        self.end_filter = end_filter
+        self.request_refresh(full=True)
+    
+    def on_change(self, events):
+        """
+        変更イベントに応じて、影響のあるカテゴリのみ再計算を要求（集計期間は現在のフィルタのまま）
+        - 技術使用期間・技術マスタの変更: そのカテゴリ
+        - 習熟度マスタの変更: 全カテゴリ（習熟度名を表示しているため）
+        - プロジェクトの作成・削除・期間変更: サマリーを含めて全体
+        """
+        master_kinds = {change.kind for change in events if isinstance(change, MasterChanged)}
+        if 'proficiency' in master_kinds:
             for tab in self.category_tabs.values():
-                tab.refresh_stats(start_filter, end_filter)
-        except Exception as e:
-            print(f"統計更新エラー: {e}")
+                tab.proficiency_delegate.load_proficiencies()
+            master_kinds |= set(TECH_MASTER_KINDS)
         
-        with db_service.session_scope() as session:
-            stats_service = StatsService(session)
-            summary = stats_service.get_summary_stats(start_filter, end_filter)
-            
-            period_text = ""
-            if start_filter or end_filter:
-                if start_filter and end_filter:
-                    period_text = f" | 期間: {start_filter} ~ {end_filter}"
-                elif start_filter:
-                    period_text = f" | 期間: {start_filter} ~ 現在"
-                else:
-                    period_text = f" | 期間: 開始 ~ {end_filter}"
-            
-            tech_summary = []
-            for cat, count in summary['tech_counts'].items():
-                if count > 0:
-                    cat_names = {
-                        'os': 'OS', 'language': '言語',
-                        'framework': 'FW/ライブラリ', 'tool': 'ツール',
-                        'cloud': 'クラウド', 'db': 'DB'
-                    }
-                    tech_summary.append(f"{cat_names[cat]}:{count}")
+        kinds = {change.kind for change in events if isinstance(change, TechUsageChanged)}
+        kinds |= master_kinds & set(TECH_MASTER_KINDS)
+        
+        period_changed = any(
+            isinstance(change, ProjectChanged) and change.period_changed for change in events
+        )
+        if kinds or period_changed:
+            self.request_refresh(kinds, full=period_changed)
+    
+    def request_refresh(self, kinds=(), full=False):
+        """
+        再計算を要求（REFRESH_DELAY_MS 以内に続いた要求は1回にまとめる）
+        kinds: 再計算するカテゴリ、full: サマリーを含めて全体を再計算
+        """
+        self._generation += 1
+        kinds = set(kinds)
+        
+        if self._pending is not None:
+            kinds |= self._pending[0]
+            full = full or self._pending[1]
+        if self._running is not None:
+            # 実行中の計算の結果は表示しないため、その対象も次の計算に含める
+            kinds |= self._running[1]
+            full = full or self._running[2]
+        
+        self._pending = (kinds, full)
+        self._refresh_timer.start()
+    
+    def _start_refresh(self):
+        """保留中の要求の計算を開始（実行中の場合は終了後に開始）"""
+        if self._running is not None or self._pending is None:
+            return
+        
+        kinds, full = self._pending
+        self._pending = None
+        if self.summary is None or kinds >= set(self.category_tabs):
+            full = True
+        
+        generation = self._generation
+        start_filter, end_filter = self.start_filter, self.end_filter
+        
+        def compute(session, job):
+            stats_service = create_stats_service(session)
+            if full:
+                return stats_service.compute_all_stats(start_filter, end_filter)
+            return {
+                'categories': {
+                    kind: stats_service.get_all_tech_stats(kind, start_filter, end_filter)
+                    for kind in kinds
+                },
+                'summary': None
+            }
+        
+        self._running = (generation, kinds, full)
+        job_runner.start(
+            "stats_refresh", "統計の再計算", compute,
+            on_finished=lambda result: self._on_refresh_finished(generation, result),
+            on_failed=lambda error: self._on_refresh_failed(generation, error),
+            on_cancelled=self._on_refresh_done,
+            quiet=True
+        )
+    
+    def _on_refresh_finished(self, generation, result):
+        # 計算中に新しい要求があった場合は古い結果として破棄
+        if generation == self._generation:
+            for kind, stats_data in result['categories'].items():
+                self.category_tabs[kind].set_stats(stats_data, self.start_filter, self.end_filter)
             
-            self.summary_label.setText(
-                f"プロジェクト数: {summary['total_projects']} | "
-                f"総月数: {summary['total_months']}ヶ月 | "
-                f"技術: {', '.join(tech_summary)}"
-                f"{period_text}"
-            )
+            if result['summary'] is not None:
+                self.summary = result['summary']
+            else:
+                for kind, stats_data in result['categories'].items():
+                    self.summary['tech_counts'][kind] = len(stats_data)
+            self.update_summary(self.summary, self.start_filter, self.end_filter)
+        
+        self._on_refresh_done()
+    
+    def _on_refresh_failed(self, generation, error):
+        print(f"統計更新エラー: {error}")
+        if generation == self._generation:
+            self.summary = None
+            for tab in self.category_tabs.values():
+                tab.clear_stats(self.start_filter, self.end_filter)
+        
+        self._on_refresh_done()
+    
+    def _on_refresh_done(self):
+        self._running = None
+        # 待ち時間中の要求はタイマーで開始する
+        if self._pending is not None and not self._refresh_timer.isActive():
+            self._start_refresh()
+    
+    def update_summary(self, summary, start_filter=None, end_filter=None):
+        """サマリーラベルを更新"""
+        period_text = ""
+        if start_filter or end_filter:
+            if start_filter and end_filter:
+                period_text = f" | 期間: {start_filter} ~ {end_filter}"
+            elif start_filter:
+                period_text = f" | 期間: {start_filter} ~ 現在"
+            else:
+                period_text = f" | 期間: 開始 ~ {end_filter}"
+        
+        tech_summary = []
+        for cat, count in summary['tech_counts'].items():
+            if count > 0:
+                cat_names = {
+                    'os': 'OS', 'language': '言語',
+                    'framework': 'FW/ライブラリ', 'tool': 'ツール',
+                    'cloud': 'クラウド', 'db': 'DB'
+                }
+                tech_summary.append(f"{cat_names[cat]}:{count}")
+        
+        self.summary_label.setText(
+            f"プロジェクト数: {summary['total_projects']} | "
+            f"総月数: {summary['total_months']}ヶ月 | "
+            f"技術: {', '.join(tech_summary)}"
+            f"{period_text}"
+        )
     
     def export_all(self):
         directory = QFileDialog.getExistingDirectory(
@@ -409,45 +586,43 @@ class StatsView(QWidget):
             if self.end_date.date() != self.end_date.minimumDate():
                 end_filter = self.end_date.date().toString("yyyy-MM-dd")
             
-            reply = QMessageBox.question(
-                self, "エクスポート形式",
-                "エクスポート形式を選択してください",
-                "CSV", "Markdown", "両方"
-            )
+            dialog = ExportFormatDialog(self)
+            if dialog.exec() != QDialog.Accepted:
+                return
+            sinks = dialog.get_sinks()
             
-            with db_service.session_scope() as session:
+            def run(session, job):
                 export_service = ExportService(session)
                 
-                success_count = 0
-                total_count = 0
+                # 集計は1回だけ行い、すべての出力先で共有する
+                job.progress(0, len(sinks) + 1, "集計")
+                snapshot = export_service.build_snapshot(start_filter, end_filter)
                 
-                if reply == 0 or reply == 2:
-                    csv_results = export_service.export_all_categories_csv(
-                        directory, start_filter, end_filter
-                    )
-                    for category, success in csv_results.items():
-                        total_count += 1
-                        if success:
-                            success_count += 1
-                
-                if reply == 1 or reply == 2:
-                    md_results = export_service.export_all_categories_md(
-                        directory, start_filter, end_filter
-                    )
-                    for category, success in md_results.items():
-                        total_count += 1
-                        if success:
-                            success_count += 1
-                
-                projects_csv = os.path.join(directory, "projects.csv")
-                if export_service.export_projects_csv(
-                    projects_csv, start_filter, end_filter
-                ):
-                    success_count += 1
-                total_count += 1
+                return export_service.export_snapshot(
+                    snapshot, directory, sinks,
+                    progress=lambda done, total, name: job.progress(done + 1, total + 1, name)
+                )
+            
+            def on_finished(results):
+                lines = []
+                for result in results:
+                    if result.success:
+                        lines.append(f"{result.name}: {len(result.files)}ファイル（{result.seconds * 1000:.0f}ms）")
+                    else:
+                        lines.append(f"{result.name}: 失敗（{result.error}）")
                 
+                file_count = sum(len(result.files) for result in results)
                 QMessageBox.information(
                     self, "エクスポート完了",
-                    f"{success_count}/{total_count} ファイルを\n"
-                    f"{directory}\nにエクスポートしました"
-                )
\ No newline at end of file
+                    f"{file_count} ファイルを\n"
+                    f"{directory}\nにエクスポートしました\n\n" + "\n".join(lines)
+                )
+            
+            def on_failed(error):
+                QMessageBox.critical(self, "エラー", f"エクスポートに失敗しました: {error}")
+            
+            # エクスポートはバックグラウンドで行い、進捗はステータスバーに表示
+            job_runner.start(
+                "stats_export", "統計エクスポート", run,
+                on_finished=on_finished, on_failed=on_failed
+            )
\ No newline at end of file
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 データベースマイグレーションスクリプト
-新しいテーブル（qualifications, user_qualifications, other_experiences）を作成
+未適用のスキーママイグレーション（app/models/migrations.py）を適用し、資格マスタの初期データを投入
 """
 
 import sys
@@ -10,7 +10,8 @@ import os
 # プロジェクトルートをパスに追加
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
-from models import Base, init_db
+from models import init_db
+from models.migrations import SCHEMA_VERSION
 from services.db import db_service
 from services.repository import Repository
 
@@ -19,12 +20,9 @@ def migrate_database():
     print("データベースマイグレーションを開始します...")
     
     try:
-        # エンジンとセッションを取得
-        engine, _ = init_db()
-        
-        # 新しいテーブルを作成
-        print("新しいテーブルを作成中...")
-        Base.metadata.create_all(bind=engine)
+        # 未適用のマイグレーションは init_db() 内で適用される
+        init_db()
+        print(f"スキーマバージョン: {SCHEMA_VERSION}")
         
         # 資格マスタに初期データを投入
         print("資格マスタに初期データを投入中...")
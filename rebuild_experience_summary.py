@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+技術経験集計テーブル（tech_experience_summary）の再構築・整合性チェックスクリプト
+
+使い方:
+    python rebuild_experience_summary.py          # 全件再構築
+    python rebuild_experience_summary.py --check  # 集計テーブルとその場の計算結果を比較
+"""
+
+import sys
+import os
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from services.db import db_service
+from services.experience_summary import ExperienceSummaryService
+
+def rebuild_summary():
+    """集計テーブルを全件再構築"""
+    print("技術経験集計テーブルを再構築します...")
+    
+    try:
+        with db_service.session_scope() as session:
+            count = ExperienceSummaryService(session).rebuild()
+        print(f"{count} 件の集計行を作成しました")
+    except Exception as e:
+        print(f"再構築中にエラーが発生しました: {e}")
+        return False
+    
+    return True
+
+def check_summary():
+    """集計テーブルの整合性をチェック"""
+    print("技術経験集計テーブルの整合性をチェックします...")
+    
+    try:
+        with db_service.session_scope() as session:
+            mismatches = ExperienceSummaryService(session).check_consistency()
+    except Exception as e:
+        print(f"チェック中にエラーが発生しました: {e}")
+        return False
+    
+    if not mismatches:
+        print("不一致はありません")
+        return True
+    
+    for mismatch in mismatches:
+        print(
+            f"[{mismatch['kind']}] tech_id={mismatch['tech_id']}: "
+            f"期待値={mismatch['expected']} 保存値={mismatch['stored']}"
+        )
+    print(f"{len(mismatches)} 件の不一致があります（--check なしで実行すると再構築します）")
+    return False
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        success = check_summary()
+    else:
+        success = rebuild_summary()
+    sys.exit(0 if success else 1)
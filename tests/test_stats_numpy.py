@@ -0,0 +1,177 @@
+"""
+集計エンジン（StatsService / NumpyStatsService）の結果を、単純な月の集合による計算と比較するテスト
+
+日付が None・空文字・継続中（終了なし）のプロジェクト・使用期間を含むデータで、
+期間指定なし・ありの compute_all_stats() を確認する。
+比較対象は集計エンジンのコードを使わず、使用期間の月を (年, 月) の集合に展開して数える。
+
+テストは一時ディレクトリのデータベースだけを使用する（設定ファイルのデータベースには接続しない）。
+
+実行: python -m pytest tests  または  python -m unittest discover tests
+"""
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    numpy = None
+
+from models import init_db, Project, TechUsage, OS, Language, Framework
+from services.stats import StatsService
+from services.experience_summary import ExperienceSummaryService
+
+TECH_MODELS = {'os': OS, 'language': Language, 'framework': Framework}
+
+# (開始条件, 終了条件)
+FILTERS = [
+    (None, None),
+    ('2018-03-10', None),
+    (None, '2021-07-20'),
+    ('2017-01-01', '2022-12-31'),
+    ('2023-05-05', '2019-01-01'),
+]
+
+def _random_date(rng: random.Random):
+    """日付・None・空文字のいずれかを返す"""
+    r = rng.random()
+    if r < 0.15:
+        return None
+    if r < 0.3:
+        return ''
+    return f"{rng.randint(2015, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+def _month_set(start: str, end):
+    """start から end（空の場合は今日）までの (年, 月) の集合"""
+    end_date = end or date.today().isoformat()
+    year, month = int(start[:4]), int(start[5:7])
+    last = (int(end_date[:4]), int(end_date[5:7]))
+    months = set()
+    while (year, month) <= last:
+        months.add((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def reference_stats(projects, usages, start_filter, end_filter):
+    """
+    月の集合で計算した期待値
+    projects: {project_id: (project_start, project_end)}
+    usages: [(project_id, kind, tech_id, start, end)]
+    戻り値: ({kind: {tech_id: 月数（1以上のみ）}}, total_projects, total_months)
+    """
+    tech_months = {}
+    for project_id, kind, tech_id, usage_start, usage_end in usages:
+        # 使用期間が未設定の場合はプロジェクト期間を使用する
+        if usage_start:
+            use_start, use_end = usage_start, usage_end or None
+        else:
+            use_start, use_end = projects[project_id]
+        if not use_start:
+            continue
+
+        if start_filter:
+            if use_end and use_end < start_filter:
+                continue
+            if use_start < start_filter:
+                use_start = start_filter
+        if end_filter:
+            if use_start > end_filter:
+                continue
+            if not use_end or use_end > end_filter:
+                use_end = end_filter
+
+        tech_months.setdefault(kind, {}).setdefault(tech_id, set()).update(_month_set(use_start, use_end))
+
+    months_by_kind = {
+        kind: {tech_id: len(months) for tech_id, months in techs.items() if months}
+        for kind, techs in tech_months.items()
+    }
+
+    # プロジェクトの絞り込みは Repository.filter_projects() と同じ文字列比較
+    selected = [
+        (project_start, project_end)
+        for project_start, project_end in projects.values()
+        if not (start_filter and project_end is not None and project_end < start_filter)
+        and not (end_filter and (project_start is None or project_start > end_filter))
+    ]
+    project_months = set()
+    for project_start, project_end in selected:
+        if project_start:
+            project_months.update(_month_set(project_start, project_end))
+
+    return months_by_kind, len(selected), len(project_months)
+
+class StatsEngineReferenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        _, SessionLocal = init_db(os.path.join(cls.temp_dir.name, 'test.db'))
+        cls.session = SessionLocal()
+
+        rng = random.Random(1)
+        for model in TECH_MODELS.values():
+            for i in range(8):
+                cls.session.add(model(name=f"{model.__tablename__}{i}"))
+        cls.session.flush()
+
+        # 空文字・None・継続中の開始日と終了日の組み合わせを必ず含める
+        periods = [(start, end) for start in (None, '', '2019-04-01') for end in (None, '', '2020-09-30')]
+        periods += [(_random_date(rng), _random_date(rng)) for _ in range(60)]
+
+        cls.projects = {}
+        cls.usages = []
+        for i, (project_start, project_end) in enumerate(periods):
+            project = Project(name=f"p{i}", project_start=project_start, project_end=project_end)
+            cls.session.add(project)
+            cls.session.flush()
+            cls.projects[project.id] = (project_start, project_end)
+            for _ in range(3):
+                usage = (project.id, rng.choice(list(TECH_MODELS)), rng.randint(1, 8),
+                         _random_date(rng), _random_date(rng))
+                cls.usages.append(usage)
+                cls.session.add(TechUsage(
+                    project_id=usage[0], kind=usage[1], tech_id=usage[2], start=usage[3], end=usage[4]
+                ))
+        cls.session.flush()
+        ExperienceSummaryService(cls.session).rebuild()
+        cls.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+        cls.temp_dir.cleanup()
+
+    def assert_matches_reference(self, service):
+        for start_filter, end_filter in FILTERS:
+            with self.subTest(start_filter=start_filter, end_filter=end_filter):
+                months_by_kind, total_projects, total_months = reference_stats(
+                    self.projects, self.usages, start_filter, end_filter
+                )
+                result = service.compute_all_stats(start_filter, end_filter)
+
+                for kind in TECH_MODELS:
+                    expected = months_by_kind.get(kind, {})
+                    actual = {item['id']: item['months'] for item in result['categories'][kind]}
+                    self.assertEqual(actual, expected, kind)
+                    self.assertEqual(result['summary']['tech_counts'][kind], len(expected), kind)
+
+                self.assertEqual(result['summary']['total_projects'], total_projects)
+                self.assertEqual(result['summary']['total_months'], total_months)
+
+    def test_python_engine_matches_reference(self):
+        self.assert_matches_reference(StatsService(self.session))
+
+    @unittest.skipIf(numpy is None, "NumPy がインストールされていません")
+    def test_numpy_engine_matches_reference(self):
+        from services.stats_numpy import NumpyStatsService
+        self.assert_matches_reference(NumpyStatsService(self.session))
+
+if __name__ == "__main__":
+    unittest.main()